@@ -0,0 +1,99 @@
+import hashlib
+import json
+import os
+import time
+from typing import Optional
+
+from resume_parser.state import SQLiteStore, state_path
+
+# Parsed resumes kept; the least recently uploaded go first
+RESUME_CACHE_MAX_ENTRIES = int(os.getenv("RESUME_CACHE_MAX_ENTRIES", "2000"))
+# Off with RESUME_CACHE_ENABLED=0; every upload then runs the whole pipeline
+RESUME_CACHE_ENABLED = os.getenv("RESUME_CACHE_ENABLED", "1") == "1"
+
+
+def file_sha256(path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ResumeCache(SQLiteStore):
+    """
+    Pipeline results of resumes already parsed, keyed by the SHA-256 of the
+    PDF bytes.
+
+    An entry holds the structured resume (after the GitHub links were merged
+    in), the skill verification and the candidate it was inserted as, so a
+    re-uploaded PDF skips the crew, the GitHub crawl and verification.
+    Bounded to ``max_entries``, least recently used first, and shared by
+    every resume worker.
+    """
+
+    def __init__(self, path, max_entries: int = RESUME_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        super().__init__(path, """
+            create table if not exists parsed_resumes (
+                sha256 text primary key,
+                resume text not null,
+                verification text not null,
+                candidate text,
+                last_used real not null
+            )
+        """)
+
+    def get(self, sha256: str) -> Optional[dict]:
+        with self._connect() as conn:
+            row = conn.execute(
+                "select resume, verification, candidate from parsed_resumes where sha256 = ?",
+                (sha256,)
+            ).fetchone()
+            if row is None:
+                self._count(conn, "misses")
+                return None
+            conn.execute(
+                "update parsed_resumes set last_used = ? where sha256 = ?", (time.time(), sha256)
+            )
+            self._count(conn, "hits")
+        return {
+            "resume": json.loads(row[0]),
+            "verification": json.loads(row[1]),
+            "candidate": json.loads(row[2]) if row[2] else None,
+        }
+
+    def put(self, sha256: str, resume: dict, verification: dict, candidate: Optional[dict]):
+        with self._connect() as conn:
+            conn.execute(
+                "insert or replace into parsed_resumes "
+                "(sha256, resume, verification, candidate, last_used) values (?, ?, ?, ?, ?)",
+                (sha256, json.dumps(resume), json.dumps(verification),
+                 json.dumps(candidate) if candidate else None, time.time())
+            )
+            evicted = conn.execute(
+                "delete from parsed_resumes where sha256 not in "
+                "(select sha256 from parsed_resumes order by last_used desc limit ?)",
+                (self.max_entries,)
+            ).rowcount
+            self._count(conn, "evicted", evicted)
+
+    def set_candidate(self, sha256: str, candidate: dict):
+        with self._connect() as conn:
+            conn.execute(
+                "update parsed_resumes set candidate = ? where sha256 = ?",
+                (json.dumps(candidate), sha256)
+            )
+
+    def stats(self) -> dict:
+        counters = self.counters()
+        entries = self._connect().execute("select count(*) from parsed_resumes").fetchone()[0]
+        return {
+            "entries": entries,
+            "max_entries": self.max_entries,
+            **self.hit_stats(counters),
+            "evicted": counters.get("evicted", 0),
+        }
+
+
+resume_cache = ResumeCache(state_path("resume_cache.sqlite3")) if RESUME_CACHE_ENABLED else None
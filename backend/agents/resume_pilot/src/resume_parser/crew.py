@@ -2,12 +2,6 @@ from crewai import Agent, Crew, Process, Task
 from crewai.project import CrewBase, agent, crew, task
 from crewai.agents.agent_builder.base_agent import BaseAgent
 from typing import List
-from resume_parser.tools.Pdf_tool import PDFReaderTool
-
-def verify_resume():
-        """Verify the resume"""
-        tool=PDFReaderTool()
-        return tool
 
 @CrewBase
 class ResumeParser():
@@ -27,7 +21,6 @@ class ResumeParser():
     def link_extraction_task(self) -> Task:
         return Task(
             config=self.tasks_config['link_extraction_task'], # type: ignore[index]
-            tools=[verify_resume()],
         )
 
     
@@ -4,6 +4,7 @@ from resume_parser.db.repositories.skills_repo import insert_skills_for_candidat
 from resume_parser.db.repositories.candidate_repo import insert_candidate
 from resume_parser.db.repositories.candidate_links_repo import insert_links_for_candidate
 from resume_parser.db.repositories.candidate_experience_repo import insert_experience_for_candidate
+from resume_parser.state import mark_data_changed
 
 import random
 
@@ -105,35 +106,40 @@ def insert_candidate_and_skills(
         "resume_score": resume_score
     }
 
-    response = insert_candidate(candidate_payload)
-
-    if not response.data:
-        raise Exception("Candidate insertion failed")
-
-    candidate_id = response.data[0]["candidate_id"]
-
-    # -----------------------------
-    # Insert Skills (FK → candidate_id)
-    # -----------------------------
-    skills = data2.get("present_skills", [])
-    skills_inserted = insert_skills_for_candidate(candidate_id, skills)
-
-    # -----------------------------
-    # Insert Candidate Links
-    # -----------------------------
-    links_inserted = insert_links_for_candidate(
-        candidate_id=candidate_id,
-        links_list=links_list
-    )
-
-    # -----------------------------
-    # Insert Candidate Experience
-    # -----------------------------
-    experience_inserted = insert_experience_for_candidate(
-        candidate_id=candidate_id,
-        years_of_experience=years_of_experience,
-        experience_list=experience_list
-    )
+    try:
+        response = insert_candidate(candidate_payload)
+
+        if not response.data:
+            raise Exception("Candidate insertion failed")
+
+        candidate_id = response.data[0]["candidate_id"]
+
+        # -----------------------------
+        # Insert Skills (FK → candidate_id)
+        # -----------------------------
+        skills = data2.get("present_skills", [])
+        skills_inserted = insert_skills_for_candidate(candidate_id, skills)
+
+        # -----------------------------
+        # Insert Candidate Links
+        # -----------------------------
+        links_inserted = insert_links_for_candidate(
+            candidate_id=candidate_id,
+            links_list=links_list
+        )
+
+        # -----------------------------
+        # Insert Candidate Experience
+        # -----------------------------
+        experience_inserted = insert_experience_for_candidate(
+            candidate_id=candidate_id,
+            years_of_experience=years_of_experience,
+            experience_list=experience_list
+        )
+    finally:
+        # whatever got written, the SQL agent's caches of these tables are
+        # stale now
+        mark_data_changed()
 
     return {
         "candidate_id": candidate_id,
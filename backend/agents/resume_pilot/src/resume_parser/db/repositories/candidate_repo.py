@@ -13,3 +13,13 @@ def get_candidate_by_email(email: str):
         .single()
         .execute()
     )
+
+def candidate_exists(candidate_id) -> bool:
+    response = (
+        supabase
+        .table(CANDIDATES)
+        .select("candidate_id")
+        .eq("candidate_id", candidate_id)
+        .execute()
+    )
+    return bool(response.data)
@@ -1,9 +1,112 @@
 import json
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
 import requests
+from requests.adapters import HTTPAdapter
 from resume_parser.skill_tools.skill_utils import TECH_SKILLS_MASTER
 from resume_parser.utils import extract_edit_and_clean_json
-import fitz
+
+# Overridable for GitHub Enterprise or a local stub server
+GITHUB_API_URL = os.getenv("GITHUB_API_URL", "https://api.github.com").rstrip("/")
+GITHUB_RAW_URL = os.getenv("GITHUB_RAW_URL", "https://raw.githubusercontent.com").rstrip("/")
+# Optional; raises the API rate limit from 60 to 5000 requests per hour
+GITHUB_TOKEN = os.getenv("GITHUB_TOKEN")
+GITHUB_TIMEOUT = float(os.getenv("GITHUB_TIMEOUT", "10"))
+# Requests in flight to GitHub at once, across every resume this worker
+# process parses. Each resume worker has its own client, so GitHub can see
+# up to RESUME_WORKERS x GITHUB_CONCURRENCY concurrent requests
+GITHUB_CONCURRENCY = int(os.getenv("GITHUB_CONCURRENCY", "8"))
+# A rate-limited request waits at most this long for its reset, else fails
+GITHUB_MAX_RATE_LIMIT_WAIT = float(os.getenv("GITHUB_MAX_RATE_LIMIT_WAIT", "5"))
+
+
+class GitHubClient:
+    """
+    Pooled, concurrent access to the GitHub API and raw file host.
+
+    One keep-alive session and one thread pool (GITHUB_CONCURRENCY wide)
+    serve every request of this process, so the pool size caps one worker
+    only: with RESUME_WORKERS workers, up to RESUME_WORKERS x
+    GITHUB_CONCURRENCY requests reach GitHub at once. Responses'
+    X-RateLimit-* headers are tracked per process too: once the quota is
+    used up, requests fail fast until the reset instead of each waiting out
+    a 403, and a short Retry-After is honoured once.
+    """
+
+    def __init__(self, concurrency: int = GITHUB_CONCURRENCY, timeout: float = GITHUB_TIMEOUT):
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=concurrency)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers["Accept"] = "application/vnd.github+json"
+        if GITHUB_TOKEN:
+            self.session.headers["Authorization"] = f"Bearer {GITHUB_TOKEN}"
+        self.executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="github")
+        self._lock = threading.Lock()
+        self.rate_limit_remaining: Optional[int] = None
+        self._limited_until = 0.0
+
+    def _track_rate_limit(self, response: requests.Response):
+        remaining = response.headers.get("X-RateLimit-Remaining")
+        if remaining is None:
+            return
+        with self._lock:
+            self.rate_limit_remaining = int(remaining)
+            if self.rate_limit_remaining == 0:
+                self._limited_until = float(response.headers.get("X-RateLimit-Reset", time.time() + 60))
+
+    def _retry_after(self, response: requests.Response) -> Optional[float]:
+        if response.status_code not in (403, 429):
+            return None
+        if "Retry-After" in response.headers:
+            return float(response.headers["Retry-After"])
+        if response.headers.get("X-RateLimit-Remaining") == "0":
+            return max(0.0, float(response.headers.get("X-RateLimit-Reset", 0)) - time.time())
+        return None
+
+    def get(self, url: str) -> requests.Response:
+        for attempt in range(2):
+            wait = self._limited_until - time.time()
+            if wait > 0 and url.startswith(GITHUB_API_URL):
+                if wait > GITHUB_MAX_RATE_LIMIT_WAIT:
+                    raise requests.exceptions.RequestException(
+                        f"GitHub rate limit exhausted for {wait:.0f}s"
+                    )
+                time.sleep(wait)
+            response = self.session.get(url, timeout=self.timeout)
+            self._track_rate_limit(response)
+            retry_after = self._retry_after(response)
+            if retry_after is None or attempt or retry_after > GITHUB_MAX_RATE_LIMIT_WAIT:
+                break
+            time.sleep(retry_after)
+        response.raise_for_status()
+        return response
+
+    def get_json(self, url: str, default=None):
+        try:
+            return self.get(url).json()
+        except (requests.exceptions.RequestException, ValueError) as e:
+            print(f"GitHub request failed ({url}): {e}")
+            return default
+
+    def submit(self, fn, *args):
+        return self.executor.submit(fn, *args)
+
+
+_client: Optional[GitHubClient] = None
+_client_lock = threading.Lock()
+
+
+def github_client() -> GitHubClient:
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = GitHubClient()
+        return _client
 
 
 def append_json_data(source_file: str, destination_file: str):
@@ -59,9 +162,7 @@ def append_json_data(source_file: str, destination_file: str):
 
 def _fetch_readme(readme_url: str) -> str:
     try:
-        readme_response = requests.get(readme_url)
-        readme_response.raise_for_status()
-        return readme_response.text
+        return github_client().get(readme_url).text
     except requests.exceptions.RequestException as e:
         return f"Error fetching README from {readme_url}: {e}"
 
@@ -79,7 +180,7 @@ def extract_skills_from_readme(readme_text: str, master_skills: list) -> list:
     return list(found)
 
 
-def process_github_links(resume_got_off_path: str) -> str:
+def process_github_links(resume_got_off_path: str, output_path: str = "github_analysis.json") -> str:
     try:
         # -------------------------------
         # Load resume JSON
@@ -111,34 +212,36 @@ def process_github_links(resume_got_off_path: str) -> str:
         github_links = resume_data.get("github_links", [])
         verified_repos = []
 
+        repos = []
         for link in github_links:
             parts = link.split("/")
             if len(parts) < 5 or parts[2] != "github.com":
                 continue
+            repos.append((parts[3], parts[4]))
 
-            owner = parts[3]
-            repo_name = parts[4]
-
+        # Every request of every repo goes out at once, bounded by the
+        # client's pool, instead of four sequential round trips per repo
+        client = github_client()
+        pending = []
+        for owner, repo_name in dict.fromkeys(repos):
             print(f"Processing repo: {repo_name}")
+            repo_api = f"{GITHUB_API_URL}/repos/{owner}/{repo_name}"
+            pending.append((owner, repo_name, (
+                client.submit(client.get_json, repo_api, {}),
+                client.submit(client.get_json, f"{repo_api}/languages", {}),
+                client.submit(client.get_json, f"{repo_api}/commits", []),
+                client.submit(_fetch_readme, f"{GITHUB_RAW_URL}/{owner}/{repo_name}/main/README.md"),
+            )))
 
-            # Repo details
-            repo_api = f"https://api.github.com/repos/{owner}/{repo_name}"
-            repo = requests.get(repo_api).json()
+        for owner, repo_name, futures in pending:
+            repo, languages_json, commits_response, readme_content = (f.result() for f in futures)
 
             # Languages
-            lang_api = f"https://api.github.com/repos/{owner}/{repo_name}/languages"
-            languages_json = requests.get(lang_api).json()
-            languages = list(languages_json.keys())
+            languages = list(languages_json.keys()) if isinstance(languages_json, dict) else []
 
             # Commits count
-            commits_api = f"https://api.github.com/repos/{owner}/{repo_name}/commits"
-            commits_response = requests.get(commits_api).json()
             commit_count = len(commits_response) if isinstance(commits_response, list) else 0
 
-            # README
-            readme_url = f"https://raw.githubusercontent.com/{owner}/{repo_name}/main/README.md"
-            readme_content = _fetch_readme(readme_url)
-
             readme_skills = extract_skills_from_readme(
                 readme_content,
                 TECH_SKILLS_MASTER
@@ -172,9 +275,9 @@ def process_github_links(resume_got_off_path: str) -> str:
         }
 
         # -------------------------------
-        # Save JSON in parent directory
+        # Save JSON
         # -------------------------------
-        output_file = "github_analysis.json"
+        output_file = output_path
         with open(output_file, "w", encoding="utf-8") as f:
             json.dump(final_json, f, indent=2)
 
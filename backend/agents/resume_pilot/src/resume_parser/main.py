@@ -4,6 +4,11 @@ from resume_parser.github_tools.github_append import append_json_data ,process_g
 from resume_parser.skill_tools.skill_utils import TECH_SKILLS_MASTER
 from resume_parser.verification_tools.verify_skills_tool import verify_skills
 from resume_parser.db.db_main import insert_candidate_and_skills
+from resume_parser.db.repositories.candidate_repo import candidate_exists
+from resume_parser.cache import file_sha256, resume_cache
+from resume_parser.pre_extract import count_tokens, merge_pre_extracted, pre_extract
+from resume_parser.tools.Pdf_tool import PDFReaderTool
+import json
 import os
 import warnings
 from datetime import datetime
@@ -22,47 +27,140 @@ logging.getLogger("opentelemetry").setLevel(logging.CRITICAL)
 # Silence urllib3 retry/timeout logs
 logging.getLogger("urllib3").setLevel(logging.CRITICAL)
 
-def run():
+_crew_template = None
+
+
+def build_crew():
     """
-    Run the crew.
+    Return a fresh ResumeParser crew, constructing it only once per process.
+    """
+    global _crew_template
+    if _crew_template is None:
+        _crew_template = ResumeParser().crew()
+    return _crew_template.copy()
+
+
+def warm_up():
+    """Preload the crew so the first request served by a worker is not cold."""
+    build_crew()
+
+
+def prepare_inputs(resume_path: Path, extracted_pdf: Path):
     """
+    Read the PDF and extract what needs no LLM (contact details, links,
+    CGPA, skills). Returns the crew inputs carrying only the residual text,
+    the fields found and the prompt token counts before and after.
+    """
+    extracted = PDFReaderTool()._run(str(resume_path), str(extracted_pdf))
+    if "error" in extracted:
+        raise Exception(extracted["error"])
+
+    pre = pre_extract(extracted["pdf_text"], extracted["links"])
+    resume_text = pre["residual_text"] or extracted["pdf_text"]
+    tokens = {
+        "full_text": count_tokens(extracted["pdf_text"]),
+        "llm_text": count_tokens(resume_text),
+    }
+    print(f"Resume text for the LLM: {tokens['full_text']} -> {tokens['llm_text']} tokens")
     inputs = {
+        "resume_path": str(resume_path),
+        "resume_text": resume_text,
     }
-    
-    extracted_pdf = BASE_DIR / "extracted_pdf_data.json"
-    skill_json = BASE_DIR / "skill_verification.json"
-    resume_json = BASE_DIR / "resume_got_off.json"
+    return inputs, pre["fields"], tokens
+
+
+def parse_resume(resume_path: str = None, workdir: str = None, sha256: str = None) -> dict:
+    """
+    Run the full resume pipeline and return the skill verification result
+    together with the inserted candidate.
+
+    Every intermediate JSON file is written to ``workdir`` (the project root
+    when not given) so concurrent runs never overwrite each other. Used
+    in-process by the backend worker pool, which passes the ``sha256`` it
+    computed while receiving the upload.
+
+    A PDF parsed before is answered from the resume cache: the existing
+    candidate is returned, or re-inserted from the cached extraction if it
+    was deleted since, without running the crew, GitHub or verification.
+    """
+    workdir = Path(workdir) if workdir else BASE_DIR
+    resume_path = Path(resume_path) if resume_path else workdir / "resume.pdf"
+
+    extracted_pdf = resume_path.parent / "extracted_pdf_data.json"
+    skill_json = workdir / "skill_verification.json"
+    resume_json = workdir / "resume_got_off.json"
+    github_json = workdir / "github_analysis.json"
+
+    if resume_cache is not None:
+        sha256 = sha256 or file_sha256(resume_path)
+        cached = resume_cache.get(sha256)
+        if cached is not None:
+            return from_cache(sha256, cached, resume_json, skill_json)
 
     try:
 
-        print("Step 1: Kickoff agent...")
-        ResumeParser().crew().kickoff(inputs=inputs)
+        print("Step 1: Pre-extracting resume fields...")
+        inputs, fields, tokens = prepare_inputs(resume_path, extracted_pdf)
+
+        print("Step 2: Kickoff agent...")
+        output = build_crew().kickoff(inputs=inputs)
+        with open(resume_json, "w", encoding="utf-8") as f:
+            f.write(output.raw)
 
-        print("Step 2: Appending JSON...")
+        print("Step 3: Appending JSON...")
         append_json_data(extracted_pdf, resume_json)
+        merge_pre_extracted(resume_json, fields)
 
-        print("Step 3: Processing GitHub links...")
-        process_github_links(resume_json)
+        print("Step 4: Processing GitHub links...")
+        process_github_links(resume_json, github_json)
 
-        print("Step 4: Verifying skills...")
-        verify_skills()
+        print("Step 5: Verifying skills...")
+        verification = verify_skills(resume_json, github_json, skill_json)
 
-        print("Step 5: Inserting candidate and skills...")
+        print("Step 6: Inserting candidate and skills...")
         result = insert_candidate_and_skills(resume_json, skill_json)
         print("Inserted candidate:", result)
 
     except Exception as e:
         raise Exception(f"An error occurred while running the crew: {e}")
 
+    if resume_cache is not None and verification:
+        with open(resume_json, "r", encoding="utf-8") as f:
+            resume_cache.put(sha256, json.load(f), verification, result)
+
+    return {"skill_verification": verification, "candidate": result, "prompt_tokens": tokens}
+
+
+def from_cache(sha256: str, cached: dict, resume_json: Path, skill_json: Path) -> dict:
+    """Answer a re-uploaded resume from its cache entry."""
+    candidate = cached["candidate"]
+    if candidate is not None and candidate_exists(candidate["candidate_id"]):
+        print(f"♻️ Resume already parsed, candidate {candidate['candidate_id']}")
+    else:
+        print("♻️ Resume already parsed, inserting the cached extraction...")
+        with open(resume_json, "w", encoding="utf-8") as f:
+            json.dump(cached["resume"], f)
+        with open(skill_json, "w", encoding="utf-8") as f:
+            json.dump(cached["verification"], f)
+        candidate = insert_candidate_and_skills(resume_json, skill_json)
+        resume_cache.set_candidate(sha256, candidate)
+    return {"skill_verification": cached["verification"], "candidate": candidate, "cached": True}
+
+
+def run():
+    """
+    Run the crew.
+    """
+    parse_resume()
+
 
 def train():
     """
     Train the crew for a given number of iterations.
     """
-    inputs = {
-      
-    }
+    resume_path = BASE_DIR / "resume.pdf"
     try:
+        inputs, _, _ = prepare_inputs(resume_path, BASE_DIR / "extracted_pdf_data.json")
         ResumeParser().crew().train(n_iterations=int(sys.argv[1]), filename=sys.argv[2], inputs=inputs)
 
     except Exception as e:
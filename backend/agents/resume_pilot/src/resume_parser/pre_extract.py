@@ -0,0 +1,186 @@
+import json
+import re
+from functools import lru_cache
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+from resume_parser.skill_tools.skill_utils import TECH_SKILLS_MASTER
+
+EMAIL = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)*\.[a-z]{2,}", re.IGNORECASE)
+PHONE = re.compile(r"(?<![\w/])\+?\d[\d\s().-]{8,16}\d(?![\w/])")
+CGPA = re.compile(
+    r"\b(?:c\.?g\.?p\.?a|s?gpa|cpi)\b[^\d\n]{0,15}(\d{1,2}(?:\.\d{1,2})?)(?:\s*/\s*10)?",
+    re.IGNORECASE
+)
+URL = re.compile(r"(?:https?://|www\.)[^\s<>()\"']+|\b[\w-]+\.(?:com|io|dev|in|me)/[^\s<>()\"']+", re.IGNORECASE)
+
+# Profile sites the resume JSON lists under "links", by domain
+PLATFORMS = {
+    "github.com": "Github",
+    "gitlab.com": "GitLab",
+    "linkedin.com": "LinkedIn",
+    "leetcode.com": "LeetCode",
+    "codechef.com": "CodeChef",
+    "codeforces.com": "Codeforces",
+    "hackerrank.com": "HackerRank",
+    "kaggle.com": "Kaggle",
+    "medium.com": "Medium",
+    "twitter.com": "Twitter",
+    "x.com": "Twitter",
+}
+# Path segments that are not usernames (linkedin.com/in/<user>, leetcode.com/u/<user>)
+NOT_USERNAMES = {"in", "u", "profile", "profiles", "users", "user", "pub", "@"}
+
+# Skills that are also ordinary words only count when written as the skill
+CASE_SENSITIVE_SKILLS = {
+    "Go", "Gin", "Fiber", "Spring", "Swift", "Rust", "Shell", "Assembly", "Phoenix",
+    "Julia", "Nim", "Dart", "Lua", "Notion", "Slack", "Express", "Ant Design", "Elixir",
+}
+
+# Section headings of a resume, and whether the LLM still needs the section.
+# The header before the first heading is always kept (it holds the name).
+SECTIONS = [
+    (re.compile(r"(technical\s+)?skills|tech(nical)?\s+stack|technologies|tools(\s+and\s+technologies)?|programming\s+languages", re.I), False),
+    (re.compile(r"(academic\s+)?projects|personal\s+projects", re.I), True),
+    (re.compile(r"(work\s+|professional\s+)?experience|internships?|employment", re.I), True),
+    (re.compile(r"education|academics?|qualifications?", re.I), True),
+    (re.compile(r"achievements|awards|certifications?|courses|extra[\s-]?curricular|activities|hobbies|interests|languages\s+known|declaration|references|contact", re.I), False),
+]
+MAX_HEADING_LENGTH = 40
+
+
+def _skill_patterns():
+    skills = sorted(set(TECH_SKILLS_MASTER), key=len, reverse=True)
+
+    def alternation(group):
+        return r"(?<!\w)(?:" + "|".join(re.escape(s) for s in group) + r")(?![\w+#])"
+
+    exact = [s for s in skills if len(s) <= 2 or s in CASE_SENSITIVE_SKILLS]
+    loose = [s for s in skills if s not in exact]
+    canonical = {s.lower(): s for s in loose}
+    return re.compile(alternation(exact)), re.compile(alternation(loose), re.IGNORECASE), canonical
+
+
+SKILLS_EXACT, SKILLS_LOOSE, SKILL_NAMES = _skill_patterns()
+
+
+def find_skills(text: str) -> List[str]:
+    """TECH_SKILLS_MASTER entries mentioned in ``text``, in order of appearance."""
+    text = URL.sub(" ", text)
+    loose = [(m.span(), SKILL_NAMES[m.group(0).lower()]) for m in SKILLS_LOOSE.finditer(text)]
+    found = [(span[0], skill) for span, skill in loose]
+    for m in SKILLS_EXACT.finditer(text):
+        # "Spring" inside "Spring Boot" is not a skill of its own
+        if not any(start <= m.start() < end for (start, end), _ in loose):
+            found.append((m.start(), m.group(0)))
+    return list(dict.fromkeys(skill for _, skill in sorted(found)))
+
+
+def find_phone(text: str) -> Optional[re.Match]:
+    for match in PHONE.finditer(text):
+        if 10 <= len(re.sub(r"\D", "", match.group(0))) <= 13:
+            return match
+    return None
+
+
+def find_cgpa(text: str) -> Optional[str]:
+    for match in CGPA.finditer(text):
+        if float(match.group(1)) <= 10:
+            return match.group(1)
+    return None
+
+
+def profile_links(urls: List[str]) -> List[Dict[str, str]]:
+    """Platform / username pairs of the profile URLs among ``urls``."""
+    links = {}
+    for url in urls:
+        parsed = urlparse(url if "://" in url else f"https://{url}")
+        domain = parsed.netloc.lower().removeprefix("www.")
+        platform = PLATFORMS.get(domain)
+        segments = [s for s in parsed.path.split("/") if s and s.lower() not in NOT_USERNAMES]
+        if platform is None or not segments:
+            continue
+        # repository links name their owner first
+        username = segments[0] if platform in ("Github", "GitLab") else segments[-1]
+        links.setdefault((platform, username.lstrip("@")), None)
+    return [{"platform": platform, "username": username} for platform, username in links]
+
+
+def _heading(line: str):
+    stripped = line.strip().strip(":").strip()
+    if not stripped or len(stripped) > MAX_HEADING_LENGTH:
+        return None
+    for pattern, keep in SECTIONS:
+        if pattern.fullmatch(stripped):
+            return keep
+    return None
+
+
+def residual_text(text: str, consumed: List[str]) -> str:
+    """
+    The part of the resume the LLM still has to read: the header, projects,
+    experience and education, without the skills and other sections found
+    or not needed, and without the contact details already extracted.
+    """
+    kept, keep = [], True
+    for line in text.splitlines():
+        section = _heading(line)
+        if section is not None:
+            keep = section
+        if not keep:
+            continue
+        for value in consumed:
+            line = line.replace(value, " ")
+        line = URL.sub(" ", line)
+        line = re.sub(r"[ \t|•·]+", " ", line).strip(" |•·-,")
+        if line:
+            kept.append(line)
+    return "\n".join(kept)
+
+
+def pre_extract(text: str, link_uris: List[str]) -> dict:
+    """
+    Resume fields that can be read without the LLM, plus the trimmed text
+    for what is left (name, field of study, projects, experience).
+    """
+    email = EMAIL.search(text)
+    phone = find_phone(text)
+    fields = {
+        "email": email.group(0) if email else None,
+        "phone": re.sub(r"\D", "", phone.group(0))[-10:] if phone else None,
+        "links": profile_links(list(link_uris) + URL.findall(text)),
+        "cgpa": find_cgpa(text),
+        "technical_skills": find_skills(text),
+    }
+    consumed = [m.group(0) for m in (email, phone) if m]
+    return {"fields": fields, "residual_text": residual_text(text, consumed)}
+
+
+@lru_cache(maxsize=1)
+def _encoding():
+    try:
+        import tiktoken
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        return None
+
+
+def count_tokens(text: str) -> int:
+    """Prompt tokens of ``text`` (cl100k), or an estimate without tiktoken."""
+    encoding = _encoding()
+    if encoding is None:
+        return len(text) // 4
+    return len(encoding.encode(text))
+
+
+def merge_pre_extracted(resume_json_path, fields: dict):
+    """Fill the LLM's resume JSON with the fields found deterministically."""
+    with open(resume_json_path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    for key, value in fields.items():
+        if value:
+            data[key] = value
+        else:
+            data.setdefault(key, [] if key in ("links", "technical_skills") else None)
+    with open(resume_json_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
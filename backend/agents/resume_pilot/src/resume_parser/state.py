@@ -0,0 +1,141 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict
+
+# Directory for state shared with the other agents. The backend points every
+# worker at the same directory through JOBPILOT_STATE_DIR; standalone runs
+# fall back to the project root.
+STATE_DIR = Path(
+    os.getenv("JOBPILOT_STATE_DIR", Path(__file__).resolve().parents[2] / ".state")
+)
+# Holds a counter bumped after every write to the candidate tables; readers
+# compare it to tell whether what they cached is still current.
+DATA_VERSION_FILE = "data_version.sqlite3"
+# Read by the backend for /complete/stats and /parse-resume/stats
+WORKER_STATS_FILE = "worker_stats.sqlite3"
+STATS_PUBLISH_INTERVAL = float(os.getenv("STATS_PUBLISH_INTERVAL", "5"))
+
+STATS_TABLE = """
+    create table if not exists cache_stats (
+        name text primary key,
+        value integer not null
+    )
+"""
+
+
+def state_path(name: str) -> Path:
+    STATE_DIR.mkdir(parents=True, exist_ok=True)
+    return STATE_DIR / name
+
+
+class SQLiteStore:
+    """
+    Base of the stores kept in SQLite in the shared state directory, so
+    every worker process sees the same entries and counters.
+
+    Each thread gets its own connection, in WAL mode so readers don't wait
+    for a writer. Named counters (hits, misses, evictions...) live in the
+    ``cache_stats`` table; ``tables`` are the store's own CREATE statements.
+    """
+
+    row_factory = None
+
+    def __init__(self, path, *tables: str):
+        self.path = str(path)
+        self._local = threading.local()
+        with self._connect() as conn:
+            for ddl in (*tables, STATS_TABLE):
+                conn.execute(ddl)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.execute("pragma journal_mode=wal")
+            if self.row_factory is not None:
+                conn.row_factory = self.row_factory
+            self._local.conn = conn
+        return conn
+
+    def _count(self, conn: sqlite3.Connection, name: str, amount: int = 1):
+        if amount:
+            conn.execute(
+                "insert into cache_stats (name, value) values (?, ?) "
+                "on conflict(name) do update set value = value + excluded.value",
+                (name, amount)
+            )
+
+    def count(self, name: str, amount: int = 1):
+        with self._connect() as conn:
+            self._count(conn, name, amount)
+
+    def counters(self) -> Dict[str, int]:
+        return dict(tuple(row) for row in self._connect().execute("select name, value from cache_stats"))
+
+    @staticmethod
+    def hit_stats(counters: Dict[str, int]) -> dict:
+        hits = counters.get("hits", 0)
+        misses = counters.get("misses", 0)
+        lookups = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+data_versions = SQLiteStore(state_path(DATA_VERSION_FILE))
+
+
+def mark_data_changed():
+    # a counter, not a timestamp: two writes in the same clock tick must
+    # still yield two versions
+    data_versions.count("data_version")
+
+
+class StatsBoard(SQLiteStore):
+    """
+    Latest stats of every worker process, read by the backend so a stats
+    request never waits for a worker busy with a run.
+
+    Each worker publishes its row from a background thread every
+    ``interval`` seconds: "shared" stats of the stores every worker sees
+    and "process" stats only this process knows.
+    """
+
+    def __init__(self, path, interval: float = STATS_PUBLISH_INTERVAL):
+        self.interval = interval
+        super().__init__(path, """
+            create table if not exists worker_stats (
+                worker text primary key,
+                pid integer not null,
+                stats text not null,
+                published_at real not null
+            )
+        """)
+
+    def publish(self, worker: str, stats: dict):
+        with self._connect() as conn:
+            conn.execute(
+                "insert or replace into worker_stats (worker, pid, stats, published_at) "
+                "values (?, ?, ?, ?)",
+                (worker, os.getpid(), json.dumps(stats, default=str), time.time())
+            )
+
+    def start_publishing(self, worker: str, collect: Callable[[], dict]):
+        def loop():
+            while True:
+                try:
+                    self.publish(worker, collect())
+                except Exception as e:
+                    print(f"⚠️ Could not publish worker stats: {e}")
+                time.sleep(self.interval)
+
+        threading.Thread(target=loop, name="stats-publisher", daemon=True).start()
+
+
+stats_board = StatsBoard(state_path(WORKER_STATS_FILE))
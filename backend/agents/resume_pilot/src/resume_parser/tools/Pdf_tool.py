@@ -1,12 +1,32 @@
 from crewai.tools import BaseTool
-from typing import Type, List
+from typing import Type, List, Optional, Tuple, Union
 from pydantic import BaseModel, Field
-import PyPDF2
 import fitz  # PyMuPDF
 import json
 import os
 
 
+def extract_pdf(source: Union[str, bytes]) -> Tuple[str, List[str]]:
+    """
+    Text and link URIs of a PDF, read in a single PyMuPDF pass.
+
+    ``source`` is a path or the PDF's bytes, so an upload held in memory
+    never has to be written to disk. Links are deduplicated in page order.
+    """
+    if isinstance(source, (bytes, bytearray)):
+        doc = fitz.open(stream=source, filetype="pdf")
+    else:
+        doc = fitz.open(source)
+    pages: List[str] = []
+    links: List[str] = []
+    with doc:
+        for page in doc:
+            pages.append(page.get_text())
+            links.extend(link["uri"] for link in page.get_links() if "uri" in link)
+    text = "\n".join(page.strip() for page in pages if page.strip())
+    return text, list(dict.fromkeys(links))
+
+
 # -------------------------------
 # Input Schema
 # -------------------------------
@@ -27,54 +47,43 @@ class PDFReaderTool(BaseTool):
     )
     args_schema: Type[BaseModel] = PDFReaderToolInput
 
-    def _run(self, file_path: str) -> dict:
+    def _run(self, file_path: str, output_path: Optional[str] = None,
+             pdf_bytes: Optional[bytes] = None) -> dict:
+        """
+        The result is saved as extracted_pdf_data.json next to the PDF unless
+        ``output_path`` is given, so every run keeps its files in its own
+        directory. With ``pdf_bytes`` the PDF is read from memory and
+        ``file_path`` only names it.
+        """
 
-        if not os.path.exists(file_path):
+        if pdf_bytes is None and not os.path.exists(file_path):
             return {"error": f"File not found: {file_path}"}
 
         # ---------------------------
-        # 1. Extract text from PDF
-        # ---------------------------
-        pdf_text = ""
-        try:
-            with open(file_path, "rb") as f:
-                reader = PyPDF2.PdfReader(f)
-                for page in reader.pages:
-                    text = page.extract_text()
-                    if text:
-                        pdf_text += text + "\n"
-        except Exception as e:
-            return {"error": f"Error reading PDF text: {e}"}
-
-        # ---------------------------
-        # 2. Extract GitHub links
+        # 1. Extract text and GitHub links in one pass
         # ---------------------------
-        github_links: List[str] = []
         try:
-            doc = fitz.open(file_path)
-            for page in doc:
-                for link in page.get_links():
-                    if "uri" in link:
-                        url = link["uri"]
-                        if "github.com" in url.lower():
-                            github_links.append(url)
-            doc.close()
+            pdf_text, links = extract_pdf(pdf_bytes if pdf_bytes is not None else file_path)
         except Exception as e:
-            return {"error": f"Error extracting GitHub links: {e}"}
+            return {"error": f"Error reading PDF: {e}"}
 
-        github_links = list(set(github_links))  # dedupe
+        github_links = [url for url in links if "github.com" in url.lower()]
 
         # ---------------------------
-        # 3. Save to JSON
+        # 2. Save to JSON
         # ---------------------------
         result = {
             "file_path": file_path,
             "pdf_text": pdf_text.strip(),
             "github_links": github_links,
-            "github_links_count": len(github_links)
+            "github_links_count": len(github_links),
+            "links": links
         }
 
-        output_json = "extracted_pdf_data.json"
+        output_json = output_path or os.path.join(
+            os.path.dirname(os.path.abspath(file_path)),
+            "extracted_pdf_data.json"
+        )
         try:
             with open(output_json, "w", encoding="utf-8") as jf:
                 json.dump(result, jf, indent=4, ensure_ascii=False)
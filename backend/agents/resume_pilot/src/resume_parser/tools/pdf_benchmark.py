@@ -0,0 +1,96 @@
+"""
+Compare the single-pass PDF extraction with the former two-pass one.
+
+    uv run benchmark_pdf resume1.pdf resume2.pdf ... [--repeat N]
+
+Prints per-document timings and the speedup; with no paths, the project's
+resume.pdf (the one standalone runs parse) is used.
+"""
+import sys
+import time
+from pathlib import Path
+from statistics import median
+from typing import Callable, List
+
+import fitz
+import PyPDF2
+
+from resume_parser.tools.Pdf_tool import extract_pdf
+
+DEFAULT_RESUME = Path(__file__).resolve().parents[3] / "resume.pdf"
+
+
+def two_pass_extract(path: str):
+    """The previous implementation: PyPDF2 for text, then PyMuPDF for links."""
+    text = ""
+    with open(path, "rb") as f:
+        for page in PyPDF2.PdfReader(f).pages:
+            page_text = page.extract_text()
+            if page_text:
+                text += page_text + "\n"
+    links = []
+    doc = fitz.open(path)
+    for page in doc:
+        for link in page.get_links():
+            if "uri" in link:
+                links.append(link["uri"])
+    doc.close()
+    return text.strip(), list(set(links))
+
+
+def _time(extract: Callable, source, repeat: int) -> float:
+    """Median seconds of ``repeat`` runs."""
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        extract(source)
+        samples.append(time.perf_counter() - started)
+    return median(samples)
+
+
+def benchmark(paths: List[str], repeat: int = 5) -> List[dict]:
+    results = []
+    for path in paths:
+        data = Path(path).read_bytes()
+        with fitz.open(stream=data, filetype="pdf") as doc:
+            pages = doc.page_count
+        before = _time(two_pass_extract, path, repeat)
+        after = _time(extract_pdf, path, repeat)
+        in_memory = _time(extract_pdf, data, repeat)
+        results.append({
+            "file": Path(path).name,
+            "pages": pages,
+            "two_pass_ms": round(before * 1000, 2),
+            "single_pass_ms": round(after * 1000, 2),
+            "in_memory_ms": round(in_memory * 1000, 2),
+            "speedup": round(before / after, 2) if after else None,
+        })
+    return results
+
+
+def run():
+    args = sys.argv[1:]
+    repeat = 5
+    if "--repeat" in args:
+        i = args.index("--repeat")
+        repeat = int(args[i + 1])
+        del args[i:i + 2]
+    paths = args or ([str(DEFAULT_RESUME)] if DEFAULT_RESUME.exists() else [])
+    if not paths:
+        print("Usage: benchmark_pdf resume.pdf [more.pdf ...] [--repeat N]")
+        return
+
+    results = benchmark(paths, repeat)
+    print(f"{'file':<32} {'pages':>5} {'two-pass':>10} {'single':>10} {'memory':>10} {'speedup':>8}")
+    for r in results:
+        print(
+            f"{r['file'][:32]:<32} {r['pages']:>5} {r['two_pass_ms']:>8.1f}ms "
+            f"{r['single_pass_ms']:>8.1f}ms {r['in_memory_ms']:>8.1f}ms {r['speedup']:>7.2f}x"
+        )
+    speedups = [r["speedup"] for r in results if r["speedup"]]
+    if speedups:
+        print(f"median speedup: {median(speedups):.2f}x over {len(results)} documents")
+
+
+if __name__ == "__main__":
+    run()
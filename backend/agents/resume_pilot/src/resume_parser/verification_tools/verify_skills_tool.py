@@ -39,11 +39,14 @@ def verify_skills_string_match(resume_skills, github_skills):
 # -------------------------
 # Load JSONs
 # -------------------------
-def verify_skills():
+def verify_skills(
+    resume_path: str = "resume_got_off.json",
+    github_path: str = "github_analysis.json",
+    output_path: str = "skill_verification.json"
+):
     # -------------------------
     # Load Resume JSON
     # -------------------------
-    resume_path = "resume_got_off.json"
     with open(resume_path, "r", encoding="utf-8") as f:
         resume_data = json.load(f)
 
@@ -52,9 +55,8 @@ def verify_skills():
     # -------------------------
     # Load GitHub Analysis JSON
     # -------------------------
-    github_path = "github_analysis.json"
     if not os.path.exists(github_path):
-        print("github_analysis.json not found.")
+        print(f"{github_path} not found.")
         return
 
     with open(github_path, "r", encoding="utf-8") as f:
@@ -86,10 +88,12 @@ def verify_skills():
         "count_skills": count_skills
     }
 
-    with open("skill_verification.json", "w", encoding="utf-8") as f:
+    with open(output_path, "w", encoding="utf-8") as f:
         json.dump(output, f, indent=2)
 
     print("Skill verification complete!")
     print(f"Average Score: {avg_score:.2f}")
     print(f"Percentage: {avg_score * 100:.2f}%")
-    print("Saved to skill_verification.json")
+    print(f"Saved to {output_path}")
+
+    return output
@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+"""
+Long-lived resume parsing worker.
+
+Started by the backend worker pool with the project directory as CWD.
+Requests and replies are JSON lines on stdin / the original stdout; anything
+the crew prints is redirected to stderr so it cannot corrupt the protocol.
+"""
+import json
+import os
+import sys
+import traceback
+
+
+def _protocol_stream():
+    stream = os.fdopen(os.dup(sys.stdout.fileno()), "w", encoding="utf-8", buffering=1)
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+    return stream
+
+
+def _reply(stream, message: dict):
+    stream.write(json.dumps(message, default=str) + "\n")
+    stream.flush()
+
+
+def main():
+    out = _protocol_stream()
+
+    from resume_parser.main import parse_resume, warm_up
+    from resume_parser.cache import resume_cache
+    from resume_parser.state import stats_board
+
+    warm_up()
+    stats_board.start_publishing(
+        os.getenv("JOBPILOT_WORKER", f"resume-{os.getpid()}"),
+        lambda: {
+            "shared": {
+                "resume_cache": resume_cache.stats() if resume_cache is not None else {"enabled": False},
+            },
+        }
+    )
+    _reply(out, {"ready": True, "pid": os.getpid()})
+
+    ops = {
+        "run": lambda payload: parse_resume(**payload),
+    }
+
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        request = json.loads(line)
+        handler = ops.get(request.get("op"))
+        try:
+            if handler is None:
+                raise ValueError(f"Unknown op: {request.get('op')}")
+            result = handler(request.get("payload") or {})
+            _reply(out, {"id": request.get("id"), "ok": True, "result": result})
+        except Exception as e:
+            traceback.print_exc()
+            _reply(out, {"id": request.get("id"), "ok": False, "error": str(e)})
+
+
+if __name__ == "__main__":
+    main()
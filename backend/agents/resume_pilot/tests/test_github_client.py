@@ -0,0 +1,180 @@
+"""GitHubClient against a local stub of the GitHub API and raw file host."""
+import json
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from resume_parser.github_tools import github_append
+from resume_parser.github_tools.github_append import GitHubClient
+
+
+class StubGitHub:
+    """
+    Serves ``routes`` (path -> callable returning status, headers, body)
+    and records hits and the most requests it saw in flight at once.
+    """
+
+    def __init__(self):
+        self.routes = {}
+        self.hits = Counter()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                with stub._lock:
+                    stub.hits[self.path] += 1
+                    stub.in_flight += 1
+                    stub.max_in_flight = max(stub.max_in_flight, stub.in_flight)
+                try:
+                    route = stub.routes.get(self.path)
+                    status, headers, body = route(stub.hits[self.path]) if route else (404, {}, {})
+                    payload = body.encode() if isinstance(body, str) else json.dumps(body).encode()
+                    self.send_response(status)
+                    for name, value in headers.items():
+                        self.send_header(name, str(value))
+                    self.send_header("Content-Length", str(len(payload)))
+                    self.end_headers()
+                    self.wfile.write(payload)
+                except (BrokenPipeError, ConnectionResetError):
+                    # the client gave up first (timeout tests)
+                    pass
+                finally:
+                    with stub._lock:
+                        stub.in_flight -= 1
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def slow(body, delay: float):
+    def route(hit):
+        time.sleep(delay)
+        return 200, {}, body
+    return route
+
+
+@pytest.fixture
+def stub(monkeypatch):
+    stub = StubGitHub()
+    monkeypatch.setattr(github_append, "GITHUB_API_URL", f"{stub.url}/api")
+    monkeypatch.setattr(github_append, "GITHUB_RAW_URL", f"{stub.url}/raw")
+    monkeypatch.setattr(github_append, "GITHUB_MAX_RATE_LIMIT_WAIT", 5)
+    yield stub
+    stub.close()
+
+
+def test_concurrent_fetches_capped_by_pool(stub):
+    for i in range(8):
+        stub.routes[f"/api/repos/alice/r{i}"] = slow({"id": i}, 0.3)
+    client = GitHubClient(concurrency=4, timeout=5)
+
+    started = time.monotonic()
+    futures = [client.submit(client.get_json, f"{stub.url}/api/repos/alice/r{i}") for i in range(8)]
+    results = [f.result() for f in futures]
+    elapsed = time.monotonic() - started
+
+    assert results == [{"id": i} for i in range(8)]
+    assert stub.max_in_flight == 4
+    # two waves of four, not eight sequential requests
+    assert elapsed < 8 * 0.3
+
+
+def test_process_github_links_fetches_repos_concurrently(stub, tmp_path, monkeypatch):
+    monkeypatch.setattr(github_append, "_client", GitHubClient(concurrency=8, timeout=5))
+    for repo in ("r1", "r2", "r3"):
+        stub.routes[f"/api/repos/alice/{repo}"] = slow({"forks_count": 1, "stargazers_count": 2}, 0.2)
+        stub.routes[f"/api/repos/alice/{repo}/languages"] = slow({"Python": 100}, 0.2)
+        stub.routes[f"/api/repos/alice/{repo}/commits"] = slow([{}, {}], 0.2)
+        stub.routes[f"/raw/alice/{repo}/main/README.md"] = slow("Built with Docker", 0.2)
+    resume = tmp_path / "resume.json"
+    resume.write_text(json.dumps({
+        "links": [{"platform": "GitHub", "username": "alice"}],
+        "github_links": [f"https://github.com/alice/{repo}" for repo in ("r1", "r2", "r3")],
+    }))
+
+    result = json.loads(github_append.process_github_links(str(resume), str(tmp_path / "out.json")))
+
+    assert result["total_repositories"] == 3
+    for repo in result["verified_repos"]:
+        assert repo["stars"] == 2
+        assert repo["commit_count"] == 2
+        assert "Python" in repo["languages"]
+    assert sum(stub.hits.values()) == 12
+    assert stub.max_in_flight > 4
+
+
+def test_timeout(stub):
+    stub.routes["/api/repos/alice/slow"] = slow({}, 2)
+    client = GitHubClient(concurrency=2, timeout=0.2)
+    url = f"{stub.url}/api/repos/alice/slow"
+
+    started = time.monotonic()
+    with pytest.raises(requests.exceptions.Timeout):
+        client.get(url)
+    assert time.monotonic() - started < 1.5
+    assert client.get_json(url, default={}) == {}
+
+
+def test_exhausted_rate_limit_fails_fast(stub):
+    reset = int(time.time()) + 3600
+    stub.routes["/api/repos/alice/r1"] = lambda hit: (
+        403, {"X-RateLimit-Remaining": 0, "X-RateLimit-Reset": reset}, {"message": "API rate limit exceeded"}
+    )
+    client = GitHubClient(concurrency=2, timeout=5)
+
+    with pytest.raises(requests.exceptions.HTTPError):
+        client.get(f"{stub.url}/api/repos/alice/r1")
+    assert client.rate_limit_remaining == 0
+
+    # no request reaches GitHub until the reset
+    with pytest.raises(requests.exceptions.RequestException, match="rate limit exhausted"):
+        client.get(f"{stub.url}/api/repos/alice/r2")
+    assert stub.hits["/api/repos/alice/r2"] == 0
+    # the raw file host has its own limits
+    stub.routes["/raw/alice/r1/main/README.md"] = lambda hit: (200, {}, "readme")
+    assert client.get(f"{stub.url}/raw/alice/r1/main/README.md").text == "readme"
+
+
+def test_retry_after_is_honoured_once(stub):
+    stub.routes["/api/repos/alice/r1"] = lambda hit: (
+        (429, {"Retry-After": 1}, {}) if hit == 1 else (200, {"X-RateLimit-Remaining": 59}, {"id": 1})
+    )
+    client = GitHubClient(concurrency=2, timeout=5)
+
+    started = time.monotonic()
+    assert client.get(f"{stub.url}/api/repos/alice/r1").json() == {"id": 1}
+    assert time.monotonic() - started >= 1
+    assert stub.hits["/api/repos/alice/r1"] == 2
+    assert client.rate_limit_remaining == 59
+
+    stub.routes["/api/repos/alice/r2"] = lambda hit: (429, {"Retry-After": 1}, {})
+    with pytest.raises(requests.exceptions.HTTPError):
+        client.get(f"{stub.url}/api/repos/alice/r2")
+    assert stub.hits["/api/repos/alice/r2"] == 2
+
+
+def test_long_retry_after_is_not_waited_out(stub):
+    stub.routes["/api/repos/alice/r1"] = lambda hit: (429, {"Retry-After": 60}, {})
+    client = GitHubClient(concurrency=2, timeout=5)
+
+    started = time.monotonic()
+    with pytest.raises(requests.exceptions.HTTPError):
+        client.get(f"{stub.url}/api/repos/alice/r1")
+    assert time.monotonic() - started < 1
+    assert stub.hits["/api/repos/alice/r1"] == 1
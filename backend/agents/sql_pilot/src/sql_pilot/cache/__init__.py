@@ -0,0 +1,10 @@
+# __init__.py
+from .prompt_cache import PromptCache, normalize_prompt, prompt_cache
+from .similarity_cache import SimilarityCache, similarity_cache
+from .result_cache import ResultCache, result_cache
+
+__all__ = [
+    'PromptCache', 'normalize_prompt', 'prompt_cache',
+    'SimilarityCache', 'similarity_cache',
+    'ResultCache', 'result_cache',
+]
@@ -0,0 +1,111 @@
+import os
+import re
+import time
+from typing import Optional
+
+from sql_pilot.state import SQLiteStore, state_path
+
+PROMPT_CACHE_SIZE = int(os.getenv("PROMPT_CACHE_SIZE", "1000"))
+PROMPT_CACHE_TTL = int(os.getenv("PROMPT_CACHE_TTL", str(7 * 24 * 3600)))
+
+# Comparator symbols spelled out before punctuation is stripped, so
+# "cgpa > 8" and "cgpa < 8" don't share a key
+COMPARATORS = {
+    ">=": "atleast", "≥": "atleast", "=>": "atleast",
+    "<=": "upto", "≤": "upto", "=<": "upto",
+    "!=": "not", "<>": "not", "≠": "not",
+    ">": "above", "<": "below", "=": "equals",
+}
+COMPARATOR = re.compile("|".join(re.escape(c) for c in sorted(COMPARATORS, key=len, reverse=True)))
+
+
+def normalize_prompt(prompt: str) -> str:
+    """
+    Canonical form of a recruiter prompt used as the cache key.
+
+    Case, punctuation and spacing differences don't change the SQL the
+    agent would write, so "Python devs with CGPA above 8?" and
+    "python devs with cgpa above 8" share an entry. Characters that carry
+    meaning in skill names or numbers (C++, C#, node.js, 8.5) are kept,
+    and comparators become words ("cgpa >= 8" is "cgpa atleast 8").
+    """
+    p = COMPARATOR.sub(lambda m: f" {COMPARATORS[m.group(0)]} ", prompt.lower())
+    p = re.sub(r"[^a-z0-9.+#\s-]", " ", p)
+    p = re.sub(r"(?<![0-9a-z])\.|\.(?![0-9a-z])", " ", p)
+    p = re.sub(r"\s+", " ", p)
+    return p.strip()
+
+
+class PromptCache(SQLiteStore):
+    """
+    Persistent prompt -> generated SQL cache shared by all SQL workers.
+
+    Entries survive restarts and expire after ``ttl`` seconds; the least
+    recently used are evicted beyond ``max_entries``.
+    """
+
+    def __init__(self, path, max_entries: int = PROMPT_CACHE_SIZE, ttl: int = PROMPT_CACHE_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        super().__init__(path, """
+            create table if not exists prompt_sql (
+                key text primary key,
+                prompt text not null,
+                sql text not null,
+                created_at real not null,
+                last_used real not null,
+                hits integer not null default 0
+            )
+        """)
+
+    def get(self, prompt: str) -> Optional[str]:
+        key = normalize_prompt(prompt)
+        now = time.time()
+        with self._connect() as conn:
+            row = conn.execute(
+                "select sql, created_at from prompt_sql where key = ?", (key,)
+            ).fetchone()
+            if row is None or now - row[1] > self.ttl:
+                if row is not None:
+                    conn.execute("delete from prompt_sql where key = ?", (key,))
+                self._count(conn, "misses")
+                return None
+            conn.execute(
+                "update prompt_sql set last_used = ?, hits = hits + 1 where key = ?",
+                (now, key)
+            )
+            self._count(conn, "hits")
+            return row[0]
+
+    def put(self, prompt: str, sql: str):
+        key = normalize_prompt(prompt)
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "insert into prompt_sql (key, prompt, sql, created_at, last_used) "
+                "values (?, ?, ?, ?, ?) "
+                "on conflict(key) do update set sql = excluded.sql, "
+                "created_at = excluded.created_at, last_used = excluded.last_used",
+                (key, prompt, sql, now, now)
+            )
+            conn.execute(
+                "delete from prompt_sql where key in ("
+                "select key from prompt_sql order by last_used desc limit -1 offset ?)",
+                (self.max_entries,)
+            )
+
+    def invalidate(self, prompt: str):
+        with self._connect() as conn:
+            conn.execute("delete from prompt_sql where key = ?", (normalize_prompt(prompt),))
+
+    def stats(self) -> dict:
+        entries = self._connect().execute("select count(*) from prompt_sql").fetchone()[0]
+        return {
+            "entries": entries,
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl,
+            **self.hit_stats(self.counters()),
+        }
+
+
+prompt_cache = PromptCache(state_path("prompt_cache.sqlite3"))
@@ -0,0 +1,112 @@
+import json
+import os
+import sqlite3
+import time
+from typing import Any, Optional
+
+from sql_pilot.state import SQLiteStore, data_version, state_path
+
+# Total size of the cached results (serialized JSON), not of the SQLite file
+RESULT_CACHE_MAX_BYTES = int(os.getenv("RESULT_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+# Results bigger than this are never cached, they would evict everything else
+RESULT_CACHE_MAX_ENTRY_BYTES = int(os.getenv("RESULT_CACHE_MAX_ENTRY_BYTES", str(8 * 1024 * 1024)))
+
+
+class ResultCache(SQLiteStore):
+    """
+    Results of read-only SQL keyed by the normalized query text.
+
+    Entries are tagged with the data version they were read at; once the
+    resume parser writes to the candidate tables the version changes and
+    every older entry is dropped on the next access. Bounded by the total
+    size of the stored results, least recently used entries go first.
+    The agent's exploration queries and the final query of every worker
+    share entries.
+    """
+
+    def __init__(self, path, max_bytes: int = RESULT_CACHE_MAX_BYTES,
+                 max_entry_bytes: int = RESULT_CACHE_MAX_ENTRY_BYTES):
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_entry_bytes
+        self._version = None
+        super().__init__(path, """
+            create table if not exists sql_results (
+                query text primary key,
+                result text not null,
+                size integer not null,
+                data_version integer not null,
+                last_used real not null
+            )
+        """)
+
+    def _invalidate_stale(self, conn: sqlite3.Connection) -> int:
+        version = data_version()
+        if version != self._version:
+            removed = conn.execute(
+                "delete from sql_results where data_version != ?", (version,)
+            ).rowcount
+            self._count(conn, "invalidated", removed)
+            self._version = version
+        return version
+
+    def get(self, query: str) -> Optional[Any]:
+        with self._connect() as conn:
+            version = self._invalidate_stale(conn)
+            row = conn.execute(
+                "select result from sql_results where query = ? and data_version = ?",
+                (query, version)
+            ).fetchone()
+            if row is None:
+                self._count(conn, "misses")
+                return None
+            conn.execute(
+                "update sql_results set last_used = ? where query = ?", (time.time(), query)
+            )
+            self._count(conn, "hits")
+        return json.loads(row[0])
+
+    def put(self, query: str, result: Any, version: int):
+        """Store ``result``, read at data ``version`` (taken before the query ran)."""
+        payload = json.dumps(result)
+        size = len(payload)
+        if size > self.max_entry_bytes:
+            return
+        with self._connect() as conn:
+            if version != self._invalidate_stale(conn):
+                # written while the query ran: the result may already be stale
+                return
+            conn.execute(
+                "insert or replace into sql_results (query, result, size, data_version, last_used) "
+                "values (?, ?, ?, ?, ?)",
+                (query, payload, size, version, time.time())
+            )
+            total = conn.execute("select coalesce(sum(size), 0) from sql_results").fetchone()[0]
+            evicted = 0
+            if total > self.max_bytes:
+                for key, entry_size in conn.execute(
+                    "select query, size from sql_results order by last_used"
+                ).fetchall():
+                    if total <= self.max_bytes:
+                        break
+                    conn.execute("delete from sql_results where query = ?", (key,))
+                    total -= entry_size
+                    evicted += 1
+            self._count(conn, "evicted", evicted)
+
+    def stats(self) -> dict:
+        counters = self.counters()
+        entries, size = self._connect().execute(
+            "select count(*), coalesce(sum(size), 0) from sql_results"
+        ).fetchone()
+        return {
+            "entries": entries,
+            "bytes": size,
+            "max_bytes": self.max_bytes,
+            **self.hit_stats(counters),
+            "evicted": counters.get("evicted", 0),
+            "invalidated": counters.get("invalidated", 0),
+            "data_version": data_version(),
+        }
+
+
+result_cache = ResultCache(state_path("result_cache.sqlite3"))
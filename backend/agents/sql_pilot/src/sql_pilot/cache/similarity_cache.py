@@ -0,0 +1,199 @@
+import math
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+from sql_pilot.state import SQLiteStore, state_path
+from sql_pilot.cache.prompt_cache import normalize_prompt
+
+SIMILARITY_CACHE_SIZE = int(os.getenv("SIMILARITY_CACHE_SIZE", "2000"))
+SIMILARITY_THRESHOLD = float(os.getenv("SIMILARITY_THRESHOLD", "0.85"))
+
+# Words that only say "give me candidates" and don't change the query:
+# "candidates who know React" and "React developers" both reduce to "react".
+FILLER_WORDS = {
+    "a", "all", "an", "and", "any", "are", "be", "can", "candidate",
+    "candidates", "dev", "devs", "developer", "developers", "do", "does",
+    "engineer", "engineers", "every", "find", "for", "from", "get", "give",
+    "has", "have", "having", "i", "in", "is", "knowing", "know", "knows",
+    "list", "me", "need", "of", "on", "people", "person", "please", "profiles",
+    "programmer", "programmers", "proficient", "retrieve", "search", "show",
+    "skilled", "student", "students", "that", "the", "their", "them", "those",
+    "to", "us", "want", "we", "which", "who", "whose", "with", "worked",
+}
+
+NUMBER = re.compile(r"^\d+(\.\d+)?$")
+
+# Words that flip the meaning of an otherwise similar prompt, by what they
+# mean: "python and java" and "python or java" share every other term.
+# A cached prompt is only reused when it uses the same ones. Symbols
+# ("cgpa > 8") arrive spelled out by normalize_prompt (COMPARATORS), as
+# words of the same classes.
+MUST_MATCH_WORDS = {
+    "and": "and", "or": "or",
+    "not": "not", "no": "not", "without": "not", "except": "not", "excluding": "not",
+    "above": ">", "over": ">", "more": ">", "greater": ">", "higher": ">", "exceeding": ">",
+    "below": "<", "under": "<", "less": "<", "lower": "<", "fewer": "<",
+    "least": ">=", "atleast": ">=", "minimum": ">=", "min": ">=",
+    "most": "<=", "maximum": "<=", "max": "<=", "upto": "<=",
+    "equals": "=", "equal": "=", "exactly": "=",
+    "male": "male", "males": "male", "man": "male", "men": "male", "boys": "male",
+    "female": "female", "females": "female", "woman": "female", "women": "female",
+    "girls": "female", "ladies": "female",
+}
+
+Signature = Tuple[Tuple[str, ...], Tuple[str, ...]]
+
+
+def prompt_terms(prompt: str) -> List[str]:
+    # "over 8" and "above 8" are the same term
+    return [MUST_MATCH_WORDS.get(t, t) for t in normalize_prompt(prompt).split() if t not in FILLER_WORDS]
+
+
+def must_match(prompt: str) -> Signature:
+    """Numbers and meaning-changing words a reused prompt has to share."""
+    words = normalize_prompt(prompt).split()
+    numbers = tuple(sorted(w for w in words if NUMBER.match(w)))
+    keywords = tuple(sorted({MUST_MATCH_WORDS[w] for w in words if w in MUST_MATCH_WORDS}))
+    return numbers, keywords
+
+
+class SimilarityCache(SQLiteStore):
+    """
+    Reuses SQL generated for earlier prompts that mean the same thing.
+
+    Prompts are turned into TF-IDF vectors over the stored prompts and the
+    closest one above ``threshold`` (cosine similarity) wins. Numbers, and
+    connectors, negations, comparators and genders (MUST_MATCH_WORDS), have
+    to match exactly, since "CGPA above 8" and "CGPA above 9", or "python
+    and java" and "python or java", look alike but need different SQL.
+    Entries are shared by all SQL workers; each process keeps the vectors
+    in memory and reloads them when another process changed the table. The least recently used entries are evicted beyond
+    ``max_entries``.
+    """
+
+    def __init__(self, path, max_entries: int = SIMILARITY_CACHE_SIZE, threshold: float = SIMILARITY_THRESHOLD):
+        self.max_entries = max_entries
+        self.threshold = threshold
+        self._lock = threading.Lock()
+        self._generation = None
+        self._docs: Dict[int, Tuple[Dict[str, float], Signature, str]] = {}
+        self._postings: Dict[str, set] = {}
+        self._df: Counter = Counter()
+        self._n = 0
+        super().__init__(path, """
+            create table if not exists similar_prompts (
+                id integer primary key autoincrement,
+                key text unique not null,
+                prompt text not null,
+                sql text not null,
+                last_used real not null
+            )
+        """)
+
+    def _bump_generation(self, conn: sqlite3.Connection):
+        self._count(conn, "generation")
+
+    def _refresh(self, conn: sqlite3.Connection):
+        row = conn.execute("select value from cache_stats where name = 'generation'").fetchone()
+        generation = row[0] if row else 0
+        if generation == self._generation:
+            return
+        rows = []
+        df = Counter()
+        for doc_id, prompt, sql in conn.execute("select id, prompt, sql from similar_prompts"):
+            terms = prompt_terms(prompt)
+            rows.append((doc_id, terms, must_match(prompt), sql))
+            df.update(set(terms))
+        self._df = df
+        self._n = len(rows)
+        self._docs = {}
+        self._postings = {}
+        for doc_id, terms, signature, sql in rows:
+            self._docs[doc_id] = (self._vector(Counter(terms)), signature, sql)
+            for term in set(terms):
+                self._postings.setdefault(term, set()).add(doc_id)
+        self._generation = generation
+
+    def _vector(self, tf: Counter) -> Dict[str, float]:
+        vec = {
+            term: count * (math.log((1 + self._n) / (1 + self._df[term])) + 1)
+            for term, count in tf.items()
+        }
+        norm = math.sqrt(sum(w * w for w in vec.values()))
+        return {term: w / norm for term, w in vec.items()} if norm else {}
+
+    def _best_match(self, prompt: str) -> Tuple[Optional[int], float]:
+        terms = prompt_terms(prompt)
+        query = self._vector(Counter(terms))
+        signature = must_match(prompt)
+        # only entries sharing at least one term can score above zero
+        candidates = set()
+        for term in query:
+            candidates |= self._postings.get(term, set())
+        best_id, best_score = None, 0.0
+        for doc_id in candidates:
+            doc, doc_signature, _ = self._docs[doc_id]
+            if doc_signature != signature:
+                continue
+            score = sum(w * doc.get(term, 0.0) for term, w in query.items())
+            if score > best_score:
+                best_id, best_score = doc_id, score
+        return best_id, best_score
+
+    def get(self, prompt: str) -> Optional[Tuple[int, str, float]]:
+        """Return (entry id, sql, similarity) of the closest match, if close enough."""
+        with self._lock, self._connect() as conn:
+            self._refresh(conn)
+            doc_id, score = self._best_match(prompt)
+            if doc_id is None or score < self.threshold:
+                self._count(conn, "misses")
+                return None
+            conn.execute(
+                "update similar_prompts set last_used = ? where id = ?",
+                (time.time(), doc_id)
+            )
+            self._count(conn, "hits")
+            return doc_id, self._docs[doc_id][2], round(score, 4)
+
+    def put(self, prompt: str, sql: str):
+        if not prompt_terms(prompt):
+            return
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "insert into similar_prompts (key, prompt, sql, last_used) values (?, ?, ?, ?) "
+                "on conflict(key) do update set sql = excluded.sql, last_used = excluded.last_used",
+                (normalize_prompt(prompt), prompt, sql, time.time())
+            )
+            conn.execute(
+                "delete from similar_prompts where id in ("
+                "select id from similar_prompts order by last_used desc limit -1 offset ?)",
+                (self.max_entries,)
+            )
+            self._bump_generation(conn)
+
+    def invalidate(self, entry_id: int):
+        with self._lock, self._connect() as conn:
+            conn.execute("delete from similar_prompts where id = ?", (entry_id,))
+            self._bump_generation(conn)
+
+    def record_avoided_run(self):
+        self.count("avoided_crew_runs")
+
+    def stats(self) -> dict:
+        counters = self.counters()
+        entries = self._connect().execute("select count(*) from similar_prompts").fetchone()[0]
+        return {
+            "entries": entries,
+            "max_entries": self.max_entries,
+            "threshold": self.threshold,
+            **self.hit_stats(counters),
+            "avoided_crew_runs": counters.get("avoided_crew_runs", 0),
+        }
+
+
+similarity_cache = SimilarityCache(state_path("similarity_cache.sqlite3"))
@@ -0,0 +1,129 @@
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+
+from sql_pilot.state import SQLiteStore, data_version, state_path
+from sql_pilot.tools.supabase_tools import supabase
+
+# Discrete columns whose values the agent filters on
+DISCRETE_COLUMNS = {
+    "candidates": ["gender", "field_of_study"],
+    "candidate_skills": ["skill_name"],
+    "candidate_links": ["link_type"],
+}
+# Rebuilt at least this often even without inserts (e.g. rows edited by hand)
+CATALOG_REFRESH_INTERVAL = int(os.getenv("CATALOG_REFRESH_INTERVAL", "3600"))
+
+
+class DistinctValueCatalog(SQLiteStore):
+    """
+    Distinct values, with frequencies, of the discrete candidate columns.
+
+    Built with one grouped query for all columns and shared by every SQL
+    worker. It is rebuilt when the resume parser has inserted
+    candidates since (see state.data_version) or when it is older than
+    ``refresh_interval``; otherwise reads come from memory.
+    """
+
+    def __init__(self, path, columns: Dict[str, List[str]] = DISCRETE_COLUMNS,
+                 refresh_interval: int = CATALOG_REFRESH_INTERVAL):
+        self.columns = columns
+        self.refresh_interval = refresh_interval
+        self._lock = threading.Lock()
+        self._values: Dict[str, Dict[str, Dict[str, int]]] = {}
+        self.version: Optional[float] = None
+        super().__init__(path, """
+            create table if not exists distinct_values (
+                table_name text not null,
+                column_name text not null,
+                value text not null,
+                frequency integer not null,
+                primary key (table_name, column_name, value)
+            )
+        """, """
+            create table if not exists catalog_meta (
+                id integer primary key check (id = 1),
+                refreshed_at real not null,
+                data_version integer not null
+            )
+        """)
+
+    def _query(self) -> str:
+        parts = [
+            f"select '{table}' as table_name, '{column}' as column_name, "
+            f"{column}::text as value, count(*) as frequency "
+            f"from {table} where {column} is not null group by {column}"
+            for table, columns in self.columns.items()
+            for column in columns
+        ]
+        return " union all ".join(parts)
+
+    def refresh(self):
+        """Rebuild the catalog from the database."""
+        version = data_version()
+        response = (
+            supabase
+            .rpc("execute_sql", {"query": self._query()})
+            .execute()
+        )
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute("delete from distinct_values")
+            conn.executemany(
+                "insert or replace into distinct_values values (?, ?, ?, ?)",
+                [
+                    (row["table_name"], row["column_name"], row["value"], row["frequency"])
+                    for row in response.data or []
+                ]
+            )
+            conn.execute(
+                "insert or replace into catalog_meta (id, refreshed_at, data_version) values (1, ?, ?)",
+                (now, version)
+            )
+        print(f"📚 Distinct value catalog refreshed ({len(response.data or [])} values)")
+
+    def _load(self, refreshed_at: float):
+        values: Dict[str, Dict[str, Dict[str, int]]] = {}
+        rows = self._connect().execute(
+            "select table_name, column_name, value, frequency from distinct_values "
+            "order by frequency desc, value"
+        )
+        for table, column, value, frequency in rows:
+            values.setdefault(table, {}).setdefault(column, {})[value] = frequency
+        self._values = values
+        self.version = refreshed_at
+
+    def _ensure_fresh(self):
+        with self._lock:
+            meta = self._connect().execute(
+                "select refreshed_at, data_version from catalog_meta where id = 1"
+            ).fetchone()
+            if (
+                meta is None
+                or meta[1] != data_version()
+                or time.time() - meta[0] > self.refresh_interval
+            ):
+                self.refresh()
+                meta = self._connect().execute(
+                    "select refreshed_at, data_version from catalog_meta where id = 1"
+                ).fetchone()
+            if meta[0] != self.version:
+                self._load(meta[0])
+
+    def frequencies(self, table: str = None, column: str = None) -> Dict:
+        """{table: {column: {value: count}}}, optionally narrowed down."""
+        self._ensure_fresh()
+        if table is None:
+            return self._values
+        columns = self._values.get(table, {})
+        if column is None:
+            return {table: columns}
+        return {table: {column: columns.get(column, {})}}
+
+    def values(self, table: str, column: str) -> List[str]:
+        self._ensure_fresh()
+        return list(self._values.get(table, {}).get(column, {}))
+
+
+catalog = DistinctValueCatalog(state_path("catalog.sqlite3"))
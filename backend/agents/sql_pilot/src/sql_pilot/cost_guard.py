@@ -0,0 +1,138 @@
+import json
+import os
+import time
+from typing import Callable, Iterator, List, Optional
+
+# Highest planner cost a query may have; 0 disables the guard
+SQL_COST_CEILING = float(os.getenv("SQL_COST_CEILING", "100000"))
+# When the RPC can't run EXPLAIN at all, queries pass unchecked for this
+# long instead of paying a useless round trip each time
+COST_GUARD_RETRY = int(os.getenv("COST_GUARD_RETRY", "300"))
+
+
+class QueryTooExpensive(Exception):
+    """Raised for queries whose estimated cost is above the ceiling."""
+
+
+def _find_plan(value) -> Optional[dict]:
+    """Dig the top plan node out of however the RPC wrapped EXPLAIN's output."""
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except ValueError:
+            return None
+    if isinstance(value, dict):
+        if "Plan" in value:
+            return value["Plan"]
+        values = value.values()
+    elif isinstance(value, list):
+        values = value
+    else:
+        return None
+    for item in values:
+        plan = _find_plan(item)
+        if plan is not None:
+            return plan
+    return None
+
+
+def _nodes(plan: dict) -> Iterator[dict]:
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from _nodes(child)
+
+
+def plan_hints(plan: dict) -> List[str]:
+    """What in the plan makes it expensive, phrased for the agent."""
+    hints = []
+    for node in _nodes(plan):
+        kind = node.get("Node Type")
+        if kind == "Nested Loop" and "Join Filter" not in node:
+            inner = node.get("Plans", [{}])[-1]
+            if "Index Cond" not in inner and "Recheck Cond" not in inner:
+                hints.append(
+                    "a join without a join condition (cross join): join the tables "
+                    "on candidate_id"
+                )
+        elif kind == "Seq Scan" and node.get("Plan Rows", 0) > 10000:
+            hints.append(
+                f"a full scan of {node.get('Relation Name')} "
+                f"(~{node.get('Plan Rows')} rows): filter on indexed columns"
+            )
+        elif kind == "Sort" and node.get("Plan Rows", 0) > 100000:
+            hints.append(f"sorting ~{node.get('Plan Rows')} rows: filter before ordering")
+    return list(dict.fromkeys(hints))
+
+
+class CostGuard:
+    """
+    Rejects queries the planner expects to be too expensive.
+
+    Every read-only query is EXPLAINed (no execution) before it is sent; if
+    the estimated total cost exceeds ``ceiling`` a QueryTooExpensive carries
+    the estimate and hints about what to change back to the agent, so it can
+    rewrite the query instead of tying up the database. A query EXPLAIN
+    rejects (syntax error, unknown column) raises the database's error like
+    running it would; only when EXPLAIN itself is unavailable does the guard
+    pause.
+    """
+
+    def __init__(self, fetch: Callable[[str], list], ceiling: float = SQL_COST_CEILING):
+        self.fetch = fetch
+        self.ceiling = ceiling
+        self.checked = 0
+        self.rejected = 0
+        self._disabled_until = 0.0
+        self._explain_works = False
+
+    def _explain_available(self) -> bool:
+        """Whether the RPC runs EXPLAIN for a query that is surely valid."""
+        if not self._explain_works:
+            try:
+                self._explain_works = _find_plan(self.fetch("explain (format json) select 1")) is not None
+            except Exception:
+                self._explain_works = False
+        return self._explain_works
+
+    def estimate(self, query: str) -> Optional[dict]:
+        """Top plan node of ``query``, or None if EXPLAIN is unavailable."""
+        if time.monotonic() < self._disabled_until:
+            return None
+        try:
+            plan = _find_plan(self.fetch(f"explain (format json) {query}"))
+        except Exception as e:
+            if self._explain_available():
+                # the query itself is broken; the agent needs that error
+                raise
+            print(f"⚠️ EXPLAIN unavailable, cost guard paused: {e}")
+            plan = None
+        if plan is None:
+            self._explain_works = False
+            self._disabled_until = time.monotonic() + COST_GUARD_RETRY
+        return plan
+
+    def check(self, query: str):
+        if not self.ceiling:
+            return
+        plan = self.estimate(query)
+        if plan is None:
+            return
+        self.checked += 1
+        cost = plan.get("Total Cost", 0)
+        if cost <= self.ceiling:
+            return
+        self.rejected += 1
+        hints = plan_hints(plan) or ["add selective filters or a LIMIT"]
+        raise QueryTooExpensive(
+            f"Query rejected: estimated cost {cost:.0f} exceeds the limit of "
+            f"{self.ceiling:.0f} (~{plan.get('Plan Rows', '?')} rows). "
+            f"The plan shows {'; '.join(hints)}."
+        )
+
+    def stats(self) -> dict:
+        return {
+            "ceiling": self.ceiling,
+            "checked": self.checked,
+            "rejected": self.rejected,
+            "paused": time.monotonic() < self._disabled_until,
+        }
@@ -4,9 +4,13 @@ from crewai.project import CrewBase, agent, crew, task
 from crewai.agents.agent_builder.base_agent import BaseAgent
 from typing import List
 from .tools.supabase_tools import ExecuteSQLTool, ListTablesTool, GetTableSchemaTool
-from crewai.knowledge.source.text_file_knowledge_source import TextFileKnowledgeSource
+from .tools.catalog_tool import GetDistinctValuesTool
+from crewai.memory import EntityMemory, LongTermMemory, ShortTermMemory
+from .knowledge import PersistentTextFileKnowledgeSource
+from .memory import BoundedLTMStorage, BoundedRAGStorage
 
-text_source = TextFileKnowledgeSource(
+# Embedded once and reused across runs until tech.txt changes
+text_source = PersistentTextFileKnowledgeSource(
     file_paths=["tech.txt"]
 )
 
@@ -25,7 +29,8 @@ class SqlAgent():
             tools=[
                 ExecuteSQLTool(),
                 ListTablesTool(),
-                GetTableSchemaTool()
+                GetTableSchemaTool(),
+                GetDistinctValuesTool()
             ],
             knowledge_sources=[text_source]
         )
@@ -34,7 +39,6 @@ class SqlAgent():
     def sql_query_task(self) -> Task:
         return Task(
             config=self.tasks_config['sql_query_task'], # type:ignore
-            output_file="output.txt"
         )
 
     @crew
@@ -45,6 +49,10 @@ class SqlAgent():
             tasks=self.tasks,
             process=Process.sequential,
             memory=True,
+            # size-capped stores, compacted as they grow (see memory.py)
+            short_term_memory=ShortTermMemory(storage=BoundedRAGStorage("short_term", self.agents)),
+            entity_memory=EntityMemory(storage=BoundedRAGStorage("entities", self.agents)),
+            long_term_memory=LongTermMemory(storage=BoundedLTMStorage()),
             verbose=True,
             tracing=True
         )
@@ -0,0 +1,359 @@
+import re
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from sql_pilot.cache.similarity_cache import FILLER_WORDS
+
+# Longest skill or field name, in words, looked up in the catalog
+MAX_NAME_WORDS = 4
+
+# Words that may appear anywhere without changing the query
+IGNORED_WORDS = FILLER_WORDS | {
+    "background", "branch", "degree", "field", "gender", "major", "score",
+    "scoring", "skill", "skills", "stack", "study", "studying",
+}
+CONNECTORS = {"and", "or", ",", "&"}
+
+# How prompts (and stored values) spell the two common genders; the values
+# filtered on always come from the catalog
+GENDER_WORDS = {
+    "m": "male", "male": "male", "males": "male", "man": "male", "men": "male",
+    "boy": "male", "boys": "male",
+    "f": "female", "female": "female", "females": "female", "woman": "female",
+    "women": "female", "girl": "female", "girls": "female", "ladies": "female",
+}
+CGPA_WORDS = {"cgpa", "gpa", "cgpas", "sgpa", "pointer"}
+YEAR_WORDS = {"year", "years", "yr", "yrs"}
+EXPERIENCE_WORDS = {"experience", "exp", "experienced"}
+FRESHER_WORDS = {"fresher", "freshers"}
+
+# comparator phrases, longest first so "more than" wins over "more"
+COMPARATORS: List[Tuple[Tuple[str, ...], str]] = sorted([
+    ((">",), ">"), (("above",), ">"), (("over",), ">"), (("greater", "than"), ">"),
+    (("more", "than"), ">"), (("higher", "than"), ">"), (("exceeding",), ">"),
+    ((">=",), ">="), (("at", "least"), ">="), (("atleast",), ">="),
+    (("minimum",), ">="), (("min",), ">="),
+    (("<",), "<"), (("below",), "<"), (("under",), "<"), (("less", "than"), "<"),
+    (("lower", "than"), "<"), (("fewer", "than"), "<"),
+    (("<=",), "<="), (("at", "most"), "<="), (("maximum",), "<="), (("max",), "<="),
+    (("up", "to"), "<="), (("upto",), "<="),
+    (("exactly",), "="), (("=",), "="),
+], key=lambda item: -len(item[0]))
+OR_MORE = {"more", "above", "higher", "greater", "plus"}
+OR_LESS = {"less", "below", "lower", "fewer"}
+
+TOKEN = re.compile(r">=|<=|[<>=,&]|\d+(?:\.\d+)?\+?|[a-z][a-z0-9.+#-]*")
+NUMBER = re.compile(r"^(\d+(?:\.\d+)?)(\+?)$")
+
+
+def tokenize(prompt: str) -> List[str]:
+    return [t.rstrip(".") or t for t in TOKEN.findall(prompt.lower())]
+
+
+def name_key(name: str) -> str:
+    """Spelling-insensitive key: "React.js", "ReactJS" and "react" match."""
+    key = re.sub(r"[\s._-]", "", name.lower())
+    if len(key) > 4 and key.endswith("js"):
+        key = key[:-2]
+    return key
+
+
+def sql_literal(value) -> str:
+    if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+        raise TypeError(f"Unsupported SQL parameter: {value!r}")
+    if isinstance(value, (int, float)):
+        return repr(value)
+    return "'" + value.replace("'", "''") + "'"
+
+
+class CompiledQuery:
+    """SQL template with ``:name`` placeholders and the values bound to them."""
+
+    def __init__(self, template: str, params: Dict[str, object]):
+        self.template = template
+        self.params = params
+
+    @property
+    def sql(self) -> str:
+        return re.sub(
+            r":(p\d+)\b",
+            lambda m: sql_literal(self.params[m.group(1)]),
+            self.template
+        )
+
+
+class _Parser:
+    """Consumes a tokenized prompt; any token it can't account for aborts."""
+
+    def __init__(self, tokens: List[str], skills: Dict[str, List[str]], fields: Dict[str, List[str]],
+                 genders: Dict[str, List[str]]):
+        self.tokens = tokens
+        self.skills = skills
+        self.fields = fields
+        self.genders = genders
+        self.conditions: List[str] = []
+        self.params: Dict[str, object] = {}
+        self.skill_groups: List[List[str]] = []
+        self.skill_joiners = set()
+        self._joiner = None
+        self._last_was_skill = False
+
+    def param(self, value) -> str:
+        name = f"p{len(self.params)}"
+        self.params[name] = value
+        return f":{name}"
+
+    def parse(self) -> Optional[CompiledQuery]:
+        i = 0
+        while i < len(self.tokens):
+            j = self.clause(i)
+            if j is None:
+                return None
+            i = j
+        return self.build()
+
+    def clause(self, i: int) -> Optional[int]:
+        token = self.tokens[i]
+        if token in CONNECTORS:
+            if token == "or" and not self._last_was_skill:
+                # "male or female", "cgpa above 9 or 5 years of experience":
+                # only skill lists are ORed, anything else goes to the crew
+                return None
+            if self._last_was_skill:
+                self._joiner = "or" if token == "or" else "and"
+            return i + 1
+        for matcher in (self.cgpa, self.experience, self.gender, self.named_value):
+            j = matcher(i)
+            if j is not None:
+                if self._joiner == "or" and not self._last_was_skill:
+                    # "react or cgpa above 8"
+                    return None
+                return j
+        if token in IGNORED_WORDS:
+            return i + 1
+        return None
+
+    # numeric bounds
+
+    def number(self, i: int) -> Optional[Tuple[float, bool, int]]:
+        if i >= len(self.tokens):
+            return None
+        m = NUMBER.match(self.tokens[i])
+        if not m:
+            return None
+        return float(m.group(1)), bool(m.group(2)), i + 1
+
+    def bound(self, i: int, default_op: str) -> Optional[Tuple[str, tuple, int]]:
+        """Parse "above 8", "8+", "8 or more", "between 7 and 9" or a bare number."""
+        tokens = self.tokens
+        if i < len(tokens) and tokens[i] == "between":
+            low = self.number(i + 1)
+            if low and low[2] < len(tokens) and tokens[low[2]] in ("and", "to", "-"):
+                high = self.number(low[2] + 1)
+                if high:
+                    return "between", (low[0], high[0]), high[2]
+            return None
+        op = None
+        for phrase, phrase_op in COMPARATORS:
+            if tuple(tokens[i:i + len(phrase)]) == phrase:
+                op, i = phrase_op, i + len(phrase)
+                break
+        parsed = self.number(i)
+        if parsed is None:
+            return None
+        value, plus, i = parsed
+        if plus:
+            if op is not None:
+                return None
+            op = ">="
+        elif op is None and i + 1 < len(tokens) and tokens[i] == "or":
+            if tokens[i + 1] in OR_MORE:
+                op, i = ">=", i + 2
+            elif tokens[i + 1] in OR_LESS:
+                op, i = "<=", i + 2
+        return op or default_op, (value,), i
+
+    def add_bound(self, column: str, op: str, values: tuple):
+        if op == "between":
+            low, high = sorted(values)
+            self.conditions.append(f"{column} between {self.param(low)} and {self.param(high)}")
+        else:
+            self.conditions.append(f"{column} {op} {self.param(values[0])}")
+        self._last_was_skill = False
+
+    def skip(self, i: int, words) -> int:
+        while i < len(self.tokens) and self.tokens[i] in words:
+            i += 1
+        return i
+
+    def cgpa(self, i: int) -> Optional[int]:
+        tokens = self.tokens
+        if tokens[i] in CGPA_WORDS:
+            parsed = self.bound(self.skip(i + 1, {"of", "is", "score", "with"}), ">=")
+            if parsed is None:
+                return None
+            op, values, j = parsed
+        else:
+            parsed = self.bound(i, ">=")
+            if parsed is None:
+                return None
+            op, values, j = parsed
+            j = self.skip(j, {"in", "of"})
+            if j >= len(tokens) or tokens[j] not in CGPA_WORDS:
+                return None
+            j += 1
+        if not all(0 <= v <= 10 for v in values):
+            return None
+        self.add_bound("c.cgpa", op, values)
+        return j
+
+    def experience(self, i: int) -> Optional[int]:
+        tokens = self.tokens
+        if tokens[i] in FRESHER_WORDS:
+            self.add_bound("c.years_of_experience", "=", (0,))
+            return i + 1
+        j = i
+        leading = tokens[i] in EXPERIENCE_WORDS
+        if leading:
+            j = self.skip(i + 1, {"of", "with", "is"})
+        parsed = self.bound(j, ">=")
+        if parsed is None:
+            return None
+        op, values, j = parsed
+        if j < len(tokens) and tokens[j] in YEAR_WORDS:
+            j += 1
+        elif not leading:
+            return None
+        if not leading:
+            # "3 years" alone is ambiguous, "3 years of experience" is not
+            k = self.skip(j, {"of", "in", "work", "industry"})
+            if k >= len(tokens) or tokens[k] not in EXPERIENCE_WORDS:
+                return None
+            j = k + 1
+        if any(v != int(v) for v in values):
+            return None
+        self.add_bound("c.years_of_experience", op, tuple(int(v) for v in values))
+        return j
+
+    def gender(self, i: int) -> Optional[int]:
+        token = self.tokens[i]
+        values = self.genders.get(name_key(token)) or self.genders.get(GENDER_WORDS.get(token, ""))
+        if not values:
+            return None
+        placeholders = ", ".join(self.param(v) for v in values)
+        self.conditions.append(f"c.gender in ({placeholders})")
+        self._last_was_skill = False
+        return i + 1
+
+    def named_value(self, i: int) -> Optional[int]:
+        for n in range(min(MAX_NAME_WORDS, len(self.tokens) - i), 0, -1):
+            words = self.tokens[i:i + n]
+            if n == 1 and words[0] in IGNORED_WORDS:
+                return None
+            key = name_key("".join(words))
+            skill = self.skills.get(key)
+            field = self.fields.get(key)
+            if skill and field:
+                # could be either column; leave it to the crew
+                return None
+            if skill:
+                if self._last_was_skill:
+                    self.skill_joiners.add(self._joiner or "and")
+                self.skill_groups.append(skill)
+                self._last_was_skill = True
+                self._joiner = None
+                return i + n
+            if field:
+                placeholders = ", ".join(self.param(v) for v in field)
+                self.conditions.append(f"c.field_of_study in ({placeholders})")
+                self._last_was_skill = False
+                return i + n
+        return None
+
+    def build(self) -> Optional[CompiledQuery]:
+        if self._joiner == "or":
+            # a trailing "or" after the last skill
+            return None
+        if len(self.skill_joiners) > 1:
+            # "react and node or vue": precedence is anyone's guess
+            return None
+        if self.skill_groups:
+            if self.skill_joiners == {"or"}:
+                groups = [[v for group in self.skill_groups for v in group]]
+            else:
+                groups = self.skill_groups
+            for group in groups:
+                placeholders = ", ".join(self.param(v) for v in group)
+                self.conditions.append(
+                    "exists (select 1 from candidate_skills s "
+                    f"where s.candidate_id = c.candidate_id and s.skill_name in ({placeholders}))"
+                )
+        if not self.conditions:
+            return None
+        where = " and ".join(self.conditions)
+        return CompiledQuery(
+            f"select c.* from candidates c where {where} order by c.candidate_id",
+            self.params
+        )
+
+
+class FastPathCompiler:
+    """
+    Rule-based NL -> SQL for the common recruiter filters.
+
+    Understands skills, CGPA ranges, years of experience, field of study and
+    gender over candidates / candidate_skills and compiles them straight to
+    SQL without an LLM call. Skill, field and gender names are resolved
+    against the distinct value catalog, so filters only ever use existing values (the
+    same rule the crew follows). Prompts with anything it can't
+    account for return None and go to the crew instead.
+    """
+
+    def __init__(self, catalog):
+        self.catalog = catalog
+        self._lock = threading.Lock()
+        self._version = None
+        self._skills: Dict[str, List[str]] = {}
+        self._fields: Dict[str, List[str]] = {}
+        self._genders: Dict[str, List[str]] = {}
+
+    @staticmethod
+    def _index(values: List[str]) -> Dict[str, List[str]]:
+        index: Dict[str, List[str]] = {}
+        for value in values:
+            if value:
+                index.setdefault(name_key(value), []).append(value)
+        return index
+
+    @staticmethod
+    def _gender_index(values: List[str]) -> Dict[str, List[str]]:
+        """Stored genders by their own key and by "male" / "female" when they spell one."""
+        index = FastPathCompiler._index(values)
+        for value in values:
+            gender = GENDER_WORDS.get(value.strip().lower()) if value else None
+            if gender and value not in index.setdefault(gender, []):
+                index[gender].append(value)
+        return index
+
+    def _catalog(self):
+        with self._lock:
+            skills = self.catalog.values("candidate_skills", "skill_name")
+            fields = self.catalog.values("candidates", "field_of_study")
+            genders = self.catalog.values("candidates", "gender")
+            if self.catalog.version != self._version:
+                self._skills = self._index(skills)
+                self._fields = self._index(fields)
+                self._genders = self._gender_index(genders)
+                self._version = self.catalog.version
+            return self._skills, self._fields, self._genders
+
+    def compile(self, prompt: str) -> Optional[CompiledQuery]:
+        tokens = tokenize(prompt)
+        if not tokens or any(t in ("not", "no", "without", "except", "excluding") for t in tokens):
+            return None
+        try:
+            skills, fields, genders = self._catalog()
+        except Exception as e:
+            print(f"Fast path unavailable, could not load catalog: {e}")
+            return None
+        return _Parser(tokens, skills, fields, genders).parse()
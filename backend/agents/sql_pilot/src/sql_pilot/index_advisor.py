@@ -0,0 +1,154 @@
+import json
+import os
+import re
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+
+from sql_pilot.state import state_path
+
+QUERY_HISTORY = state_path("query_history.jsonl")
+# Last query of a standalone run (see main.run)
+QUERY_FILE = Path(__file__).resolve().parents[2] / "query.txt"
+# The history is rotated to query_history.jsonl.1 beyond this size
+QUERY_HISTORY_MAX_BYTES = int(os.getenv("QUERY_HISTORY_MAX_BYTES", str(5 * 1024 * 1024)))
+# Columns filtered on fewer times than this are not worth an index
+INDEX_ADVISOR_MIN_USES = int(os.getenv("INDEX_ADVISOR_MIN_USES", "2"))
+
+KEYWORDS = {
+    "where", "on", "join", "left", "right", "inner", "outer", "full", "cross",
+    "group", "order", "limit", "offset", "having", "union", "using", "natural",
+}
+TABLE_REF = re.compile(
+    r"\b(?:from|join)\s+(?:public\.)?([a-z_][a-z0-9_]*)(?:\s+(?:as\s+)?([a-z_][a-z0-9_]*))?"
+)
+OPERATOR = r"(?:=|<>|!=|<=|>=|<|>|\bin\b|\blike\b|\bilike\b|\bbetween\b|\bis\b)"
+QUALIFIED = re.compile(
+    r"(lower\(\s*)?\b([a-z_][a-z0-9_]*)\.([a-z_][a-z0-9_]*)\s*\)?\s*" + OPERATOR
+)
+JOIN_RIGHT = re.compile(r"=\s*([a-z_][a-z0-9_]*)\.([a-z_][a-z0-9_]*)")
+UNQUALIFIED = re.compile(r"(lower\(\s*)?(?<![.\w])([a-z_][a-z0-9_]*)\s*\)?\s*" + OPERATOR)
+STRING = re.compile(r"'(?:[^']|'')*'")
+
+
+def log_query(query: str, duration_ms: float):
+    """Append an executed query to the history the advisor reads."""
+    try:
+        if QUERY_HISTORY.exists() and QUERY_HISTORY.stat().st_size > QUERY_HISTORY_MAX_BYTES:
+            os.replace(QUERY_HISTORY, QUERY_HISTORY.with_name(QUERY_HISTORY.name + ".1"))
+        line = json.dumps({"ts": time.time(), "ms": round(duration_ms, 1), "query": query})
+        with open(QUERY_HISTORY, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+    except OSError as e:
+        print(f"⚠️ Could not log query: {e}")
+
+
+def read_history(paths: Iterable[Path]) -> List[str]:
+    queries = []
+    for path in paths:
+        if not path.exists():
+            continue
+        with open(path, encoding="utf-8") as f:
+            if path.suffix == ".txt":
+                # query.txt written by standalone runs: the query as is
+                text = f.read().strip()
+                if text:
+                    queries.append(text)
+                continue
+            for line in f:
+                try:
+                    queries.append(json.loads(line)["query"])
+                except (ValueError, KeyError):
+                    continue
+    return queries
+
+
+def filtered_columns(query: str) -> Counter:
+    """(table, column expression) pairs used in filters and joins of a query."""
+    q = STRING.sub("''", query.lower())
+    aliases: Dict[str, str] = {}
+    tables = []
+    for table, alias in TABLE_REF.findall(q):
+        tables.append(table)
+        aliases[table] = table
+        if alias and alias not in KEYWORDS:
+            aliases[alias] = table
+
+    used = Counter()
+    for lower, alias, column in QUALIFIED.findall(q):
+        if alias in aliases:
+            used[(aliases[alias], f"lower({column})" if lower else column)] += 1
+    for alias, column in JOIN_RIGHT.findall(q):
+        if alias in aliases:
+            used[(aliases[alias], column)] += 1
+    if len(set(tables)) == 1:
+        for lower, column in UNQUALIFIED.findall(q):
+            if column not in KEYWORDS and column not in aliases and column not in ("and", "or", "not"):
+                used[(tables[0], f"lower({column})" if lower else column)] += 1
+    return used
+
+
+def existing_indexes(fetch: Callable[[str], list]) -> Dict[str, set]:
+    """Leading column (or expression) of every index, per table."""
+    rows = fetch("select tablename, indexdef from pg_indexes where schemaname = 'public'") or []
+    indexed: Dict[str, set] = {}
+    for row in rows:
+        m = re.search(r"\((.+)\)\s*$", row["indexdef"])
+        if m:
+            leading = m.group(1).split(",")[0].strip().lower()
+            indexed.setdefault(row["tablename"], set()).add(leading)
+    return indexed
+
+
+def build_report(queries: List[str], indexed: Optional[Dict[str, set]] = None,
+                 min_uses: int = INDEX_ADVISOR_MIN_USES) -> dict:
+    """
+    Suggest indexes for the columns the logged queries filter and join on
+    most, skipping those an existing index already leads with.
+    """
+    usage = Counter()
+    for query in queries:
+        usage.update(filtered_columns(query))
+
+    suggestions, covered = [], []
+    for (table, column), uses in usage.most_common():
+        if uses < min_uses:
+            break
+        entry = {"table": table, "column": column, "uses": uses}
+        if indexed is not None and column in indexed.get(table, set()):
+            covered.append(entry)
+            continue
+        name = re.sub(r"\W+", "_", f"idx_{table}_{column}").strip("_")
+        entry["statement"] = f"create index concurrently if not exists {name} on {table} ({column});"
+        suggestions.append(entry)
+
+    return {
+        "queries_analyzed": len(queries),
+        "existing_indexes_checked": indexed is not None,
+        "suggestions": suggestions,
+        "already_indexed": covered,
+    }
+
+
+def report(fetch: Optional[Callable[[str], list]] = None, extra_paths: Iterable[Path] = ()) -> dict:
+    paths = [QUERY_HISTORY.with_name(QUERY_HISTORY.name + ".1"), QUERY_HISTORY, *extra_paths]
+    indexed = None
+    if fetch is not None:
+        try:
+            indexed = existing_indexes(fetch)
+        except Exception as e:
+            print(f"⚠️ Could not read existing indexes: {e}")
+    return build_report(read_history(paths), indexed)
+
+
+def run():
+    """
+    Print the index report for the logged queries (and query.txt).
+    """
+    from sql_pilot.tools.supabase_tools import fetch_uncached
+
+    result = report(fetch_uncached, [QUERY_FILE])
+    json.dump(result, sys.stdout, indent=2)
+    print()
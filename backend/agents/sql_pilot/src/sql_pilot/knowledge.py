@@ -0,0 +1,95 @@
+import hashlib
+import sqlite3
+import time
+
+from crewai.knowledge.source.text_file_knowledge_source import TextFileKnowledgeSource
+
+from sql_pilot.state import state_path
+
+KNOWLEDGE_INDEX = state_path("knowledge_index.sqlite3")
+
+# Collections this process already verified, by fingerprint
+_verified = {}
+
+
+def _connect() -> sqlite3.Connection:
+    conn = sqlite3.connect(KNOWLEDGE_INDEX, timeout=60, isolation_level=None)
+    conn.execute("pragma journal_mode=wal")
+    conn.execute("""
+        create table if not exists knowledge_index (
+            collection text primary key,
+            fingerprint text not null,
+            chunks integer not null,
+            built_at real not null
+        )
+    """)
+    return conn
+
+
+class PersistentTextFileKnowledgeSource(TextFileKnowledgeSource):
+    """
+    Text file knowledge source that is embedded once, not on every run.
+
+    crewai chunks and embeds knowledge sources on every kickoff; the vector
+    store is persistent already, so this records a fingerprint of the files'
+    content (and chunking settings) next to each collection and skips the
+    work while it still matches. Changed files rebuild the collection from
+    scratch so stale chunks don't linger. The record lives in the shared
+    state directory; a worker holding the write lock builds while the others
+    wait, then find the index ready.
+    """
+
+    def fingerprint(self) -> str:
+        digest = hashlib.sha256(f"{self.chunk_size}:{self.chunk_overlap}".encode())
+        for path in sorted(self.content, key=str):
+            digest.update(path.name.encode() + b"\0")
+            digest.update(self.content[path].encode("utf-8") + b"\0")
+        return digest.hexdigest()
+
+    def _collection(self) -> str:
+        name = self.storage.collection_name
+        return f"knowledge_{name}" if name else "knowledge"
+
+    def _indexed_chunks(self) -> int:
+        client = self.storage._get_client()
+        return client.get_or_create_collection(collection_name=self._collection()).count()
+
+    def add(self) -> None:
+        collection = self._collection()
+        fingerprint = self.fingerprint()
+        if _verified.get(collection) == fingerprint:
+            return
+
+        conn = _connect()
+        try:
+            conn.execute("begin immediate")
+            row = conn.execute(
+                "select fingerprint from knowledge_index where collection = ?", (collection,)
+            ).fetchone()
+            if row is not None and row[0] == fingerprint and self._indexed_chunks() > 0:
+                conn.execute("commit")
+                _verified[collection] = fingerprint
+                print(f"📚 Knowledge index up to date ({collection})")
+                return
+
+            started = time.perf_counter()
+            self.storage.reset()
+            self.chunks = []
+            super().add()
+            conn.execute(
+                "insert or replace into knowledge_index (collection, fingerprint, chunks, built_at) "
+                "values (?, ?, ?, ?)",
+                (collection, fingerprint, len(self.chunks), time.time())
+            )
+            conn.execute("commit")
+            _verified[collection] = fingerprint
+            print(
+                f"📚 Knowledge index rebuilt ({collection}, {len(self.chunks)} chunks, "
+                f"{time.perf_counter() - started:.1f}s)"
+            )
+        except Exception:
+            if conn.in_transaction:
+                conn.execute("rollback")
+            raise
+        finally:
+            conn.close()
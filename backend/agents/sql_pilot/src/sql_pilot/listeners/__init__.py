@@ -1,5 +1,6 @@
 # __init__.py
 from .my_custom_listener import MyCustomListener
+from .emitter import emitter, EventEmitter
 
 # Optionally export them if you need to access them elsewhere
-__all__ = ['MyCustomListener']
\ No newline at end of file
+__all__ = ['MyCustomListener', 'emitter', 'EventEmitter']
\ No newline at end of file
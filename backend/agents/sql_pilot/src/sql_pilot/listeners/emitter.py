@@ -0,0 +1,133 @@
+import atexit
+import os
+import queue
+import threading
+import time
+from typing import Callable, List, Optional
+
+import requests
+
+SSE_BACKEND_BATCH = "http://localhost:8000/emit/batch"
+
+MAX_PENDING_EVENTS = 1000
+MAX_BATCH_SIZE = 50
+# How long the sender waits for more events before shipping a batch
+BATCH_WINDOW = 0.05
+# After a failed send, events are dropped for this long instead of queueing
+# up behind a backend that is down or slow
+FAILURE_BACKOFF = 5
+
+
+class EventEmitter:
+    """
+    Ships listener events to the backend from a background thread.
+
+    emit() never blocks the crew: events go into a bounded queue and are
+    dropped (and counted) when it is full or the backend is failing. The
+    sender thread batches whatever is queued and hands it to the transport,
+    by default an HTTP POST over a pooled keep-alive session. Workers run by
+    the backend swap in their stdio channel instead, see set_transport().
+    """
+
+    def __init__(self, url: str = SSE_BACKEND_BATCH):
+        self.url = url
+        # run the emitted events belong to; the backend routes them to the
+        # /events?run=<id> subscribers of that run
+        self.run_id: Optional[str] = os.getenv("JOBPILOT_RUN_ID")
+        self.dropped = 0
+        self.sent = 0
+        self._reported_dropped = 0
+        self._queue: queue.Queue = queue.Queue(maxsize=MAX_PENDING_EVENTS)
+        self._session: Optional[requests.Session] = None
+        self._transport: Callable[[List[dict], int], None] = self._post
+        self._suspended_until = 0.0
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def set_transport(self, transport: Callable[[List[dict], int], None]):
+        """
+        Send batches with ``transport(events, dropped)`` instead of HTTP,
+        where ``dropped`` counts events lost since the previous batch.
+        """
+        self._transport = transport
+
+    def emit(self, payload: dict):
+        self._ensure_started()
+        if self.run_id is not None:
+            payload = dict(payload, run_id=self.run_id)
+        if time.monotonic() < self._suspended_until:
+            self._drop(1)
+            return
+        try:
+            self._queue.put_nowait(payload)
+        except queue.Full:
+            self._drop(1)
+
+    def flush(self, timeout: float = 2):
+        """Wait (bounded) until everything queued so far has been handed off."""
+        deadline = time.monotonic() + timeout
+        while self._queue.unfinished_tasks and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    def stats(self) -> dict:
+        return {
+            "sent": self.sent,
+            "dropped": self.dropped,
+            "pending": self._queue.qsize(),
+        }
+
+    def _drop(self, count: int):
+        with self._lock:
+            self.dropped += count
+
+    def _ensure_started(self):
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="event-emitter", daemon=True
+                )
+                self._thread.start()
+                atexit.register(self.flush)
+
+    def _next_batch(self) -> List[dict]:
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + BATCH_WINDOW
+        while len(batch) < MAX_BATCH_SIZE:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            dropped = self.dropped
+            try:
+                self._transport(batch, dropped - self._reported_dropped)
+                self._reported_dropped = dropped
+                self.sent += len(batch)
+            except Exception:
+                self._drop(len(batch))
+                self._suspended_until = time.monotonic() + FAILURE_BACKOFF
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _post(self, events: List[dict], dropped: int):
+        if self._session is None:
+            self._session = requests.Session()
+        response = self._session.post(
+            self.url,
+            json={"events": events, "dropped": dropped},
+            timeout=2
+        )
+        response.raise_for_status()
+
+
+emitter = EventEmitter()
@@ -15,14 +15,39 @@ from crewai.events import (
     MemoryRetrievalCompletedEvent
 )
 from crewai.events import BaseEventListener
-import requests
-
-SSE_BACKEND = "http://localhost:8000/emit"
+import threading
+from .emitter import emitter
 
 class MyCustomListener(BaseEventListener):
     def __init__(self):
+        # start timestamps of LLM calls and knowledge lookups, neither of
+        # which carries a duration. The bus runs handlers on a thread pool,
+        # so the started and completed handlers of one call rarely share a
+        # thread: calls are matched by identity and timed by the events'
+        # own timestamps, not by when a handler got to run.
+        self._started = {}
+        self._lock = threading.Lock()
         super().__init__()
 
+    @staticmethod
+    def _call_key(kind, event):
+        call_id = getattr(event, "call_id", None)
+        if call_id:
+            return (kind, call_id)
+        # an agent runs one call of a kind at a time within a task
+        return (kind, getattr(event, "agent_id", None), getattr(event, "task_id", None))
+
+    def _start(self, kind, event):
+        with self._lock:
+            self._started[self._call_key(kind, event)] = event.timestamp
+
+    def _elapsed_ms(self, kind, event):
+        with self._lock:
+            started = self._started.pop(self._call_key(kind, event), None)
+        if started is None:
+            return None
+        return round((event.timestamp - started).total_seconds() * 1000, 1)
+
     def setup_listeners(self, crewai_event_bus):
         @crewai_event_bus.on(CrewKickoffStartedEvent)
         def on_crew_started(source, event):
@@ -31,7 +56,7 @@ class MyCustomListener(BaseEventListener):
                 "action": "start",
                 "crew_name": event.crew_name
             }
-            requests.post(SSE_BACKEND, json=payload, timeout=2)
+            emitter.emit(payload)
 
 
         @crewai_event_bus.on(CrewKickoffCompletedEvent)
@@ -41,7 +66,7 @@ class MyCustomListener(BaseEventListener):
                 "action": "complete",
                 "crew_name": event.crew_name
             }
-            requests.post(SSE_BACKEND, json=payload, timeout=2)
+            emitter.emit(payload)
 
 
         @crewai_event_bus.on(AgentExecutionStartedEvent)
@@ -52,7 +77,7 @@ class MyCustomListener(BaseEventListener):
                 "agent_role": event.agent.role,
                 "agent_goal": event.agent.goal
             }
-            requests.post(SSE_BACKEND, json=payload, timeout=2)
+            emitter.emit(payload)
 
 
         @crewai_event_bus.on(AgentExecutionCompletedEvent)
@@ -62,7 +87,7 @@ class MyCustomListener(BaseEventListener):
                 "action": "complete",
                 "agent_role": event.agent.role
             }
-            requests.post(SSE_BACKEND, json=payload, timeout=2)
+            emitter.emit(payload)
 
 
         @crewai_event_bus.on(TaskStartedEvent)
@@ -73,7 +98,7 @@ class MyCustomListener(BaseEventListener):
                 "task_name": event.task.name,
                 "task_desc": event.task.description
             }
-            requests.post(SSE_BACKEND, json=payload, timeout=2)
+            emitter.emit(payload)
 
 
         @crewai_event_bus.on(TaskCompletedEvent)
@@ -83,7 +108,7 @@ class MyCustomListener(BaseEventListener):
                 "action": "complete",
                 "task_name": event.task.name
             }
-            requests.post(SSE_BACKEND, json=payload, timeout=2)
+            emitter.emit(payload)
 
 
         @crewai_event_bus.on(ToolUsageStartedEvent)
@@ -93,7 +118,7 @@ class MyCustomListener(BaseEventListener):
                 "action": "start",
                 "tool_name": event.tool_name
             }
-            requests.post(SSE_BACKEND, json=payload, timeout=2)
+            emitter.emit(payload)
 
 
         @crewai_event_bus.on(ToolUsageFinishedEvent)
@@ -102,37 +127,41 @@ class MyCustomListener(BaseEventListener):
                 "type": "tool",
                 "action": "complete",
                 "tool_name": event.tool_name,
-                "tool_output": event.output
+                "tool_output": event.output,
+                "duration_ms": round((event.finished_at - event.started_at).total_seconds() * 1000, 1)
             }
-            requests.post(SSE_BACKEND, json=payload, timeout=2)
+            emitter.emit(payload)
 
 
         @crewai_event_bus.on(KnowledgeRetrievalStartedEvent)
         def on_knowledge_retrieval_started(source, event):
+            self._start("knowledge", event)
             payload = {
                 "type": "knowledge",
                 "action": "start"
             }
-            requests.post(SSE_BACKEND, json=payload, timeout=2)
+            emitter.emit(payload)
 
 
         @crewai_event_bus.on(KnowledgeRetrievalCompletedEvent)
         def on_knowledge_retrieval_completed(source, event):
             payload = {
                 "type": "knowledge",
-                "action": "complete"
+                "action": "complete",
+                "duration_ms": self._elapsed_ms("knowledge", event)
             }
-            requests.post(SSE_BACKEND, json=payload, timeout=2)
+            emitter.emit(payload)
 
 
         @crewai_event_bus.on(LLMCallStartedEvent)
         def on_llm_call_started(source, event):
+            self._start("llm", event)
             payload = {
                 "type": "llm",
                 "action": "start",
                 "model": event.model
             }
-            requests.post(SSE_BACKEND, json=payload, timeout=2)
+            emitter.emit(payload)
 
 
         @crewai_event_bus.on(LLMCallCompletedEvent)
@@ -141,9 +170,10 @@ class MyCustomListener(BaseEventListener):
                 "type": "llm",
                 "action": "complete",
                 "model": event.model,
-                "response": event.response
+                "response": event.response,
+                "duration_ms": self._elapsed_ms("llm", event)
             }
-            requests.post(SSE_BACKEND, json=payload, timeout=2)
+            emitter.emit(payload)
 
 
         @crewai_event_bus.on(MemoryRetrievalStartedEvent)
@@ -152,14 +182,15 @@ class MyCustomListener(BaseEventListener):
                 "type": "memory",
                 "action": "start"
             }
-            requests.post(SSE_BACKEND, json=payload, timeout=2)
+            emitter.emit(payload)
 
 
         @crewai_event_bus.on(MemoryRetrievalCompletedEvent)
         def on_memory_retrieval_completed(source, event):
             payload = {
                 "type": "memory",
-                "action": "complete"
+                "action": "complete",
+                "duration_ms": event.retrieval_time_ms
             }
-            requests.post(SSE_BACKEND, json=payload, timeout=2)
+            emitter.emit(payload)
 
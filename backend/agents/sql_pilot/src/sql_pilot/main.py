@@ -3,8 +3,13 @@ import warnings
 from sql_pilot.crew import SqlAgent
 from pathlib import Path
 from sql_pilot.listeners import MyCustomListener
-from sql_pilot.tools.supabase_tools import supabase
-import re
+from sql_pilot.tools.supabase_tools import mirror, run_sql, schema
+from sql_pilot.cache import prompt_cache, similarity_cache
+from sql_pilot.fast_path import FastPathCompiler
+from sql_pilot.catalog import catalog
+from sql_pilot.pagination import (
+    InvalidCursor, decode_cursor, encode_cursor, fetch_page, query_registry, strip_limit
+)
 import json
 
 warnings.filterwarnings("ignore", category=SyntaxWarning, module="pysbd")
@@ -15,37 +20,160 @@ QUERY_FILE = ROOT_DIR / "query.txt"
 
 my_listener = MyCustomListener()
 
-def execute_sql_without_limit(input_path: str, output_path: str, supabase):
+fast_path = FastPathCompiler(catalog)
 
-    with open(input_path, "r") as f:
-        query = f.read().strip()
+def execute_sql_without_limit(query: str, output_path: str = None, query_path: str = None):
+    """
+    Execute the generated query with every LIMIT / OFFSET removed and return the rows.
 
-    cleaned_query = re.sub(
-        r"\s+LIMIT\s+\d+(\s*,\s*\d+)?;?",
-        "",
-        query,
-        flags=re.IGNORECASE
-    )
+    The result and the executed query are only written to disk when paths are
+    given, so concurrent runs never share files.
+    """
 
-    cleaned_query = cleaned_query.strip()
-    cleaned_query = cleaned_query.rstrip(";") + ";"
+    cleaned_query = strip_limit(query) + ";"
 
     print(f"Query: {cleaned_query}")
 
-    response = (
-        supabase
-        .rpc("execute_sql", {"query": cleaned_query})
-        .execute()
-    )
+    # the agent's exploration queries were cost checked; this one is meant
+    # to return every row
+    rows = run_sql(cleaned_query, guard=False)
 
-    with open(output_path, "w") as f:
-        f.write(json.dumps(response.data, indent=2))
+    if output_path:
+        with open(output_path, "w") as f:
+            f.write(json.dumps(rows, indent=2))
 
-    with open(QUERY_FILE, "w") as f:
-        f.write(cleaned_query)
+    if query_path:
+        with open(query_path, "w") as f:
+            f.write(cleaned_query)
     
     print("Executed the sql query successfully !!")
 
+    return rows
+
+
+_crew_template = None
+
+
+def build_crew():
+    """
+    Return a fresh SqlAgent crew.
+
+    The first call constructs the crew (YAML config, agents, tools, knowledge
+    sources); later calls hand out copies of it so long-lived workers don't
+    pay for construction on every query.
+    """
+    global _crew_template
+    if _crew_template is None:
+        _crew_template = SqlAgent().crew()
+    return _crew_template.copy()
+
+
+def warm_up():
+    """Preload the crew so the first request served by a worker is not cold."""
+    build_crew()
+    try:
+        catalog.frequencies()
+        schema.tables()
+    except Exception as e:
+        print(f"Distinct value catalog / schema not loaded yet: {e}")
+    if mirror is not None:
+        mirror.start_verifying()
+
+
+def generate_sql(user_query: str) -> str:
+    """Run the SqlAgent crew and return the SQL it produced."""
+    inputs = {
+    'user_query': user_query,
+    }
+    crew = build_crew()
+    # crew.reset_memories(command_type='short')     # Short-term memory
+    # crew.reset_memories(command_type='long')      # Long-term memory
+    # crew.reset_memories(command_type='entity')    # Entity memory
+    output = crew.kickoff(inputs=inputs)
+    return output.raw
+
+
+def run_query(user_query: str, workdir: str = None, page_size: int = None) -> dict:
+    """
+    Answer a prompt and return the rows with the path that served them.
+
+    Common structured filters are compiled by the fast path, and a prompt
+    seen before, or a close paraphrase of one, reuses the cached SQL; both
+    skip the crew entirely. Otherwise the crew writes the SQL, which is
+    cached once it executed successfully.
+
+    With a ``page_size`` only the first page is fetched and ``next_cursor``
+    resumes the rest through fetch_next_page(); without one the whole result
+    is returned. Used in-process by the backend worker pool. Nothing touches
+    the disk unless a ``workdir`` is given, in which case output.txt and
+    query.txt are written there.
+    """
+    output_path = query_path = None
+    if workdir:
+        output_path = str(Path(workdir) / OUTPUT_FILE.name)
+        query_path = str(Path(workdir) / QUERY_FILE.name)
+
+    def execute(sql: str) -> dict:
+        if page_size is None:
+            rows = execute_sql_without_limit(sql, output_path, query_path)
+            return {"rows": rows, "next_cursor": None}
+        rows, last_id = fetch_page(sql, page_size)
+        next_cursor = None
+        if last_id is not None:
+            next_cursor = encode_cursor(query_registry.register(sql), last_id)
+        return {"rows": rows, "next_cursor": next_cursor}
+
+    # simple structured filters compile straight to SQL, no LLM involved
+    compiled = fast_path.compile(user_query)
+    if compiled is not None:
+        try:
+            return {**execute(compiled.sql), "served_by": "fast_path"}
+        except Exception as e:
+            print(f"Fast path SQL failed, falling back: {e}")
+
+    cached_sql = prompt_cache.get(user_query)
+    if cached_sql is not None:
+        try:
+            return {**execute(cached_sql), "served_by": "prompt_cache"}
+        except Exception as e:
+            # e.g. the schema changed under a cached query: regenerate it
+            print(f"Cached SQL failed, falling back to the crew: {e}")
+            prompt_cache.invalidate(user_query)
+
+    # a paraphrase of an earlier prompt reuses that prompt's SQL
+    match = similarity_cache.get(user_query)
+    if match is not None:
+        entry_id, similar_sql, score = match
+        try:
+            page = execute(similar_sql)
+            similarity_cache.record_avoided_run()
+            prompt_cache.put(user_query, similar_sql)
+            return {**page, "served_by": "similarity_cache", "similarity": score}
+        except Exception as e:
+            print(f"Similar prompt's SQL failed, falling back to the crew: {e}")
+            similarity_cache.invalidate(entry_id)
+
+    try:
+        sql = generate_sql(user_query)
+        page = execute(sql)
+    except Exception as e:
+        raise Exception(f"An error occurred while running the crew: {e}")
+
+    prompt_cache.put(user_query, sql)
+    similarity_cache.put(user_query, sql)
+    return {**page, "served_by": "crew"}
+
+
+def fetch_next_page(cursor: str, page_size: int) -> dict:
+    """Continue a paginated result from the cursor of the previous page."""
+    query_key, after = decode_cursor(cursor)
+    sql = query_registry.lookup(query_key)
+    if sql is None:
+        raise InvalidCursor("Cursor expired, run the prompt again")
+    rows, last_id = fetch_page(sql, page_size, after)
+    next_cursor = encode_cursor(query_key, last_id) if last_id is not None else None
+    return {"rows": rows, "next_cursor": next_cursor}
+
 
 def run():
     """
@@ -54,16 +182,4 @@ def run():
 
     with open(INPUT_FILE, "r") as f:
         user_query = f.read().strip()
-        inputs = {
-        'user_query': user_query,
-        }
-        try:
-            crew = SqlAgent().crew()
-            # crew.reset_memories(command_type='short')     # Short-term memory
-            # crew.reset_memories(command_type='long')      # Long-term memory
-            # crew.reset_memories(command_type='entity')    # Entity memory
-            crew.kickoff(inputs=inputs)
-            execute_sql_without_limit(str(OUTPUT_FILE),str(OUTPUT_FILE),supabase)
-        except Exception as e:
-            raise Exception(f"An error occurred while running the crew: {e}")
-    
\ No newline at end of file
+    run_query(user_query, workdir=ROOT_DIR)
@@ -0,0 +1,259 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, List
+
+from crewai.events import BaseEventListener, MemoryQueryCompletedEvent, MemoryRetrievalCompletedEvent
+from crewai.memory.storage.ltm_sqlite_storage import LTMSQLiteStorage
+from crewai.memory.storage.rag_storage import RAGStorage
+
+# Entries kept per memory store; the least recently used go first
+MEMORY_MAX_ENTRIES = int(os.getenv("MEMORY_MAX_ENTRIES", "500"))
+# Entries not used for this long are dropped regardless of the cap
+MEMORY_MAX_AGE = int(os.getenv("MEMORY_MAX_AGE", str(30 * 24 * 3600)))
+# Stores are compacted after this many saves, or this long after the last time
+MEMORY_COMPACT_EVERY = int(os.getenv("MEMORY_COMPACT_EVERY", "25"))
+MEMORY_COMPACT_INTERVAL = int(os.getenv("MEMORY_COMPACT_INTERVAL", "3600"))
+# Retrieval latencies kept for the percentiles
+LATENCY_WINDOW = 500
+
+# Bounded stores of this process by memory type, for stats
+stores: Dict[str, Any] = {}
+
+
+class _Compaction:
+    """Decides when a store is due for compaction."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._saves = 0
+        self._last = 0.0
+        self.runs = 0
+        self.evicted = 0
+
+    def due(self) -> bool:
+        with self._lock:
+            self._saves += 1
+            if self._saves < MEMORY_COMPACT_EVERY and time.time() - self._last < MEMORY_COMPACT_INTERVAL:
+                return False
+            self._saves = 0
+            self._last = time.time()
+            return True
+
+    def done(self, evicted: int):
+        self.runs += 1
+        self.evicted += evicted
+
+
+class BoundedRAGStorage(RAGStorage):
+    """
+    Short-term / entity memory store with a size cap and an age limit.
+
+    Entries carry a ``last_used`` timestamp, refreshed when a search returns
+    them. Compaction drops entries unused for ``max_age`` and then the least
+    recently used ones beyond ``max_entries``; it runs every few saves rather
+    than on each, so saving stays cheap. Identical entries are saved once.
+    Uses the collection crewai would use for the same agents.
+    """
+
+    def __init__(self, type: str, agents: list, max_entries: int = MEMORY_MAX_ENTRIES,
+                 max_age: int = MEMORY_MAX_AGE, embedder_config=None):
+        super().__init__(type, embedder_config=embedder_config)
+        self.agents = "_".join(self._sanitize_role(agent.role) for agent in agents)
+        self.storage_file_name = self._build_storage_file_name(type, self.agents)
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self._compaction = _Compaction()
+        stores[type] = self
+
+    def __deepcopy__(self, memo):
+        # crew.copy() deep-copies its memories; every copy shares this store
+        return self
+
+    def _collection(self):
+        name = f"memory_{self.type}_{self.agents}" if self.agents else f"memory_{self.type}"
+        return self._get_client().get_or_create_collection(collection_name=name)
+
+    def save(self, value: Any, metadata: Dict[str, Any]) -> None:
+        metadata = dict(metadata or {})
+        key = json.dumps([value, metadata], sort_keys=True, default=str)
+        metadata["doc_id"] = hashlib.sha256(key.encode()).hexdigest()
+        metadata["last_used"] = time.time()
+        super().save(value, metadata)
+        if self._compaction.due():
+            self.compact()
+
+    def search(self, query: str, limit: int = 5, filter: Dict[str, Any] = None,
+               score_threshold: float = 0.6) -> List[Any]:
+        results = super().search(query, limit, filter, score_threshold)
+        if results:
+            now = time.time()
+            try:
+                self._collection().update(
+                    ids=[r["id"] for r in results],
+                    metadatas=[{**(r.get("metadata") or {}), "last_used": now} for r in results],
+                )
+            except Exception as e:
+                logging.warning(f"Could not update {self.type} memory usage: {e}")
+        return results
+
+    def compact(self) -> int:
+        """Evict stale and least recently used entries; returns how many."""
+        try:
+            collection = self._collection()
+            entries = collection.get(include=["metadatas"])
+            used = sorted(
+                (float((meta or {}).get("last_used", 0)), doc_id)
+                for doc_id, meta in zip(entries["ids"], entries["metadatas"])
+            )
+            cutoff = time.time() - self.max_age
+            expired = [doc_id for last_used, doc_id in used if last_used < cutoff]
+            overflow = max(0, len(used) - len(expired) - self.max_entries)
+            kept = [doc_id for last_used, doc_id in used if last_used >= cutoff]
+            evict = expired + kept[:overflow]
+            if evict:
+                collection.delete(ids=evict)
+        except Exception as e:
+            logging.error(f"Error during {self.type} memory compaction: {e}")
+            return 0
+        self._compaction.done(len(evict))
+        if evict:
+            print(f"🧹 Compacted {self.type} memory ({len(evict)} evicted, {len(used) - len(evict)} kept)")
+        return len(evict)
+
+    def stats(self) -> dict:
+        try:
+            entries = self._collection().count()
+        except Exception:
+            entries = None
+        return {
+            "entries": entries,
+            "max_entries": self.max_entries,
+            "compactions": self._compaction.runs,
+            "evicted": self._compaction.evicted,
+        }
+
+
+class BoundedLTMStorage(LTMSQLiteStorage):
+    """
+    Long-term memory table capped at ``max_entries`` rows and ``max_age``.
+
+    crewai stores one row per evaluated task and reads the latest rows for a
+    task description; compaction keeps only the newest rows, drops old ones
+    and indexes the lookup column so loads don't scan the whole table.
+    """
+
+    def __init__(self, db_path: str = None, max_entries: int = MEMORY_MAX_ENTRIES,
+                 max_age: int = MEMORY_MAX_AGE):
+        super().__init__(db_path)
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self._compaction = _Compaction()
+        stores["long_term"] = self
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute(
+                "create index if not exists long_term_memories_task "
+                "on long_term_memories (task_description, datetime)"
+            )
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def save(self, task_description: str, metadata: Dict[str, Any], datetime: str,
+             score: float) -> None:
+        super().save(task_description, metadata, datetime, score)
+        if self._compaction.due():
+            self.compact()
+
+    def compact(self) -> int:
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                evicted = conn.execute(
+                    "delete from long_term_memories where cast(datetime as real) < ?",
+                    (time.time() - self.max_age,)
+                ).rowcount
+                evicted += conn.execute(
+                    "delete from long_term_memories where id not in "
+                    "(select id from long_term_memories order by id desc limit ?)",
+                    (self.max_entries,)
+                ).rowcount
+            if evicted:
+                with sqlite3.connect(self.db_path) as conn:
+                    conn.execute("vacuum")
+        except sqlite3.Error as e:
+            logging.error(f"Error during long term memory compaction: {e}")
+            return 0
+        self._compaction.done(evicted)
+        if evicted:
+            print(f"🧹 Compacted long term memory ({evicted} evicted)")
+        return evicted
+
+    def stats(self) -> dict:
+        with sqlite3.connect(self.db_path) as conn:
+            entries = conn.execute("select count(*) from long_term_memories").fetchone()[0]
+        return {
+            "entries": entries,
+            "max_entries": self.max_entries,
+            "compactions": self._compaction.runs,
+            "evicted": self._compaction.evicted,
+        }
+
+
+def _summary(samples) -> dict:
+    if not samples:
+        return {"count": 0}
+    ordered = sorted(samples)
+    return {
+        "count": len(ordered),
+        "avg_ms": round(sum(ordered) / len(ordered), 1),
+        "p50_ms": round(ordered[len(ordered) // 2], 1),
+        "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 1),
+        "max_ms": round(ordered[-1], 1),
+    }
+
+
+class MemoryMetrics(BaseEventListener):
+    """
+    Memory retrieval latencies of the recent queries, per memory type and
+    for the whole retrieval done before each task.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.queries: Dict[str, deque] = {}
+        self.retrievals = deque(maxlen=LATENCY_WINDOW)
+        super().__init__()
+
+    def setup_listeners(self, crewai_event_bus):
+        @crewai_event_bus.on(MemoryQueryCompletedEvent)
+        def on_memory_query_completed(source, event):
+            with self._lock:
+                samples = self.queries.setdefault(event.source_type or "unknown", deque(maxlen=LATENCY_WINDOW))
+                samples.append(event.query_time_ms)
+
+        @crewai_event_bus.on(MemoryRetrievalCompletedEvent)
+        def on_memory_retrieval_completed(source, event):
+            with self._lock:
+                self.retrievals.append(event.retrieval_time_ms)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "retrieval": _summary(self.retrievals),
+                "queries": {name: _summary(samples) for name, samples in self.queries.items()},
+            }
+
+
+memory_metrics = MemoryMetrics()
+
+
+def memory_stats() -> dict:
+    return {
+        **memory_metrics.stats(),
+        "stores": {name: store.stats() for name, store in stores.items()},
+    }
@@ -0,0 +1,410 @@
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from sql_pilot.state import SQLiteStore, data_version
+
+MIRROR_TABLES = ["candidates", "candidate_skills", "candidate_links", "candidate_experience"]
+# Off with MIRROR_ENABLED=0; every query then goes to Supabase
+MIRROR_ENABLED = os.getenv("MIRROR_ENABLED", "1") == "1"
+# How often the remote tables are fingerprinted to catch edits and deletes
+# the resume parser doesn't report. Runs in the background, once for all
+# workers, so an idle replica stays trusted.
+MIRROR_VERIFY_INTERVAL = int(os.getenv("MIRROR_VERIFY_INTERVAL", "30"))
+# A replica not verified for this long is not trusted
+MIRROR_MAX_AGE = int(os.getenv("MIRROR_MAX_AGE", str(3 * MIRROR_VERIFY_INTERVAL)))
+# Full reload, to pick up schema changes
+MIRROR_FULL_SYNC_INTERVAL = int(os.getenv("MIRROR_FULL_SYNC_INTERVAL", "3600"))
+# Local queries running longer than this are aborted and sent to Supabase
+MIRROR_QUERY_TIMEOUT = float(os.getenv("MIRROR_QUERY_TIMEOUT", "2"))
+SYNC_BATCH_SIZE = 5000
+
+COLUMNS_QUERY = """
+select c.table_name, c.column_name, c.data_type,
+       (kcu.column_name is not null) as is_primary
+from information_schema.columns c
+left join information_schema.table_constraints tc
+  on tc.table_schema = c.table_schema and tc.table_name = c.table_name
+ and tc.constraint_type = 'PRIMARY KEY'
+left join information_schema.key_column_usage kcu
+  on kcu.constraint_name = tc.constraint_name and kcu.table_schema = tc.table_schema
+ and kcu.column_name = c.column_name
+where c.table_schema = 'public' and c.table_name in ({tables})
+order by c.table_name, c.ordinal_position
+"""
+
+# Per table: the newest key, and fingerprints (row count, checksum of the
+# rows' text) of the key range mirrored so far and of the whole table
+FINGERPRINT_QUERY = """
+select '{table}' as table_name, max({key}) as last_id,
+       count(*) filter (where {covered}) as covered_rows,
+       md5(coalesce(string_agg(md5(t::text), ',' order by {key}) filter (where {covered}), '')) as covered_checksum,
+       count(*) as all_rows,
+       md5(coalesce(string_agg(md5(t::text), ',' order by {key}), '')) as all_checksum
+from {table} t
+"""
+
+MIRROR_COLUMNS_TABLE = """
+    create table if not exists mirror_columns (
+        table_name text not null,
+        column_name text not null,
+        position integer not null,
+        is_primary integer not null,
+        data_type text not null,
+        primary key (table_name, column_name)
+    )
+"""
+
+STRING = re.compile(r"'(?:[^']|'')*'")
+# Queries SQLite would answer differently from Postgres, so they always run
+# remotely: aggregates and window functions, "/" (integer division), casts,
+# booleans (stored as 1/0 here), dollar quoting, and case-sensitive LIKE
+# (SQLite's ignores case)
+REMOTE_ONLY = re.compile(
+    r"\bgroup\s+by\b|\bhaving\b|\bover\s*\("
+    r"|\b(?:count|sum|avg|min|max|every|\w+_agg|bool_and|bool_or|cast)\s*\("
+    r"|\b(?:true|false)\b|/|\$|\blike\b",
+    re.IGNORECASE
+)
+# ORDER BY clauses, up to the LIMIT, OFFSET or parenthesis closing them.
+# Numeric columns sort alike in both databases once Postgres' NULL
+# placement is spelled out; text sorts by collation and expressions can
+# differ, so anything else runs remotely.
+ORDER_BY = re.compile(r"\border\s+by\s+(.+?)(?=\s+(?:limit|offset)\b|\)|;|$)", re.IGNORECASE | re.DOTALL)
+ORDER_ITEM = re.compile(r"^(?:\w+\.)?(\w+)(?:\s+(asc|desc))?(?:\s+(nulls\s+(?:first|last)))?$", re.IGNORECASE)
+# Postgres-isms with a direct SQLite equivalent, applied outside string
+# literals; anything else that SQLite rejects simply runs remotely
+TRANSLATIONS = [
+    (re.compile(r"\bilike\b", re.IGNORECASE), "like"),
+    (re.compile(r"::\s*(?:text|varchar|character\s+varying)(?:\(\d+\))?", re.IGNORECASE), ""),
+]
+
+
+def _affinity(data_type: str) -> str:
+    if data_type in ("integer", "bigint", "smallint"):
+        return "integer"
+    if data_type in ("numeric", "real", "double precision"):
+        return "real"
+    return "text"
+
+
+def _literal(value) -> str:
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def _translate_code(code: str) -> str:
+    for pattern, replacement in TRANSLATIONS:
+        code = pattern.sub(replacement, code)
+    return code
+
+
+def _order_items(clause: str, numeric_columns) -> Optional[str]:
+    items = []
+    for item in clause.split(","):
+        item = item.strip()
+        match = ORDER_ITEM.match(item)
+        if match is None or match.group(1).lower() not in numeric_columns:
+            return None
+        direction = (match.group(2) or "asc").lower()
+        # Postgres puts NULLs last ascending and first descending, SQLite the reverse
+        nulls = match.group(3) or ("nulls last" if direction == "asc" else "nulls first")
+        items.append(f"{item[:match.end(1)]} {direction} {nulls}")
+    return ", ".join(items)
+
+
+def translate(sql: str, boolean_tables=(), numeric_columns=()) -> Optional[str]:
+    """``sql`` in SQLite's dialect, or None when only Postgres answers it faithfully."""
+    # literals blanked without moving anything, so positions still match sql
+    code = STRING.sub(lambda literal: "'" + " " * (len(literal.group(0)) - 2) + "'", sql)
+    if REMOTE_ONLY.search(code):
+        return None
+    if any(re.search(rf"\b{re.escape(table)}\b", code, re.IGNORECASE) for table in boolean_tables):
+        return None
+    for order in reversed(list(ORDER_BY.finditer(code))):
+        items = _order_items(order.group(1), numeric_columns)
+        if items is None:
+            return None
+        sql = sql[:order.start(1)] + items + sql[order.end(1):]
+    parts, end = [], 0
+    for literal in STRING.finditer(sql):
+        parts.append(_translate_code(sql[end:literal.start()]))
+        parts.append(literal.group(0))
+        end = literal.end()
+    parts.append(_translate_code(sql[end:]))
+    return "".join(parts)
+
+
+class CandidateMirror(SQLiteStore):
+    """
+    Local SQLite replica of the candidate tables for read-only queries.
+
+    Every sync fingerprints each remote table: if the rows mirrored so far
+    are unchanged only rows with newer keys are pulled, otherwise the table
+    is reloaded, so edits and deletes are picked up like inserts. A
+    background verifier syncs every ``MIRROR_VERIFY_INTERVAL`` seconds, and
+    the replica counts as fresh when it was verified within ``max_age`` and
+    after the last write the resume parser reported; otherwise callers query
+    Supabase while a background sync catches up. Shared by all SQL workers.
+
+    Only queries SQLite answers the way Postgres would run locally (see
+    ``translate``); the rest go to Supabase.
+    """
+
+    row_factory = sqlite3.Row
+
+    def __init__(self, path, fetch: Callable[[str], list], max_age: int = MIRROR_MAX_AGE):
+        self.fetch = fetch
+        self.max_age = max_age
+        self._sync_lock = threading.Lock()
+        self._syncing = False
+        self._verifying = False
+        self.local_queries = 0
+        self.remote_fallbacks = 0
+        self.last_error: Optional[str] = None
+        super().__init__(path, """
+            create table if not exists mirror_sync (
+                id integer primary key check (id = 1),
+                verified_at real not null,
+                full_synced_at real not null,
+                data_version integer not null
+            )
+        """, """
+            create table if not exists mirror_fingerprints (
+                table_name text primary key,
+                last_id integer,
+                row_count integer not null,
+                checksum text not null
+            )
+        """, MIRROR_COLUMNS_TABLE)
+
+    def _meta(self) -> Optional[sqlite3.Row]:
+        return self._connect().execute("select * from mirror_sync where id = 1").fetchone()
+
+    def is_fresh(self) -> bool:
+        meta = self._meta()
+        return (
+            meta is not None
+            and meta["data_version"] == data_version()
+            and time.time() - meta["verified_at"] <= self.max_age
+        )
+
+    # syncing
+
+    def _create_tables(self, conn: sqlite3.Connection):
+        rows = self.fetch(COLUMNS_QUERY.format(tables=", ".join(_literal(t) for t in MIRROR_TABLES))) or []
+        conn.execute("drop table if exists mirror_columns")
+        conn.execute(MIRROR_COLUMNS_TABLE)
+        conn.execute("delete from mirror_fingerprints")
+        for table in MIRROR_TABLES:
+            columns = [r for r in rows if r["table_name"] == table]
+            if not columns:
+                continue
+            conn.execute(f"drop table if exists {table}")
+            defs = ", ".join(
+                f"{c['column_name']} {_affinity(c['data_type'])}"
+                + (" primary key" if c["is_primary"] else "")
+                for c in columns
+            )
+            conn.execute(f"create table {table} ({defs})")
+            conn.executemany(
+                "insert into mirror_columns values (?, ?, ?, ?, ?)",
+                [
+                    (table, c["column_name"], i, int(bool(c["is_primary"])), c["data_type"])
+                    for i, c in enumerate(columns)
+                ]
+            )
+        if "candidate_skills" in {r["table_name"] for r in rows}:
+            conn.execute("create index if not exists mirror_skills_candidate on candidate_skills (candidate_id)")
+            conn.execute("create index if not exists mirror_skills_name on candidate_skills (skill_name)")
+
+    def _columns(self, conn: sqlite3.Connection, table: str):
+        rows = conn.execute(
+            "select column_name, is_primary from mirror_columns where table_name = ? order by position",
+            (table,)
+        ).fetchall()
+        columns = [r["column_name"] for r in rows]
+        primary = next((r["column_name"] for r in rows if r["is_primary"]), None)
+        return columns, primary
+
+    def _boolean_tables(self) -> List[str]:
+        rows = self._connect().execute(
+            "select distinct table_name from mirror_columns where data_type = 'boolean'"
+        ).fetchall()
+        return [r["table_name"] for r in rows]
+
+    def _numeric_columns(self) -> set:
+        """Column names that are numeric in every mirrored table having them."""
+        affinities = {}
+        for r in self._connect().execute("select column_name, data_type from mirror_columns"):
+            affinities.setdefault(r["column_name"].lower(), set()).add(_affinity(r["data_type"]))
+        return {name for name, kinds in affinities.items() if kinds <= {"integer", "real"}}
+
+    def _fingerprints(self, conn: sqlite3.Connection) -> Dict[str, dict]:
+        """Remote fingerprints of every mirrored table, in one round trip."""
+        selects = []
+        for table in MIRROR_TABLES:
+            _, primary = self._columns(conn, table)
+            if primary is None:
+                continue
+            known = conn.execute(
+                "select last_id from mirror_fingerprints where table_name = ?", (table,)
+            ).fetchone()
+            covered = f"{primary} <= {int(known['last_id'])}" if known and known["last_id"] is not None else "false"
+            selects.append(FINGERPRINT_QUERY.format(table=table, key=primary, covered=covered))
+        if not selects:
+            return {}
+        rows = self.fetch(" union all ".join(selects)) or []
+        return {row["table_name"]: row for row in rows}
+
+    def _pull(self, conn: sqlite3.Connection, table: str, where: str = ""):
+        columns, primary = self._columns(conn, table)
+        if not columns or primary is None:
+            return 0
+        placeholders = ", ".join("?" for _ in columns)
+        pulled, after = 0, None
+        while True:
+            conditions = [c for c in (where, f"{primary} > {int(after)}" if after is not None else "") if c]
+            clause = f"where {' and '.join(f'({c})' for c in conditions)} " if conditions else ""
+            rows = self.fetch(
+                f"select {', '.join(columns)} from {table} {clause}"
+                f"order by {primary} limit {SYNC_BATCH_SIZE}"
+            ) or []
+            conn.executemany(
+                f"insert or replace into {table} ({', '.join(columns)}) values ({placeholders})",
+                [tuple(row.get(c) for c in columns) for row in rows]
+            )
+            pulled += len(rows)
+            if len(rows) < SYNC_BATCH_SIZE:
+                return pulled
+            after = rows[-1][primary]
+
+    def sync(self, full: bool = False) -> int:
+        """Bring the replica up to date; returns the number of rows pulled."""
+        version = data_version()
+        started = time.time()
+        conn = self._connect()
+        with conn:
+            conn.execute("begin immediate")
+            meta = self._meta()
+            if meta is None or time.time() - meta["full_synced_at"] > MIRROR_FULL_SYNC_INTERVAL:
+                full = True
+            if full:
+                self._create_tables(conn)
+            fingerprints = self._fingerprints(conn)
+            pulled, reloaded = 0, []
+            for table, remote in fingerprints.items():
+                _, primary = self._columns(conn, table)
+                known = conn.execute(
+                    "select * from mirror_fingerprints where table_name = ?", (table,)
+                ).fetchone()
+                last_id = remote["last_id"]
+                unchanged = (
+                    known is not None
+                    and known["row_count"] == remote["covered_rows"]
+                    and known["checksum"] == remote["covered_checksum"]
+                )
+                if not unchanged:
+                    # rows were edited or deleted (or never mirrored): reload
+                    conn.execute(f"delete from {table}")
+                    if last_id is not None:
+                        pulled += self._pull(conn, table, f"{primary} <= {int(last_id)}")
+                    if not full:
+                        reloaded.append(table)
+                elif known["last_id"] != last_id:
+                    # only rows past the mirrored range were added
+                    after = f"{primary} > {int(known['last_id'])} and " if known["last_id"] is not None else ""
+                    pulled += self._pull(conn, table, f"{after}{primary} <= {int(last_id)}")
+                conn.execute(
+                    "insert or replace into mirror_fingerprints (table_name, last_id, row_count, checksum) "
+                    "values (?, ?, ?, ?)",
+                    (table, last_id, remote["all_rows"], remote["all_checksum"])
+                )
+            conn.execute(
+                "insert or replace into mirror_sync (id, verified_at, full_synced_at, data_version) "
+                "values (1, ?, ?, ?)",
+                (started, started if full else meta["full_synced_at"], version)
+            )
+        if full or pulled or reloaded:
+            kind = "full" if full else f"reloaded {', '.join(reloaded)}" if reloaded else "incremental"
+            print(f"🪞 Mirror synced ({kind}, {pulled} rows)")
+        return pulled
+
+    def sync_in_background(self):
+        with self._sync_lock:
+            if self._syncing:
+                return
+            self._syncing = True
+
+        def work():
+            try:
+                self.sync()
+                self.last_error = None
+            except Exception as e:
+                self.last_error = str(e)
+                print(f"⚠️ Mirror sync failed: {e}")
+            finally:
+                self._syncing = False
+
+        threading.Thread(target=work, name="mirror-sync", daemon=True).start()
+
+    def start_verifying(self, interval: int = MIRROR_VERIFY_INTERVAL):
+        """
+        Sync now and then every ``interval`` seconds, so the replica stays
+        trusted between requests. Every worker runs one; a worker skips its
+        turn when another verified the shared replica recently.
+        """
+        if self._verifying:
+            return
+        self._verifying = True
+
+        def loop():
+            while True:
+                meta = self._meta()
+                if meta is None or time.time() - meta["verified_at"] >= interval:
+                    self.sync_in_background()
+                time.sleep(interval)
+
+        threading.Thread(target=loop, name="mirror-verify", daemon=True).start()
+
+    # querying
+
+    def query(self, sql: str) -> Optional[List[dict]]:
+        """
+        Rows of ``sql`` from the replica, or None when it must run remotely
+        (replica stale, SQLite would answer differently, or too slow).
+        """
+        if not self.is_fresh():
+            self.sync_in_background()
+            self.remote_fallbacks += 1
+            return None
+        sql = translate(sql, self._boolean_tables(), self._numeric_columns())
+        if sql is None:
+            self.remote_fallbacks += 1
+            return None
+        conn = self._connect()
+        deadline = time.monotonic() + MIRROR_QUERY_TIMEOUT
+        conn.set_progress_handler(lambda: time.monotonic() > deadline, 10000)
+        try:
+            rows = [dict(row) for row in conn.execute(sql)]
+        except sqlite3.Error as e:
+            self.remote_fallbacks += 1
+            print(f"Mirror can't run this query, using Supabase: {e}")
+            return None
+        finally:
+            conn.set_progress_handler(None, 0)
+        self.local_queries += 1
+        return rows
+
+    def stats(self) -> Dict:
+        meta = self._meta()
+        return {
+            "enabled": True,
+            "fresh": self.is_fresh(),
+            "verified_at": meta["verified_at"] if meta else None,
+            "local_queries": self.local_queries,
+            "remote_fallbacks": self.remote_fallbacks,
+            "last_error": self.last_error,
+        }
@@ -0,0 +1,172 @@
+import base64
+import hashlib
+import json
+import os
+import re
+import time
+from typing import List, Optional, Tuple
+
+from sql_pilot.state import SQLiteStore, state_path
+from sql_pilot.tools.supabase_tools import run_sql
+
+MAX_PAGE_SIZE = int(os.getenv("MAX_PAGE_SIZE", "500"))
+# Column pages are keyed on; rows sharing a value always land on one page
+PAGE_KEY = "candidate_id"
+# Queries kept around so their cursors can be resumed by any worker
+QUERY_REGISTRY_SIZE = int(os.getenv("QUERY_REGISTRY_SIZE", "1000"))
+
+# A LIMIT and/or OFFSET clause in either order ("limit 10 offset 20",
+# "offset 20 limit 10", "limit 20, 10", "limit all")
+LIMIT = re.compile(
+    r"\s+(?:LIMIT\s+(?:\d+|ALL)(?:\s*,\s*\d+)?(?:\s+OFFSET\s+\d+(?:\s+ROWS?)?)?"
+    r"|OFFSET\s+\d+(?:\s+ROWS?)?(?:\s+LIMIT\s+(?:\d+|ALL))?);?",
+    re.IGNORECASE
+)
+
+# ORDER BY lists that paging on the key keeps intact
+KEY_ORDER = re.compile(rf"^(?:\w+\.)?{PAGE_KEY}(?:\s+asc)?(?:\s+nulls\s+last)?$", re.IGNORECASE)
+
+
+class InvalidCursor(ValueError):
+    """Raised for cursor tokens that are malformed or whose query expired."""
+
+
+def strip_limit(query: str) -> str:
+    """``query`` with every LIMIT / OFFSET removed, without a trailing semicolon."""
+    return LIMIT.sub("", query.strip()).strip().rstrip(";")
+
+
+class QueryRegistry(SQLiteStore):
+    """
+    Generated queries addressed by a short hash.
+
+    Cursors only carry the hash, never SQL, so clients can page through a
+    result but cannot make the workers run arbitrary queries. Shared so the
+    next page can be served by any worker; least recently used queries are
+    dropped beyond ``max_entries``.
+    """
+
+    def __init__(self, path, max_entries: int = QUERY_REGISTRY_SIZE):
+        self.max_entries = max_entries
+        super().__init__(path, """
+            create table if not exists queries (
+                key text primary key,
+                sql text not null,
+                last_used real not null
+            )
+        """)
+
+    def register(self, sql: str) -> str:
+        key = hashlib.sha256(sql.encode()).hexdigest()[:16]
+        with self._connect() as conn:
+            conn.execute(
+                "insert into queries (key, sql, last_used) values (?, ?, ?) "
+                "on conflict(key) do update set last_used = excluded.last_used",
+                (key, sql, time.time())
+            )
+            conn.execute(
+                "delete from queries where key in ("
+                "select key from queries order by last_used desc limit -1 offset ?)",
+                (self.max_entries,)
+            )
+        return key
+
+    def lookup(self, key: str) -> Optional[str]:
+        with self._connect() as conn:
+            row = conn.execute("select sql from queries where key = ?", (key,)).fetchone()
+            if row is not None:
+                conn.execute("update queries set last_used = ? where key = ?", (time.time(), key))
+        return row[0] if row else None
+
+
+def encode_cursor(query_key: str, after: int) -> str:
+    raw = json.dumps({"q": query_key, "after": after}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str) -> Tuple[str, int]:
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        query_key, after = data["q"], data["after"]
+    except Exception:
+        raise InvalidCursor("Malformed cursor")
+    if not isinstance(query_key, str) or not isinstance(after, int) or isinstance(after, bool):
+        raise InvalidCursor("Malformed cursor")
+    return query_key, after
+
+
+def outer_order_by(query: str) -> Optional[str]:
+    """The ORDER BY list of the outermost query (LIMIT already stripped), or None."""
+    code = re.sub(r"'(?:[^']|'')*'", "''", query)
+    # subqueries and function calls can have their own ORDER BY
+    while True:
+        flat = re.sub(r"\([^()]*\)", "", code)
+        if flat == code:
+            break
+        code = flat
+    match = re.search(r"\border\s+by\s+(.+)$", code, re.IGNORECASE | re.DOTALL)
+    return match.group(1).strip() if match else None
+
+
+def clamp_page_size(page_size: int) -> int:
+    return max(1, min(int(page_size), MAX_PAGE_SIZE))
+
+
+def _run_page(query: str) -> List[dict]:
+    print(f"Query: {query}")
+    return run_sql(query, guard=False) or []
+
+
+def fetch_page(sql: str, page_size: int, after: Optional[int] = None) -> Tuple[List[dict], Optional[int]]:
+    """
+    One page of ``sql`` in candidate_id order, after the ``after`` id.
+
+    Keyset pagination: every page is an index range scan on candidate_id
+    instead of OFFSET re-reading the rows before it. candidate_id need not
+    be unique (queries joining candidate_skills return a row per skill), so
+    a page never splits a candidate: the rows of the candidate at the page
+    boundary move to the next page, or all come now if that candidate alone
+    fills the page. Queries without a candidate_id (aggregates) come whole
+    in one page, and so do queries ordered by anything but candidate_id,
+    since paging them in candidate_id order would lose the order they asked
+    for. Returns the rows and the last candidate_id when more rows may
+    follow, else None.
+    """
+    page_size = clamp_page_size(page_size)
+    base = strip_limit(sql)
+    order = outer_order_by(base)
+    if order is not None and not KEY_ORDER.match(order):
+        return _run_page(base), None
+    where = (
+        f"where page.{PAGE_KEY} > {int(after)} or page.{PAGE_KEY} is null "
+        if after is not None else ""
+    )
+    try:
+        rows = _run_page(
+            f"select * from ({base}) as page {where}"
+            f"order by page.{PAGE_KEY} nulls last limit {page_size + 1}"
+        )
+    except Exception:
+        if after is not None:
+            raise
+        probe = _run_page(f"select * from ({base}) as page limit 1")
+        if probe and PAGE_KEY in probe[0]:
+            raise
+        # nothing to page on: one page with everything
+        return _run_page(base), None
+
+    if len(rows) <= page_size:
+        return rows, None
+    boundary = rows[page_size][PAGE_KEY]
+    page = [row for row in rows[:page_size] if row[PAGE_KEY] != boundary]
+    if page:
+        return page, page[-1][PAGE_KEY]
+    # a single candidate fills the page
+    if boundary is None:
+        # rows without a candidate_id sort last, nothing follows them
+        return _run_page(f"select * from ({base}) as page where page.{PAGE_KEY} is null"), None
+    return _run_page(f"select * from ({base}) as page where page.{PAGE_KEY} = {int(boundary)}"), boundary
+
+
+query_registry = QueryRegistry(state_path("queries.sqlite3"))
@@ -0,0 +1,146 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+# Schema changes are rare; this only bounds how long a missed change lingers
+SCHEMA_TTL = int(os.getenv("SCHEMA_TTL", str(24 * 3600)))
+
+TABLE_DESCRIPTIONS = {
+    "candidates": "Contains candidate information",
+    "candidate_skills": "Maps candidates to their skills",
+    "candidate_links": "Contains links to candidates’ portfolios and profiles",
+    "candidate_experience": "Contains details about candidates’ work experience",
+}
+
+COLUMNS_QUERY = """
+select c.table_name, c.column_name, c.data_type, c.character_maximum_length,
+       c.numeric_precision, c.numeric_scale, c.is_nullable, c.column_default
+from information_schema.columns c
+join information_schema.tables t
+  on t.table_schema = c.table_schema and t.table_name = c.table_name
+where c.table_schema = 'public' and t.table_type = 'BASE TABLE'
+order by c.table_name, c.ordinal_position
+"""
+
+CONSTRAINTS_QUERY = """
+select tc.table_name, tc.constraint_name, tc.constraint_type, kcu.column_name,
+       ccu.table_name as foreign_table, ccu.column_name as foreign_column
+from information_schema.table_constraints tc
+join information_schema.key_column_usage kcu
+  on kcu.constraint_name = tc.constraint_name and kcu.table_schema = tc.table_schema
+left join information_schema.constraint_column_usage ccu
+  on tc.constraint_type = 'FOREIGN KEY'
+ and ccu.constraint_name = tc.constraint_name and ccu.table_schema = tc.table_schema
+where tc.table_schema = 'public'
+  and tc.constraint_type in ('PRIMARY KEY', 'FOREIGN KEY', 'UNIQUE')
+order by tc.table_name, tc.constraint_name, kcu.ordinal_position
+"""
+
+
+def _column_type(column: dict) -> str:
+    data_type = column["data_type"]
+    if column.get("character_maximum_length"):
+        return f"{data_type}({column['character_maximum_length']})"
+    if data_type == "numeric" and column.get("numeric_precision"):
+        return f"numeric({column['numeric_precision']}, {column.get('numeric_scale') or 0})"
+    return data_type
+
+
+def render_table(table: str, columns: List[dict], constraints: List[dict]) -> str:
+    """CREATE TABLE statement for one table, the format the agent reads best."""
+    lines = []
+    for column in columns:
+        line = f"{column['column_name']} {_column_type(column)}"
+        line += " null" if column["is_nullable"] == "YES" else " not null"
+        if column.get("column_default"):
+            line += f" default {column['column_default']}"
+        lines.append(line)
+
+    grouped: Dict[str, List[dict]] = {}
+    for row in constraints:
+        grouped.setdefault(row["constraint_name"], []).append(row)
+    for name, rows in grouped.items():
+        kind = rows[0]["constraint_type"].lower()
+        columns_sql = ", ".join(dict.fromkeys(r["column_name"] for r in rows))
+        line = f"constraint {name} {kind} ({columns_sql})"
+        if kind == "foreign key":
+            foreign = ", ".join(dict.fromkeys(r["foreign_column"] for r in rows))
+            line += f" references {rows[0]['foreign_table']} ({foreign})"
+        lines.append(line)
+
+    body = ",\n    ".join(lines)
+    return f"create table public.{table} (\n    {body}\n)"
+
+
+class SchemaCache:
+    """
+    Table definitions read live from information_schema.
+
+    Loaded once and kept in a JSON file in the shared state directory with a
+    version hash of its content, so workers don't query information_schema
+    on every tool call and can tell when the schema they hold changed.
+    invalidate() forces a reload on next use, e.g. after a query failed on a
+    missing column; otherwise it is reloaded after ``ttl`` seconds.
+    """
+
+    def __init__(self, path, fetch: Callable[[str], List[dict]], ttl: int = SCHEMA_TTL):
+        self.path = Path(path)
+        self.fetch = fetch
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._data: Optional[dict] = None
+        self._mtime = None
+
+    def refresh(self) -> dict:
+        """Reload the schema from the database."""
+        columns = self.fetch(COLUMNS_QUERY) or []
+        constraints = self.fetch(CONSTRAINTS_QUERY) or []
+        tables: Dict[str, str] = {}
+        for table in dict.fromkeys(c["table_name"] for c in columns):
+            tables[table] = render_table(
+                table,
+                [c for c in columns if c["table_name"] == table],
+                [c for c in constraints if c["table_name"] == table],
+            )
+        version = hashlib.sha256(json.dumps(tables, sort_keys=True).encode()).hexdigest()[:12]
+        data = {"version": version, "loaded_at": time.time(), "tables": tables}
+
+        tmp = self.path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(data))
+        os.replace(tmp, self.path)
+        print(f"🗂️ Schema loaded ({len(tables)} tables, version {version})")
+        return data
+
+    def invalidate(self):
+        with self._lock:
+            self.path.unlink(missing_ok=True)
+            self._data = None
+
+    def _current(self) -> dict:
+        with self._lock:
+            try:
+                mtime = self.path.stat().st_mtime
+            except FileNotFoundError:
+                mtime = None
+            if mtime is None or time.time() - mtime > self.ttl:
+                self._data = self.refresh()
+                self._mtime = self.path.stat().st_mtime
+            elif self._data is None or mtime != self._mtime:
+                # another worker refreshed it
+                self._data = json.loads(self.path.read_text())
+                self._mtime = mtime
+            return self._data
+
+    @property
+    def version(self) -> str:
+        return self._current()["version"]
+
+    def tables(self) -> List[str]:
+        return list(self._current()["tables"])
+
+    def table(self, name: str) -> Optional[str]:
+        return self._current()["tables"].get(name)
@@ -0,0 +1,34 @@
+from crewai.tools import BaseTool
+from typing import Optional, Type
+from pydantic import BaseModel, Field
+import json
+
+from sql_pilot.catalog import catalog, DISCRETE_COLUMNS
+
+
+class GetDistinctValuesArgument(BaseModel):
+    table_name: Optional[str] = Field(
+        None,
+        description="Table to get the distinct values of; omit for all tables"
+    )
+    column_name: Optional[str] = Field(
+        None,
+        description="Column of table_name to narrow the result down to"
+    )
+
+
+class GetDistinctValuesTool(BaseTool):
+    name: str = "get_distinct_values"
+    description: str = (
+        "Returns every distinct value, with how many rows have it, of the discrete "
+        "columns (" + ", ".join(
+            f"{table}.{column}" for table, columns in DISCRETE_COLUMNS.items() for column in columns
+        ) + "). Use it instead of SELECT DISTINCT queries."
+    )
+    args_schema: Type[BaseModel] = GetDistinctValuesArgument
+
+    def _run(self, table_name: Optional[str] = None, column_name: Optional[str] = None) -> str:
+        try:
+            return json.dumps(catalog.frequencies(table_name, column_name))
+        except Exception as e:
+            return f"Distinct values unavailable, use SELECT DISTINCT instead: {str(e)}"
@@ -5,6 +5,13 @@ import json
 import re
 from supabase import create_client, Client
 import os
+from sql_pilot.cache.result_cache import result_cache
+from sql_pilot.state import data_version, state_path
+from sql_pilot.schema import SchemaCache, TABLE_DESCRIPTIONS
+from sql_pilot.cost_guard import CostGuard
+from sql_pilot.index_advisor import log_query
+from sql_pilot.mirror import CandidateMirror, MIRROR_ENABLED
+import time
 
 url: str = os.environ.get("SUPABASE_URL") # type:ignore
 key: str = os.environ.get("SUPABASE_KEY") # type:ignore
@@ -23,6 +30,50 @@ def normalize_sql(query: str) -> str:
 
     return q.strip()
 
+def fetch_uncached(query: str):
+    """Run a query straight through the RPC: no cache, no cost guard, no log."""
+    return supabase.rpc("execute_sql", {"query": normalize_sql(query)}).execute().data
+
+schema = SchemaCache(state_path("schema.json"), fetch_uncached)
+cost_guard = CostGuard(fetch_uncached)
+mirror = CandidateMirror(state_path("mirror.sqlite3"), fetch_uncached) if MIRROR_ENABLED else None
+
+READ_ONLY = re.compile(r"^\s*(select|with)\b", re.IGNORECASE)
+
+def run_sql(query: str, guard: bool = True):
+    """
+    Execute a query through the execute_sql RPC and return its rows.
+
+    Read-only queries are answered by the result cache when the same
+    normalized query already ran since the candidate tables last changed,
+    then by the local mirror when it is fresh and can answer them (bounded
+    by MIRROR_QUERY_TIMEOUT rather than a remote EXPLAIN). Only queries
+    that reach the database pass the cost guard; ``guard=False`` skips it
+    for the final query of a prompt, which returns every matching row by
+    design and would hit the ceiling as the tables grow.
+    """
+    cleaned_query = normalize_sql(query)
+    if not READ_ONLY.match(cleaned_query):
+        return supabase.rpc("execute_sql", {"query": cleaned_query}).execute().data
+
+    cached = result_cache.get(cleaned_query)
+    if cached is not None:
+        return cached
+
+    version = data_version()
+    start = time.perf_counter()
+    rows = mirror.query(cleaned_query) if mirror is not None else None
+    if rows is None:
+        if guard:
+            # raises QueryTooExpensive, whose message tells the agent what to fix
+            cost_guard.check(cleaned_query)
+        start = time.perf_counter()
+        rows = supabase.rpc("execute_sql", {"query": cleaned_query}).execute().data
+    # logged wherever it ran, so the index advisor sees every query
+    log_query(cleaned_query, (time.perf_counter() - start) * 1000)
+    result_cache.put(cleaned_query, rows, version)
+    return rows
+
 class ExecuteSQLInput(BaseModel):
     query_string: str = Field(
         ...,
@@ -38,70 +89,18 @@ class ExecuteSQLTool(BaseTool):
 
     def _run(self, query_string: str) -> str:
         try:
-            cleaned_query = normalize_sql(query_string)
-            response = (
-                supabase
-                .rpc("execute_sql", {"query": cleaned_query})
-                .execute()
-            )
-
-            return json.dumps(response.data)
+            return json.dumps(run_sql(query_string))
 
         except Exception as e:
+            if "does not exist" in str(e):
+                # the schema the agent was shown may be outdated
+                schema.invalidate()
+                return (
+                    f"SQL execution failed: {str(e)}. "
+                    "The cached schema was dropped, check it again with get_table_schema."
+                )
             return f"SQL execution failed: {str(e)}"
 
-table_to_schema_mapping = {
-    "candidates": """
-    create table public.candidates (
-        candidate_id serial not null,
-        name character varying(100) not null,
-        email character varying(120) not null,
-        usn character varying(20) null,
-        phone character varying(20) null,
-        gender character varying(10) null,
-        cgpa numeric(3, 2) null,
-        field_of_study character varying(100) null,
-        years_of_experience integer null,
-        created_at timestamp without time zone null default CURRENT_TIMESTAMP,
-        updated_at timestamp without time zone null default CURRENT_TIMESTAMP,
-        constraint candidates_pkey primary key (candidate_id),
-        constraint candidates_email_key unique (email)
-    )   
-    TABLESPACE pg_default;
-    """,
-    "candidate_skills": """
-    create table public.candidate_skills (
-        skill_id serial not null,
-        candidate_id integer not null,
-        skill_name character varying(100) not null,
-        constraint candidate_skills_pkey primary key (skill_id),
-        constraint candidate_skills_candidate_id_fkey foreign KEY (candidate_id) references candidates (candidate_id) on delete CASCADE
-    ) 
-    TABLESPACE pg_default;
-    """,
-    "candidate_links": """
-    create table public.candidate_links (
-        link_id serial not null,
-        candidate_id integer not null,
-        link_type character varying(50) not null,
-        link_url character varying(500) not null,
-        constraint candidate_links_pkey primary key (link_id),
-        constraint candidate_links_candidate_id_fkey foreign KEY (candidate_id) references candidates (candidate_id) on delete CASCADE
-    ) 
-    TABLESPACE pg_default;
-    """,
-    "candidate_experience": """
-    create table public.candidate_skills (
-        skill_id serial not null,
-        candidate_id integer not null,
-        skill_name character varying(100) not null,
-        constraint candidate_skills_pkey primary key (skill_id),
-        constraint candidate_skills_candidate_id_fkey foreign KEY (candidate_id) references candidates (candidate_id) on delete CASCADE
-    ) 
-    TABLESPACE pg_default;
-    """
-}
-
 class GetTableSchemaArgument(BaseModel):
     table_name: str = Field(
         ...,
@@ -116,7 +115,16 @@ class GetTableSchemaTool(BaseTool):
     args_schema: Type[BaseModel] = GetTableSchemaArgument
 
     def _run(self, table_name: str) -> str:
-        return table_to_schema_mapping[table_name]
+        try:
+            ddl = schema.table(table_name)
+            if ddl is None:
+                return (
+                    f"Table '{table_name}' does not exist. "
+                    f"Available tables: {', '.join(schema.tables())}"
+                )
+            return f"-- schema version {schema.version}\n{ddl}"
+        except Exception as e:
+            return f"Could not load the schema: {str(e)}"
 
 class ListTablesTool(BaseTool):
     name: str = "list_tables"
@@ -125,9 +133,12 @@ class ListTablesTool(BaseTool):
     )
 
     def _run(self) -> str:
-        return """Tables present in the database:
-        - candidates (Description: Contains candidate information)
-        - candidate_skills (Description: Maps candidates to their skills)
-        - candidate_links (Description: Contains links to candidates’ portfolios and profiles)
-        - candidate_experience (Description: Contains details about candidates’ work experience)
-        """
\ No newline at end of file
+        try:
+            tables = schema.tables()
+        except Exception as e:
+            return f"Could not load the schema: {str(e)}"
+        lines = ["Tables present in the database:"]
+        for table in tables:
+            description = TABLE_DESCRIPTIONS.get(table)
+            lines.append(f"- {table} (Description: {description})" if description else f"- {table}")
+        return "\n".join(lines)
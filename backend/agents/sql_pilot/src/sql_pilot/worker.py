@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+"""
+Long-lived SQL agent worker.
+
+Started by the backend worker pool with the project directory as CWD.
+Requests and replies are JSON lines on stdin / the original stdout; anything
+the crew prints is redirected to stderr so it cannot corrupt the protocol.
+"""
+import json
+import os
+import sys
+import threading
+import traceback
+
+_write_lock = threading.Lock()
+
+
+def _protocol_stream():
+    stream = os.fdopen(os.dup(sys.stdout.fileno()), "w", encoding="utf-8", buffering=1)
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+    return stream
+
+
+def _reply(stream, message: dict):
+    line = json.dumps(message, default=str) + "\n"
+    # the event emitter thread shares the stream with replies
+    with _write_lock:
+        stream.write(line)
+        stream.flush()
+
+
+def main():
+    out = _protocol_stream()
+
+    from sql_pilot.main import fetch_next_page, run_query, warm_up
+    from sql_pilot.pagination import InvalidCursor
+    from sql_pilot.tools.supabase_tools import cost_guard, fetch_uncached, mirror, schema
+    from sql_pilot import index_advisor
+    from sql_pilot.memory import memory_stats
+    from sql_pilot.listeners import emitter
+    from sql_pilot.cache import prompt_cache, similarity_cache, result_cache
+    from sql_pilot.state import stats_board
+
+    # listener events travel to the backend over this pipe instead of HTTP
+    emitter.set_transport(
+        lambda events, dropped: _reply(out, {"events": events, "dropped": dropped})
+    )
+
+    warm_up()
+
+    def stats():
+        return {
+            "shared": {
+                "prompt_cache": prompt_cache.stats(),
+                "similarity_cache": similarity_cache.stats(),
+                "result_cache": result_cache.stats(),
+                "schema_version": schema.version,
+            },
+            "process": {
+                "cost_guard": cost_guard.stats(),
+                "mirror": mirror.stats() if mirror is not None else {"enabled": False},
+                "memory": memory_stats(),
+            },
+        }
+
+    stats_board.start_publishing(os.getenv("JOBPILOT_WORKER", f"sql-{os.getpid()}"), stats)
+    _reply(out, {"ready": True, "pid": os.getpid()})
+
+    def run(payload: dict):
+        # a worker serves one request at a time, so the run id can simply
+        # be set on the emitter for the duration of the run
+        emitter.run_id = payload.pop("run_id", None)
+        try:
+            return run_query(**payload)
+        finally:
+            emitter.run_id = None
+
+    def page(payload: dict):
+        try:
+            return fetch_next_page(**payload)
+        except InvalidCursor as e:
+            # a client error, not a worker failure
+            return {"invalid_cursor": str(e)}
+
+    ops = {
+        "run": run,
+        "page": page,
+        "index_report": lambda payload: index_advisor.report(fetch_uncached, [index_advisor.QUERY_FILE]),
+        "refresh_schema": lambda payload: {"schema_version": schema.refresh()["version"]},
+    }
+
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        request = json.loads(line)
+        handler = ops.get(request.get("op"))
+        try:
+            if handler is None:
+                raise ValueError(f"Unknown op: {request.get('op')}")
+            result = handler(request.get("payload") or {})
+            # events of this run reach the backend before its reply
+            emitter.flush()
+            _reply(out, {"id": request.get("id"), "ok": True, "result": result})
+        except Exception as e:
+            traceback.print_exc()
+            emitter.flush()
+            _reply(out, {"id": request.get("id"), "ok": False, "error": str(e)})
+
+
+if __name__ == "__main__":
+    main()
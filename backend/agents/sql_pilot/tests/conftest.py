@@ -0,0 +1,5 @@
+import os
+import tempfile
+
+# the stores open their SQLite files in the state directory at import
+os.environ.setdefault("JOBPILOT_STATE_DIR", tempfile.mkdtemp(prefix="sql-pilot-tests-"))
@@ -0,0 +1,90 @@
+"""Durations of LLM calls and knowledge lookups from the listener events."""
+import threading
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from crewai.events import (
+    KnowledgeRetrievalCompletedEvent,
+    KnowledgeRetrievalStartedEvent,
+    LLMCallCompletedEvent,
+    LLMCallStartedEvent,
+)
+
+from sql_pilot.listeners import my_custom_listener
+from sql_pilot.listeners.my_custom_listener import MyCustomListener
+
+T0 = datetime(2026, 1, 1, 12, 0, 0)
+
+
+class CapturingBus:
+    """Collects the handlers setup_listeners registers."""
+
+    def __init__(self):
+        self.handlers = {}
+
+    def on(self, event_type):
+        def register(handler):
+            self.handlers[event_type] = handler
+            return handler
+        return register
+
+
+@pytest.fixture
+def bus(monkeypatch):
+    emitted = []
+    monkeypatch.setattr(my_custom_listener.emitter, "emit", emitted.append)
+    bus = CapturingBus()
+    MyCustomListener().setup_listeners(bus)
+    bus.emitted = emitted
+    return bus
+
+
+def fire(bus, event_type, **fields):
+    """Run the handler on a thread of its own, as the bus' thread pool does."""
+    event = SimpleNamespace(model="gpt", response="ok", **fields)
+    thread = threading.Thread(target=bus.handlers[event_type], args=(None, event))
+    thread.start()
+    thread.join()
+
+
+def durations(bus, kind):
+    return [e["duration_ms"] for e in bus.emitted if e["type"] == kind and e["action"] == "complete"]
+
+
+def test_llm_call_timed_across_threads(bus):
+    fire(bus, LLMCallStartedEvent, timestamp=T0, agent_id="a1", task_id="t1")
+    fire(bus, LLMCallCompletedEvent, timestamp=T0 + timedelta(seconds=1.5), agent_id="a1", task_id="t1")
+
+    assert durations(bus, "llm") == [1500.0]
+
+
+def test_concurrent_calls_are_not_mixed_up(bus):
+    fire(bus, LLMCallStartedEvent, timestamp=T0, agent_id="a1", task_id="t1")
+    fire(bus, LLMCallStartedEvent, timestamp=T0 + timedelta(seconds=1), agent_id="a2", task_id="t2")
+    fire(bus, LLMCallCompletedEvent, timestamp=T0 + timedelta(seconds=5), agent_id="a2", task_id="t2")
+    fire(bus, LLMCallCompletedEvent, timestamp=T0 + timedelta(seconds=2), agent_id="a1", task_id="t1")
+
+    assert durations(bus, "llm") == [4000.0, 2000.0]
+
+
+def test_calls_matched_by_call_id(bus):
+    fire(bus, LLMCallStartedEvent, timestamp=T0, call_id="c1", agent_id="a1", task_id="t1")
+    fire(bus, LLMCallStartedEvent, timestamp=T0 + timedelta(seconds=1), call_id="c2", agent_id="a1", task_id="t1")
+    fire(bus, LLMCallCompletedEvent, timestamp=T0 + timedelta(seconds=3), call_id="c1", agent_id="a1", task_id="t1")
+    fire(bus, LLMCallCompletedEvent, timestamp=T0 + timedelta(seconds=3), call_id="c2", agent_id="a1", task_id="t1")
+
+    assert durations(bus, "llm") == [3000.0, 2000.0]
+
+
+def test_knowledge_lookup_timed_across_threads(bus):
+    fire(bus, KnowledgeRetrievalStartedEvent, timestamp=T0, agent_id="a1", task_id="t1")
+    fire(bus, KnowledgeRetrievalCompletedEvent, timestamp=T0 + timedelta(milliseconds=250), agent_id="a1", task_id="t1")
+
+    assert durations(bus, "knowledge") == [250.0]
+
+
+def test_completion_without_start_has_no_duration(bus):
+    fire(bus, LLMCallCompletedEvent, timestamp=T0, agent_id="a1", task_id="t1")
+
+    assert durations(bus, "llm") == [None]
@@ -0,0 +1,27 @@
+"""Cache keys of recruiter prompts."""
+from sql_pilot.cache.prompt_cache import normalize_prompt
+
+
+def test_comparator_symbols_give_different_keys():
+    prompts = [
+        "candidates with cgpa > 8",
+        "candidates with cgpa < 8",
+        "candidates with cgpa >= 8",
+        "candidates with cgpa <= 8",
+        "candidates with cgpa != 8",
+        "candidates with cgpa = 8",
+        "candidates with cgpa 8",
+    ]
+    assert len({normalize_prompt(p) for p in prompts}) == len(prompts)
+
+
+def test_comparator_symbols_match_their_words():
+    assert normalize_prompt("cgpa > 8") == normalize_prompt("CGPA above 8")
+    assert normalize_prompt("cgpa>=8") == normalize_prompt("cgpa atleast 8")
+    assert normalize_prompt("cgpa ≤ 8") == normalize_prompt("cgpa <= 8")
+    assert normalize_prompt("cgpa <> 8") == normalize_prompt("cgpa != 8")
+
+
+def test_punctuation_and_skill_names():
+    assert normalize_prompt("Python devs with CGPA above 8?") == "python devs with cgpa above 8"
+    assert normalize_prompt("C++, C# and node.js; cgpa 8.5") == "c++ c# and node.js cgpa 8.5"
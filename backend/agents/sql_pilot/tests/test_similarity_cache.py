@@ -0,0 +1,42 @@
+"""Reuse of SQL across paraphrased prompts."""
+import pytest
+
+from sql_pilot.cache.prompt_cache import COMPARATORS
+from sql_pilot.cache.similarity_cache import MUST_MATCH_WORDS, SimilarityCache, must_match
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = SimilarityCache(tmp_path / "similarity.sqlite3")
+    cache.put("cgpa > 8 python devs", "select 'above'")
+    return cache
+
+
+def test_every_comparator_symbol_has_a_class():
+    assert set(COMPARATORS.values()) <= set(MUST_MATCH_WORDS)
+
+
+@pytest.mark.parametrize("first, second", [
+    ("cgpa > 8 python devs", "cgpa < 8 python devs"),
+    ("cgpa >= 8 python devs", "cgpa > 8 python devs"),
+    ("cgpa <= 8 python devs", "cgpa < 8 python devs"),
+    ("cgpa != 8 python devs", "cgpa = 8 python devs"),
+    ("cgpa ≥ 8 python devs", "cgpa ≤ 8 python devs"),
+])
+def test_symbolic_comparators_must_match(first, second):
+    assert must_match(first) != must_match(second)
+
+
+def test_symbol_and_word_are_the_same_comparator():
+    assert must_match("cgpa > 8 python devs") == must_match("python developers with cgpa above 8")
+
+
+def test_reversed_symbolic_filter_is_not_reused(cache):
+    assert cache.get("cgpa < 8 python devs") is None
+    assert cache.get("cgpa >= 8 python devs") is None
+
+
+def test_paraphrase_is_reused(cache):
+    match = cache.get("python developers with cgpa above 8")
+    assert match is not None
+    assert match[1] == "select 'above'"
@@ -0,0 +1,50 @@
+import os
+import zipfile
+from typing import BinaryIO, Iterator, Optional, Tuple
+
+from workspace import MAX_UPLOAD_BYTES
+
+# Upper bound for the number of resumes in one /parse-resume/batch request
+MAX_BATCH_FILES = int(os.getenv("MAX_BATCH_FILES", "500"))
+
+
+def is_zip(filename: str) -> bool:
+    return filename.lower().endswith(".zip")
+
+
+def iter_resume_sources(
+    filename: str,
+    fileobj: BinaryIO
+) -> Iterator[Tuple[str, Optional[BinaryIO], Optional[str]]]:
+    """
+    Yield (name, file object, error) for every resume in an upload.
+
+    A plain upload yields itself; a zip archive yields each PDF member.
+    Entries that cannot be used come with a file object of None and the
+    reason as error. Member file objects are only valid until the next item
+    is requested.
+    """
+    if not is_zip(filename):
+        yield filename, fileobj, None
+        return
+
+    try:
+        archive = zipfile.ZipFile(fileobj)
+    except zipfile.BadZipFile:
+        yield filename, None, "Invalid zip archive"
+        return
+
+    with archive:
+        for info in archive.infolist():
+            name = info.filename
+            base = os.path.basename(name)
+            if info.is_dir() or not base or base.startswith(".") or name.startswith("__MACOSX/"):
+                continue
+            if not base.lower().endswith(".pdf"):
+                continue
+            # checked before decompressing so zip bombs never hit the disk
+            if info.file_size > MAX_UPLOAD_BYTES:
+                yield name, None, "File too large"
+                continue
+            with archive.open(info) as member:
+                yield name, member, None
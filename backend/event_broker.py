@@ -0,0 +1,159 @@
+import asyncio
+import itertools
+import json
+import os
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+# Frames a single client may have waiting before the oldest are dropped
+SSE_QUEUE_SIZE = int(os.getenv("SSE_QUEUE_SIZE", "256"))
+# Events kept for clients resuming with Last-Event-ID
+SSE_REPLAY_SIZE = int(os.getenv("SSE_REPLAY_SIZE", "1024"))
+# Consecutive drops after which a client counts as stalled and is evicted
+SSE_MAX_LAG = int(os.getenv("SSE_MAX_LAG", str(SSE_QUEUE_SIZE)))
+
+
+class Subscriber:
+    """
+    One connected /events client with a bounded, drop-oldest queue.
+
+    ``run_id`` is the run it follows, or None for the firehose.
+    """
+
+    def __init__(self, sub_id: int, maxsize: int, run_id: Optional[str] = None):
+        self.id = sub_id
+        self.run_id = run_id
+        self.maxsize = maxsize
+        self.frames: Deque[str] = deque()
+        self.dropped = 0
+        self.lag = 0
+        self.closed = False
+        self._ready = asyncio.Event()
+
+    def offer(self, frame: str) -> bool:
+        """Queue a frame without blocking; False once the client is too far behind."""
+        if len(self.frames) >= self.maxsize:
+            self.frames.popleft()
+            self.dropped += 1
+            self.lag += 1
+        self.frames.append(frame)
+        self._ready.set()
+        return self.lag < SSE_MAX_LAG
+
+    def close(self):
+        self.closed = True
+        self._ready.set()
+
+    async def next(self, timeout: float) -> Optional[str]:
+        """Next frame, or None if nothing arrived within ``timeout``."""
+        if not self.frames and not self.closed:
+            self._ready.clear()
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout)
+            except asyncio.TimeoutError:
+                return None
+        if not self.frames:
+            return None
+        self.lag = 0
+        return self.frames.popleft()
+
+
+class EventBroker:
+    """
+    Fan-out of agent events to SSE clients.
+
+    Events tagged with a ``run_id`` go only to the subscribers of that run
+    and to firehose subscribers, so fan-out cost follows the number of
+    people watching a run rather than users x events.
+
+    Each event is serialized once into an SSE frame carrying an id, kept in
+    a ring buffer for Last-Event-ID replay and offered to subscribers
+    without awaiting anyone. Clients that keep falling behind are evicted
+    instead of growing memory; their browser reconnects and catches up from
+    the replay buffer.
+    """
+
+    def __init__(self, queue_size: int = SSE_QUEUE_SIZE, replay_size: int = SSE_REPLAY_SIZE):
+        self.queue_size = queue_size
+        self._channels: Dict[str, Dict[int, Subscriber]] = {}
+        self._firehose: Dict[int, Subscriber] = {}
+        self._replay: Deque[Tuple[int, Optional[str], str]] = deque(maxlen=replay_size)
+        self.published = 0
+        self._sub_ids = itertools.count(1)
+        self.evicted = 0
+        # events senders report having dropped before reaching us
+        self.upstream_dropped = 0
+
+    @property
+    def client_count(self) -> int:
+        return len(self._firehose) + sum(len(subs) for subs in self._channels.values())
+
+    def _subscribers(self):
+        yield from self._firehose.values()
+        for subs in self._channels.values():
+            yield from subs.values()
+
+    def publish(self, event: dict) -> int:
+        self.published += 1
+        event_id = self.published
+        run_id = event.get("run_id")
+        frame = f"id: {event_id}\ndata: {json.dumps(event)}\n\n"
+        self._replay.append((event_id, run_id, frame))
+
+        targets = list(self._firehose.values())
+        if run_id is not None:
+            targets.extend(self._channels.get(run_id, {}).values())
+
+        stalled = [sub for sub in targets if not sub.offer(frame)]
+        for sub in stalled:
+            print(f"🐢 Evicting stalled SSE client {sub.id} ({sub.dropped} dropped)", flush=True)
+            self.evicted += 1
+            self.unsubscribe(sub)
+        return event_id
+
+    def publish_many(self, events: List[dict]):
+        for event in events:
+            self.publish(event)
+
+    def stats(self) -> dict:
+        return {
+            "clients": self.client_count,
+            "firehose_clients": len(self._firehose),
+            "runs_watched": len(self._channels),
+            "published": self.published,
+            "evicted": self.evicted,
+            "dropped_by_clients": sum(sub.dropped for sub in self._subscribers()),
+            "upstream_dropped": self.upstream_dropped,
+        }
+
+    def subscribe(self, run_id: Optional[str] = None, last_event_id: Optional[int] = None) -> Subscriber:
+        """
+        Subscribe to one run, or to everything when ``run_id`` is None.
+
+        A run subscriber also receives the buffered events of its run it has
+        not seen yet, so connecting just after the run started loses nothing.
+        """
+        sub = Subscriber(next(self._sub_ids), self.queue_size, run_id)
+        if run_id is not None and last_event_id is None:
+            last_event_id = 0
+        if last_event_id is not None:
+            for event_id, event_run_id, frame in self._replay:
+                if event_id > last_event_id and (run_id is None or event_run_id == run_id):
+                    sub.offer(frame)
+
+        if run_id is None:
+            self._firehose[sub.id] = sub
+        else:
+            self._channels.setdefault(run_id, {})[sub.id] = sub
+        return sub
+
+    def unsubscribe(self, sub: Subscriber):
+        if sub.run_id is None:
+            self._firehose.pop(sub.id, None)
+        else:
+            subs = self._channels.get(sub.run_id)
+            if subs is not None:
+                subs.pop(sub.id, None)
+                if not subs:
+                    del self._channels[sub.run_id]
+        sub.close()
@@ -0,0 +1,191 @@
+import asyncio
+import time
+import uuid
+from collections import deque
+from typing import Awaitable, Callable, Deque, Dict, Optional
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+# Status reported for jobs whose client went away (nginx convention)
+CLIENT_CLOSED_REQUEST = 499
+
+# How long finished jobs stay queryable through GET /jobs/{id}
+JOB_TTL = 3600
+
+# Retry-After bounds (seconds) handed to clients when a queue is full
+MIN_RETRY_AFTER = 1
+MAX_RETRY_AFTER = 300
+DEFAULT_RETRY_AFTER = 30
+
+
+class QueueFull(Exception):
+    """Raised when a job kind already has as many waiting jobs as it may hold."""
+
+    def __init__(self, kind: str, retry_after: int):
+        super().__init__(f"Too many pending {kind} jobs")
+        self.kind = kind
+        self.retry_after = retry_after
+
+
+class JobFailed(Exception):
+    """Raised by Job.wait() when the job did not succeed."""
+
+    def __init__(self, job: "Job"):
+        super().__init__(job.error)
+        self.job = job
+
+
+class Job:
+    def __init__(self, kind: str):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.status = QUEUED
+        self.result = None
+        self.error: Optional[str] = None
+        # HTTP status the synchronous endpoints should report on failure
+        self.error_status = 500
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.task: Optional[asyncio.Task] = None
+
+    @property
+    def done(self) -> bool:
+        return self.status in (SUCCEEDED, FAILED, CANCELLED)
+
+    async def wait(self):
+        await asyncio.shield(self.task)
+        if self.status != SUCCEEDED:
+            raise JobFailed(self)
+        return self.result
+
+    def to_dict(self) -> dict:
+        return {
+            "job_id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "result": self.result,
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class _Lane:
+    """Concurrency limit, queue bound and timing stats for one job kind."""
+
+    def __init__(self, concurrency: int, max_queued: int):
+        self.concurrency = max(1, concurrency)
+        self.max_queued = max(0, max_queued)
+        self.semaphore = asyncio.Semaphore(self.concurrency)
+        self.queued = 0
+        self.running = 0
+        self.durations: Deque[float] = deque(maxlen=50)
+
+    def retry_after(self) -> int:
+        if not self.durations:
+            return DEFAULT_RETRY_AFTER
+        average = sum(self.durations) / len(self.durations)
+        estimate = average * (self.queued + 1) / self.concurrency
+        return int(min(MAX_RETRY_AFTER, max(MIN_RETRY_AFTER, estimate)))
+
+
+class JobScheduler:
+    """
+    Runs agent jobs in the background with a separate concurrency limit and
+    a bounded waiting queue per job kind.
+
+    Once a kind has ``max_queued`` jobs waiting for a slot, new submissions
+    are rejected with QueueFull instead of piling up connections and memory.
+    """
+
+    def __init__(self):
+        self._lanes: Dict[str, _Lane] = {}
+        self._jobs: Dict[str, Job] = {}
+
+    def add_lane(self, kind: str, concurrency: int, max_queued: int):
+        self._lanes[kind] = _Lane(concurrency, max_queued)
+
+    def concurrency(self, kind: str) -> int:
+        return self._lanes[kind].concurrency
+
+    def ensure_capacity(self, kind: str):
+        lane = self._lanes[kind]
+        if lane.queued >= lane.max_queued:
+            raise QueueFull(kind, lane.retry_after())
+
+    def submit(self, kind: str, work: Callable[[], Awaitable]) -> Job:
+        self._prune()
+        self.ensure_capacity(kind)
+
+        job = Job(kind)
+        self._jobs[job.id] = job
+        self._lanes[kind].queued += 1
+        job.task = asyncio.create_task(self._run(job, work))
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> Optional[Job]:
+        """
+        Cancel a queued or running job. A running job's worker is killed
+        together with its whole process tree by the worker pool.
+        """
+        job = self._jobs.get(job_id)
+        if job is not None and not job.done:
+            job.task.cancel()
+        return job
+
+    def stats(self) -> dict:
+        return {
+            kind: {
+                "concurrency": lane.concurrency,
+                "running": lane.running,
+                "queued": lane.queued,
+                "max_queued": lane.max_queued,
+            }
+            for kind, lane in self._lanes.items()
+        }
+
+    async def _run(self, job: Job, work: Callable[[], Awaitable]):
+        lane = self._lanes[job.kind]
+        try:
+            async with lane.semaphore:
+                lane.queued -= 1
+                lane.running += 1
+                job.status = RUNNING
+                job.started_at = time.time()
+                try:
+                    job.result = await work()
+                    job.status = SUCCEEDED
+                except Exception as e:
+                    job.status = FAILED
+                    job.error = getattr(e, "detail", None) or str(e)
+                    job.error_status = getattr(e, "status_code", 500)
+                finally:
+                    lane.running -= 1
+                    job.finished_at = time.time()
+                    lane.durations.append(job.finished_at - job.started_at)
+        except asyncio.CancelledError:
+            # the job task is ours; end it quietly so waiters see the status
+            if job.status == QUEUED:
+                lane.queued -= 1
+            job.status = CANCELLED
+            job.error = "Job cancelled"
+            job.error_status = CLIENT_CLOSED_REQUEST
+            job.finished_at = time.time()
+
+    def _prune(self):
+        cutoff = time.time() - JOB_TTL
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job.done and job.finished_at < cutoff
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
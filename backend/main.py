@@ -1,178 +1,673 @@
 from fastapi import FastAPI, HTTPException, Request ,UploadFile,File
-from fastapi.responses import StreamingResponse,JSONResponse
+from fastapi.responses import StreamingResponse,JSONResponse,PlainTextResponse
 from pydantic import BaseModel
-import subprocess
+from contextlib import asynccontextmanager
 import os
 from fastapi.middleware.cors import CORSMiddleware
-from typing import List
+from typing import List, Optional
 import asyncio
 import json
-import time
+import uuid
 from pathlib import Path
-import shutil
 from supabase import create_client, Client
 from dotenv import load_dotenv
+from worker_pool import WorkerPool, WorkerTimeout, WorkerError, pool_size
+from workspace import StagedFile, UploadTooLarge, copy_limited, save_upload
+from jobs import JobScheduler, Job, JobFailed, QueueFull, CLIENT_CLOSED_REQUEST
+from batch import MAX_BATCH_FILES, iter_resume_sources
+from event_broker import EventBroker
+from metrics import observe_event, registry
+from starlette.concurrency import run_in_threadpool
 
 load_dotenv()
-app = FastAPI()
 SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_KEY = os.getenv("SUPABASE_KEY")
 supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
 
-clients: List[asyncio.Queue] = []
+broker = EventBroker()
 
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["http://localhost:8080"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+# Seconds between keepalive comments on an idle /events stream
+SSE_KEEPALIVE = 15
+# Allow /events without ?run= to stream every run's events (admin use)
+SSE_FIREHOSE = os.getenv("SSE_FIREHOSE", "0") == "1"
 
 
 AGENTS_DIR = os.path.abspath("./agents")
 
 SQL_BASE_DIR = os.path.join(AGENTS_DIR, "sql_pilot")
-SQL_INPUT_FILE = os.path.join(SQL_BASE_DIR, "input.txt")
-SQL_OUTPUT_FILE = os.path.join(SQL_BASE_DIR, "output.txt")
 
 RESUME_BASE_DIR = os.path.join(AGENTS_DIR, "resume_pilot")
 
+SQL_TIMEOUT = 300
+RESUME_TIMEOUT = 120
+
+# Schema reloads are a couple of information_schema queries
+ADMIN_TIMEOUT = 10
+# Fetching one more page of an answered prompt is a single indexed query
+PAGE_TIMEOUT = 60
+# Rows per page when /complete streams NDJSON and no page_size was given
+STREAM_PAGE_SIZE = int(os.getenv("STREAM_PAGE_SIZE", "100"))
+
+# How often a waiting request checks whether its client is still there
+DISCONNECT_POLL_INTERVAL = 1
+
+
+def on_agent_events(events: List[dict]):
+    """Record the timings listener events carry, then fan them out."""
+    for event in events:
+        observe_event(event)
+    broker.publish_many(events)
+
+
+# Warm agent processes; sized with SQL_WORKERS / RESUME_WORKERS. Resume
+# parsing defaults to one worker per core so batches scale with the machine
+# SQL workers stream their listener events straight into the SSE broker
+sql_pool = WorkerPool(
+    "sql", "sql_pilot.worker", SQL_BASE_DIR, pool_size("SQL_WORKERS", 2),
+    on_events=on_agent_events
+)
+resume_pool = WorkerPool("resume", "resume_parser.worker", RESUME_BASE_DIR, pool_size("RESUME_WORKERS", os.cpu_count() or 2))
+
+# Every agent run goes through the scheduler: at most *_CONCURRENCY runs per
+# agent at once, at most *_QUEUE_LIMIT waiting, anything beyond gets a 429
+scheduler = JobScheduler()
+scheduler.add_lane(
+    "sql",
+    concurrency=pool_size("SQL_CONCURRENCY", sql_pool.size),
+    max_queued=pool_size("SQL_QUEUE_LIMIT", 50)
+)
+scheduler.add_lane(
+    "resume",
+    concurrency=pool_size("RESUME_CONCURRENCY", resume_pool.size),
+    max_queued=pool_size("RESUME_QUEUE_LIMIT", 200)
+)
+
+registry.gauge(
+    "jobpilot_jobs", "Agent jobs by state", ["lane", "state"],
+    lambda: {
+        (kind, state): lane[state]
+        for kind, lane in scheduler.stats().items()
+        for state in ("queued", "running")
+    }
+)
+registry.gauge(
+    "jobpilot_idle_workers", "Idle warm agent workers", ["pool"],
+    lambda: {(pool.name,): pool.idle_count for pool in (sql_pool, resume_pool)}
+)
+registry.gauge(
+    "jobpilot_sse_clients", "Connected /events clients", [],
+    lambda: {(): broker.client_count}
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    print("🔥 Warming up agent workers...", flush=True)
+    await asyncio.gather(sql_pool.start(), resume_pool.start())
+    yield
+    await asyncio.gather(sql_pool.close(), resume_pool.close())
+
+
+app = FastAPI(lifespan=lifespan)
+
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=["http://localhost:8080"],
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"],
+)
+
 
 class CompleteRequest(BaseModel):
     input: str
+    # id under which the agent's events are published on /events?run=<id>
+    run_id: Optional[str] = None
+    # return only this many rows plus a next_cursor for the rest
+    page_size: Optional[int] = None
+    # next_cursor of a previous page; input is ignored when given
+    cursor: Optional[str] = None
 
 class CandidateByUSNRequest(BaseModel):
     usn: str
 
-@app.post("/complete")
-def complete(req: CompleteRequest):
+def queue_full_error(e: QueueFull) -> HTTPException:
+    return HTTPException(
+        status_code=429,
+        detail=str(e),
+        headers={"Retry-After": str(e.retry_after)}
+    )
+
+
+def submit_job(kind: str, work) -> Job:
     try:
-        with open(SQL_INPUT_FILE, "w") as f:
-            f.write(req.input)
-    except Exception as e:
-        raise HTTPException(500, f"Failed to write input.txt: {e}")
+        return scheduler.submit(kind, work)
+    except QueueFull as e:
+        raise queue_full_error(e)
 
+
+async def watch_disconnect(request: Request):
+    while not await request.is_disconnected():
+        await asyncio.sleep(DISCONNECT_POLL_INTERVAL)
+
+
+async def wait_for_job(job: Job, request: Request):
+    """
+    Wait for a job on behalf of a connected client.
+
+    If the client goes away first, the job is cancelled so its worker (and
+    the LLM calls it would still make) is freed for live requests.
+    """
+    waiter = asyncio.ensure_future(job.wait())
+    watcher = asyncio.ensure_future(watch_disconnect(request))
     try:
-        print(f"🚀 Running SQL agent with prompt: {req.input}")
-        subprocess.run(
-            ["crewai", "run"],
-            cwd=SQL_BASE_DIR,
-            check=True,
-            capture_output=True,
-            text=True,
-            timeout=300
-        )
-    except subprocess.CalledProcessError as e:
-        raise HTTPException(500, f"CrewAI failed: {e.stderr}")
-    except subprocess.TimeoutExpired:
+        done, _ = await asyncio.wait({waiter, watcher}, return_when=asyncio.FIRST_COMPLETED)
+    except asyncio.CancelledError:
+        scheduler.cancel(job.id)
+        raise
+    finally:
+        watcher.cancel()
+
+    if waiter not in done:
+        waiter.cancel()
+        scheduler.cancel(job.id)
+        print(f"❌ Client disconnected, cancelled {job.kind} job {job.id}", flush=True)
+        raise HTTPException(status_code=CLIENT_CLOSED_REQUEST, detail="Client disconnected")
+
+    try:
+        return waiter.result()
+    except JobFailed:
+        raise HTTPException(status_code=job.error_status, detail=job.error)
+
+
+async def run_sql_agent(user_query: str, run_id: str, page_size: Optional[int] = None) -> dict:
+    payload = {"user_query": user_query, "run_id": run_id}
+    if page_size is not None:
+        payload["page_size"] = page_size
+    try:
+        print(f"🚀 Running SQL agent with prompt: {user_query}")
+        # no workdir: the SQL agent keeps the whole run in memory
+        result = await sql_pool.run(payload, timeout=SQL_TIMEOUT)
+    except WorkerTimeout:
         raise HTTPException(504, "CrewAI execution timed out")
+    except WorkerError as e:
+        raise HTTPException(500, f"CrewAI failed: {e}")
 
-    if not os.path.exists(SQL_OUTPUT_FILE):
-        raise HTTPException(500, "output.txt not found")
+    # rows, next_cursor, served_by and whatever the serving path adds
+    return {**result, "run_id": run_id}
 
-    with open(SQL_OUTPUT_FILE, "r") as f:
-        return {"result": f.read()}
 
+async def read_sql_page(cursor: str, page_size: int) -> dict:
+    try:
+        page = await sql_pool.call(
+            "page", {"cursor": cursor, "page_size": page_size}, timeout=PAGE_TIMEOUT
+        )
+    except WorkerTimeout:
+        raise HTTPException(504, "Fetching the next page timed out")
+    except WorkerError as e:
+        raise HTTPException(500, f"Fetching the next page failed: {e}")
+    if "invalid_cursor" in page:
+        raise HTTPException(400, page["invalid_cursor"])
+    return page
+
+
+async def fetch_sql_page(cursor: str, page_size: int, request: Optional[Request] = None) -> dict:
+    """
+    Next page of a result. Goes through the sql lane like agent runs, since
+    it takes a worker too: page fetches count against SQL_CONCURRENCY and
+    get a 429 when the queue is full.
+    """
+    job = submit_job("sql", lambda: read_sql_page(cursor, page_size))
+    if request is not None:
+        return await wait_for_job(job, request)
+    try:
+        return await job.wait()
+    except JobFailed:
+        raise HTTPException(status_code=job.error_status, detail=job.error)
+
+
+def complete_body(result: dict) -> dict:
+    """JSON /complete response: the rows travel as one JSON string in ``result``."""
+    body = dict(result)
+    body["result"] = json.dumps(body.pop("rows"), indent=2)
+    return body
+
+
+def sql_work(req: CompleteRequest, run_id: str):
+    async def work():
+        return complete_body(await run_sql_agent(req.input, run_id, req.page_size))
+    return work
+
+
+async def stream_complete(req: CompleteRequest, request: Request):
+    """
+    NDJSON /complete: one line per row, pages fetched as the client reads.
+
+    The first page is ready as soon as the SQL is, so rows reach the client
+    without waiting for the whole result; later pages follow the cursor with
+    keyset pagination. Ends with a {"done": true, ...} line, or an
+    {"error": ...} line if a later page fails.
+    """
+    page_size = req.page_size or STREAM_PAGE_SIZE
+    run_id = req.run_id or uuid.uuid4().hex
+    if req.cursor:
+        first = await fetch_sql_page(req.cursor, page_size, request)
+    else:
+        job = submit_job("sql", lambda: run_sql_agent(req.input, run_id, page_size))
+        first = await wait_for_job(job, request)
+
+    async def stream():
+        page = first
+        count = 0
+        while True:
+            for row in page["rows"]:
+                count += 1
+                yield json.dumps(row) + "\n"
+            cursor = page.get("next_cursor")
+            if not cursor:
+                break
+            try:
+                # shielded: a client leaving mid-page must not kill the worker
+                page = await asyncio.shield(fetch_sql_page(cursor, page_size))
+            except HTTPException as e:
+                yield json.dumps({"error": e.detail, "status_code": e.status_code, "cursor": cursor}) + "\n"
+                return
+        yield json.dumps({
+            "done": True,
+            "count": count,
+            "served_by": first.get("served_by"),
+            "run_id": run_id
+        }) + "\n"
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
 
-@app.get("/events")
-async def events(request: Request):
-    queue = asyncio.Queue()
-    clients.append(queue)
 
-    async def event_generator():
+@app.post("/complete")
+async def complete(req: CompleteRequest, request: Request, format: str = "json"):
+    if format not in ("json", "ndjson"):
+        raise HTTPException(400, "format must be 'json' or 'ndjson'")
+    if format == "ndjson":
+        return await stream_complete(req, request)
+    if req.cursor:
+        page = await fetch_sql_page(req.cursor, req.page_size or STREAM_PAGE_SIZE, request)
+        return complete_body(page)
+
+    run_id = req.run_id or uuid.uuid4().hex
+    job = submit_job("sql", sql_work(req, run_id))
+    return await wait_for_job(job, request)
+
+
+@app.post("/jobs/complete", status_code=202)
+async def submit_complete(req: CompleteRequest):
+    run_id = req.run_id or uuid.uuid4().hex
+    job = submit_job("sql", sql_work(req, run_id))
+    return {"job_id": job.id, "status": job.status, "run_id": run_id}
+
+
+async def published_stats(pool: WorkerPool) -> dict:
+    # read from the shared state: a stats request never waits behind a run
+    stats = await run_in_threadpool(pool.published_stats)
+    if stats is None:
+        raise HTTPException(503, "Stats unavailable: no worker has published any yet")
+    return stats
+
+
+def sql_admin_work(op: str, timeout: float, failure: str):
+    """
+    A maintenance op on a SQL worker. Run as a sql job, so it counts
+    against the lane's limits like everything else that takes a worker.
+    """
+    async def work():
         try:
-            while True:
-                if await request.is_disconnected():
-                    print("❌ Client disconnected")
-                    break
+            return await sql_pool.call(op, {}, timeout=timeout)
+        except WorkerError as e:
+            raise HTTPException(503, f"{failure}: {e}")
+    return work
+
+
+@app.get("/complete/stats")
+async def complete_stats():
+    return await published_stats(sql_pool)
+
+
+@app.post("/complete/schema/refresh")
+async def refresh_schema(request: Request):
+    # reload after migrations instead of waiting for SCHEMA_TTL
+    job = submit_job("sql", sql_admin_work("refresh_schema", ADMIN_TIMEOUT, "Schema refresh failed"))
+    return await wait_for_job(job, request)
+
+
+@app.get("/complete/index-report")
+async def index_report(request: Request):
+    # indexes worth adding for the queries the SQL agent actually ran
+    job = submit_job("sql", sql_admin_work("index_report", PAGE_TIMEOUT, "Index report unavailable"))
+    return await wait_for_job(job, request)
 
-                event = await queue.get()
 
-                payload = f"data: {json.dumps(event)}\n\n"
+@app.get("/jobs")
+async def jobs_stats():
+    return scheduler.stats()
 
-                # ✅ LOG EXACTLY WHEN YOU SEND
-                print(f"📤 [{time.strftime('%H:%M:%S')}] Sent event → {event}", flush=True)
 
-                yield payload
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    job = scheduler.get(job_id)
+    if job is None:
+        raise HTTPException(404, "Job not found")
+    return job.to_dict()
 
+
+@app.delete("/jobs/{job_id}")
+async def cancel_job(job_id: str):
+    job = scheduler.cancel(job_id)
+    if job is None:
+        raise HTTPException(404, "Job not found")
+    # let the cancellation land before reporting the status
+    await asyncio.wait({job.task})
+    return job.to_dict()
+
+
+def parse_last_event_id(value: Optional[str]) -> Optional[int]:
+    try:
+        return int(value) if value else None
+    except ValueError:
+        return None
+
+
+@app.get("/events")
+async def events(request: Request, run: Optional[str] = None):
+    """
+    Agent events of one run (``?run=<id>``), or of every run when the
+    firehose is enabled with SSE_FIREHOSE=1 and no run is given.
+    """
+    if run is None and not SSE_FIREHOSE:
+        raise HTTPException(400, "Pass ?run=<run_id> to follow a run")
+
+    # EventSource sends Last-Event-ID itself when it reconnects
+    last_event_id = parse_last_event_id(
+        request.headers.get("last-event-id") or request.query_params.get("lastEventId")
+    )
+    subscriber = broker.subscribe(run, last_event_id)
+    print(f"🔌 SSE client {subscriber.id} connected to {run or 'firehose'} ({broker.client_count} total)", flush=True)
+
+    async def event_generator():
+        try:
+            while not subscriber.closed:
+                frame = await subscriber.next(timeout=SSE_KEEPALIVE)
+                # comment frames keep proxies from timing out idle streams
+                yield frame if frame is not None else ": keepalive\n\n"
         finally:
-            clients.remove(queue)
-            print("🧹 Client queue removed", flush=True)
+            broker.unsubscribe(subscriber)
+            print(f"🧹 SSE client {subscriber.id} removed", flush=True)
 
     return StreamingResponse(
         event_generator(),
         media_type="text/event-stream"
     )
 
+class EmitBatchRequest(BaseModel):
+    events: List[dict]
+    # events the sender dropped since its previous batch
+    dropped: int = 0
+
+
 @app.post("/emit")
 async def emit(event: dict):
-    for queue in clients:
-        await queue.put(event)
+    observe_event(event)
+    broker.publish(event)
 
     return {"status": "ok"}
 
-# frontend -> backend, resume.pdf 
 
-BASE_DIR = Path(__file__).resolve().parent  # directory of this python file
+@app.post("/emit/batch")
+async def emit_batch(req: EmitBatchRequest):
+    on_agent_events(req.events)
+    broker.upstream_dropped += req.dropped
+
+    return {"status": "ok"}
 
-RESUME_SAVE_PATH = BASE_DIR / "agents" / "resume_pilot" / "resume.pdf"
 
-RESUME_BASE_DIR = RESUME_SAVE_PATH.parent
+@app.get("/events/stats")
+async def events_stats():
+    stats = broker.stats()
+    stats["upstream_dropped"] += sql_pool.events_dropped
+    return stats
 
-@app.post("/parse-resume")
-async def parse_resume(file: UploadFile = File(...)):
 
-    if not file.filename.lower().endswith(".pdf"):
+@app.get("/metrics")
+async def metrics():
+    """Latency histograms, queue depth and client counts for Prometheus."""
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+
+# frontend -> backend, resume.pdf 
+
+def check_pdf(filename: str):
+    if not filename.lower().endswith(".pdf"):
         raise HTTPException(status_code=400, detail="Only PDF files allowed")
 
+
+def staging_error(e: Exception) -> HTTPException:
+    if isinstance(e, UploadTooLarge):
+        return HTTPException(status_code=413, detail=str(e))
+    return HTTPException(status_code=500, detail=f"Failed to save resume: {e}")
+
+
+async def stage_resume_upload(file: UploadFile) -> StagedFile:
+    """
+    Stream an uploaded resume into a fresh workspace without blocking the
+    event loop. Whoever runs the job closes the returned StagedFile, which
+    removes the directory.
+    """
+    check_pdf(file.filename)
+    staged = await run_in_threadpool(StagedFile, file.filename, "resume", "resume.pdf")
+    try:
+        await save_upload(file, staged)
+    except Exception as e:
+        await run_in_threadpool(staged.close)
+        raise staging_error(e)
+    return staged
+
+
+def stage_resume_source(filename: str, source) -> StagedFile:
+    """Blocking variant for batch members; call it from the threadpool."""
+    check_pdf(filename)
+    staged = StagedFile(filename, "resume", "resume.pdf")
+    try:
+        copy_limited(source, staged)
+    except Exception as e:
+        staged.close()
+        raise staging_error(e)
+    return staged
+
+
+async def run_resume_agent(staged: StagedFile) -> dict:
     try:
-        # 1️⃣ Ensure directory exists
-        RESUME_BASE_DIR.mkdir(parents=True, exist_ok=True)
-
-        # 2️⃣ Save resume as resume.pdf
-        with open(RESUME_SAVE_PATH, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-
-        # 3️⃣ Run CrewAI
-        subprocess.run(
-            ["crewai", "run"],
-            cwd=RESUME_BASE_DIR,
-            check=True,
-            text=True,
-            timeout=120
+        # Run CrewAI on a warm worker
+        # the hash taken while receiving the upload keys the resume cache
+        result = await resume_pool.run(
+            {"resume_path": str(staged.path), "workdir": str(staged.workdir), "sha256": staged.sha256},
+            timeout=RESUME_TIMEOUT
         )
 
-        # 4️⃣ Load skill_verification.json
-        skill_json_path = RESUME_BASE_DIR / "skill_verification.json"
+        # Use the skill verification result
+        data = result.get("skill_verification")
 
-        if not skill_json_path.exists():
+        if not data:
             raise HTTPException(
                 status_code=500,
-                detail="skill_verification.json not found"
+                detail="skill verification result not found"
             )
 
-        with open(skill_json_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-
-        # 5️⃣ Extract ONLY required fields
-        response = {
+        # Extract ONLY required fields
+        return {
             "present_skills": data.get("present_skills", []),
             "percentage_score": data.get("percentage_score", 0),
             "count_skills": data.get("count_skills", 0)
         }
 
-        return JSONResponse(content=response)
+    except HTTPException:
+        raise
 
-    except subprocess.TimeoutExpired:
+    except WorkerTimeout:
         raise HTTPException(status_code=504, detail="CrewAI execution timed out")
 
-    except subprocess.CalledProcessError as e:
+    except WorkerError as e:
         raise HTTPException(status_code=500, detail=f"CrewAI failed: {e}")
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+
+def resume_work(staged: StagedFile):
+    """Job body for one staged resume; removes its workspace when done."""
+    async def work():
+        try:
+            return await run_resume_agent(staged)
+        finally:
+            await run_in_threadpool(staged.close)
+    return work
+
+
+async def submit_resume_job(file: UploadFile) -> Job:
+    # refuse before spending time on the upload
+    try:
+        scheduler.ensure_capacity("resume")
+    except QueueFull as e:
+        raise queue_full_error(e)
+
+    staged = await stage_resume_upload(file)
+
+    try:
+        return submit_job("resume", resume_work(staged))
+    except HTTPException:
+        await run_in_threadpool(staged.close)
+        raise
+
+
+@app.get("/parse-resume/stats")
+async def parse_resume_stats():
+    return await published_stats(resume_pool)
+
+
+@app.post("/parse-resume")
+async def parse_resume(request: Request, file: UploadFile = File(...)):
+    job = await submit_resume_job(file)
+    return JSONResponse(content=await wait_for_job(job, request))
+
+
+@app.post("/jobs/parse-resume", status_code=202)
+async def submit_parse_resume(file: UploadFile = File(...)):
+    job = await submit_resume_job(file)
+    return {"job_id": job.id, "status": job.status}
+
+
+def stage_batch(files: List[UploadFile]):
+    """
+    Stage every PDF of a batch (plain uploads and zip members) into its own
+    workspace. Returns the staged resumes and the per-file rejections.
+    """
+    staged, rejected = [], []
+    try:
+        for upload in files:
+            for name, source, error in iter_resume_sources(upload.filename, upload.file):
+                if len(staged) + len(rejected) >= MAX_BATCH_FILES:
+                    raise HTTPException(413, f"Batch exceeds {MAX_BATCH_FILES} files")
+                if error:
+                    rejected.append({"filename": name, "status": "error", "error": error})
+                    continue
+                try:
+                    staged.append(stage_resume_source(name, source))
+                except HTTPException as e:
+                    rejected.append({"filename": name, "status": "error", "error": e.detail})
+    except Exception:
+        for item in staged:
+            item.close()
+        raise
+    return staged, rejected
+
+
+async def batch_outcome(filename: str, job: Job) -> dict:
+    try:
+        result = await job.wait()
+    except JobFailed:
+        return {
+            "filename": filename,
+            "status": "error",
+            "error": job.error,
+            "status_code": job.error_status
+        }
+    return {"filename": filename, "status": "ok", "job_id": job.id, "result": result}
+
+
+async def run_batch(staged: list, rejected: list):
+    """
+    Feed staged resumes to the resume lane and yield each outcome as soon
+    as it finishes.
+
+    At most one lane's worth of this batch is submitted at a time so a large
+    batch never fills the shared queue and starves single uploads.
+    """
+    for outcome in rejected:
+        yield outcome
+
+    waiting = list(staged)
+    in_flight = {}
+    limit = scheduler.concurrency("resume")
+    try:
+        while waiting or in_flight:
+            while waiting and len(in_flight) < limit:
+                item = waiting[0]
+                try:
+                    job = scheduler.submit("resume", resume_work(item))
+                except QueueFull as e:
+                    if in_flight:
+                        break
+                    await asyncio.sleep(min(e.retry_after, 5))
+                    continue
+                waiting.pop(0)
+                in_flight[asyncio.ensure_future(batch_outcome(item.filename, job))] = job
+
+            done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                del in_flight[task]
+                yield task.result()
+    finally:
+        # client went away mid-batch: stop the jobs still running for it and
+        # drop the files never handed to a job
+        for job in in_flight.values():
+            scheduler.cancel(job.id)
+        for item in waiting:
+            item.close()
+
+
+@app.post("/parse-resume/batch")
+async def parse_resume_batch(files: List[UploadFile] = File(...), format: str = "ndjson"):
+    if format not in ("ndjson", "sse"):
+        raise HTTPException(400, "format must be 'ndjson' or 'sse'")
+
+    # Stage everything up front: the uploads are gone once streaming starts
+    staged, rejected = await run_in_threadpool(stage_batch, files)
+
+    async def stream():
+        succeeded = failed = 0
+        async for outcome in run_batch(staged, rejected):
+            if outcome["status"] == "ok":
+                succeeded += 1
+            else:
+                failed += 1
+            yield encode(outcome)
+        yield encode({"done": True, "total": succeeded + failed, "succeeded": succeeded, "failed": failed})
+
+    if format == "sse":
+        encode = lambda item: f"data: {json.dumps(item)}\n\n"
+        media_type = "text/event-stream"
+    else:
+        encode = lambda item: json.dumps(item) + "\n"
+        media_type = "application/x-ndjson"
+
+    return StreamingResponse(stream(), media_type=media_type)
+
+
 @app.post("/candidates/by-usn")
 def get_candidate_by_usn(req: CandidateByUSNRequest):
     response = (
@@ -0,0 +1,9 @@
+import os
+import sys
+from pathlib import Path
+
+# main.py builds its Supabase client at import; the tests never reach it
+os.environ.setdefault("SUPABASE_URL", "http://localhost:54321")
+os.environ.setdefault("SUPABASE_KEY", "test.test.test")
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
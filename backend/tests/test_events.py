@@ -0,0 +1,89 @@
+"""/events keeps delivering while a resume parse is running."""
+import asyncio
+import json
+import socket
+from contextlib import asynccontextmanager
+
+import httpx
+import pytest
+import uvicorn
+
+import main
+
+
+class StubResumePool:
+    """Stands in for the resume workers: a parse runs until it is released."""
+
+    def __init__(self):
+        self.started = asyncio.Event()
+        self.release = asyncio.Event()
+
+    async def run(self, payload: dict, timeout: float):
+        self.started.set()
+        await asyncio.wait_for(self.release.wait(), timeout)
+        return {
+            "skill_verification": {
+                "present_skills": ["python"],
+                "percentage_score": 100,
+                "count_skills": 1,
+            }
+        }
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@asynccontextmanager
+async def serve(app):
+    """Run the app on a real socket so /events streams as it does in production."""
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    # no lifespan: it would spawn the real agent workers
+    server = uvicorn.Server(uvicorn.Config(app, lifespan="off", log_level="warning"))
+    task = asyncio.create_task(server.serve(sockets=[sock]))
+    while not server.started:
+        await asyncio.sleep(0.01)
+    try:
+        yield f"http://127.0.0.1:{sock.getsockname()[1]}"
+    finally:
+        server.should_exit = True
+        await task
+
+
+async def next_event(lines) -> dict:
+    async for line in lines:
+        if line.startswith("data: "):
+            return json.loads(line[len("data: "):])
+
+
+@pytest.mark.anyio
+async def test_events_stream_while_resume_parses(monkeypatch):
+    pool = StubResumePool()
+    monkeypatch.setattr(main, "resume_pool", pool)
+    # large enough to take several chunks through the threadpool
+    resume = b"%PDF-1.4\n" + b"0" * (4 * 1024 * 1024)
+
+    async with serve(main.app) as base_url, httpx.AsyncClient(base_url=base_url, timeout=10) as client:
+        async with client.stream("GET", "/events", params={"run": "r1"}) as stream:
+            assert stream.status_code == 200
+            lines = stream.aiter_lines()
+
+            parse = asyncio.create_task(
+                client.post("/parse-resume", files={"file": ("cv.pdf", resume, "application/pdf")})
+            )
+            await asyncio.wait_for(pool.started.wait(), 10)
+
+            for step in range(3):
+                emitted = await client.post("/emit", json={"run_id": "r1", "step": step})
+                assert emitted.status_code == 200
+                event = await asyncio.wait_for(next_event(lines), 5)
+                assert event == {"run_id": "r1", "step": step}
+                assert not parse.done()
+
+            pool.release.set()
+            response = await asyncio.wait_for(parse, 10)
+
+    assert response.status_code == 200
+    assert response.json() == {"present_skills": ["python"], "percentage_score": 100, "count_skills": 1}
@@ -0,0 +1,305 @@
+import asyncio
+import itertools
+import json
+import os
+import signal
+import sqlite3
+import sys
+import time
+from contextlib import closing
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Set
+
+from metrics import WORKER_CALL_LATENCY
+
+# Crew results (full SQL dumps, resume JSON) can be far larger than the
+# default 64 KiB line limit of asyncio stream readers.
+STREAM_LIMIT = 64 * 1024 * 1024
+
+WORKER_STARTUP_TIMEOUT = float(os.getenv("WORKER_STARTUP_TIMEOUT", "300"))
+WORKER_RESPAWN_DELAY = 5
+
+# Caches and indexes the agents keep on disk. Every worker of every agent
+# gets the same directory so they share entries (and invalidate each other).
+STATE_DIR = Path(os.getenv("JOBPILOT_STATE_DIR", Path(__file__).resolve().parent / ".state"))
+# Where the workers publish their stats (see the agents' state.StatsBoard),
+# so stats are served without waiting for a worker
+WORKER_STATS_FILE = "worker_stats.sqlite3"
+
+
+class WorkerError(Exception):
+    """Raised when a worker reports a failure or dies mid-request."""
+
+
+class WorkerTimeout(WorkerError):
+    """Raised when a worker does not answer within the request timeout."""
+
+
+class WorkerCrashed(WorkerError):
+    """Raised when a worker process goes away while serving a request."""
+
+
+def agent_python(agent_dir: str) -> List[str]:
+    """
+    Interpreter command for an agent project.
+
+    Each agent is its own uv project with its own virtualenv, so workers
+    must run under that interpreter rather than the backend's.
+    """
+    venv_python = Path(agent_dir) / ".venv" / "bin" / "python"
+    if venv_python.exists():
+        return [str(venv_python)]
+    return ["uv", "run", "python"]
+
+
+class _Worker:
+    """A single long-lived agent process speaking JSON lines over stdio."""
+
+    def __init__(
+        self,
+        name: str,
+        command: List[str],
+        cwd: str,
+        env: Dict[str, str],
+        on_events: Optional[Callable[[List[dict], int], None]] = None
+    ):
+        self.name = name
+        self.command = command
+        self.cwd = cwd
+        self.env = env
+        self.on_events = on_events
+        self.proc: Optional[asyncio.subprocess.Process] = None
+        self._ids = itertools.count(1)
+
+    async def start(self):
+        self.proc = await asyncio.create_subprocess_exec(
+            *self.command,
+            cwd=self.cwd,
+            env=self.env,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            limit=STREAM_LIMIT,
+            # own process group so the whole crew tree can be killed at once
+            start_new_session=True,
+        )
+        message = await asyncio.wait_for(self._read(), WORKER_STARTUP_TIMEOUT)
+        if not message.get("ready"):
+            raise WorkerError(f"{self.name} failed to start: {message}")
+        print(f"🔥 Worker {self.name} (pid {self.proc.pid}) ready", flush=True)
+
+    @property
+    def alive(self) -> bool:
+        return self.proc is not None and self.proc.returncode is None
+
+    async def _read(self) -> dict:
+        """Next protocol message; event batches are forwarded on the way."""
+        while True:
+            line = await self.proc.stdout.readline()
+            if not line:
+                raise WorkerCrashed(f"{self.name} exited unexpectedly")
+            message = json.loads(line)
+            if "events" not in message:
+                return message
+            if self.on_events is not None:
+                self.on_events(message["events"], message.get("dropped", 0))
+
+    async def call(self, op: str, payload: dict, timeout: float):
+        request_id = next(self._ids)
+        request = {"id": request_id, "op": op, "payload": payload}
+        self.proc.stdin.write((json.dumps(request) + "\n").encode("utf-8"))
+        await self.proc.stdin.drain()
+
+        reply = await asyncio.wait_for(self._read(), timeout)
+        if reply.get("id") != request_id:
+            raise WorkerCrashed(f"{self.name} answered out of order")
+        if not reply.get("ok"):
+            raise WorkerError(reply.get("error", "unknown worker error"))
+        return reply.get("result")
+
+    def kill(self):
+        if not self.alive:
+            return
+        try:
+            os.killpg(self.proc.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+
+
+class WorkerPool:
+    """
+    Pool of warm agent processes.
+
+    Workers import crewai, the agent package and build the crew once at
+    startup, then serve requests in-process, so a request no longer pays
+    for interpreter start-up, imports and crew construction.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        module: str,
+        cwd: str,
+        size: int,
+        on_events: Optional[Callable[[List[dict]], None]] = None
+    ):
+        self.name = name
+        self.module = module
+        self.cwd = cwd
+        self.size = max(1, size)
+        self.on_events = on_events
+        # events the workers' emitters had to drop before reaching us
+        self.events_dropped = 0
+        self._idle: asyncio.Queue = asyncio.Queue()
+        self._workers: List[_Worker] = []
+        self._respawns: Set[asyncio.Task] = set()
+        self._closed = False
+
+    def _new_worker(self, index: int) -> _Worker:
+        command = agent_python(self.cwd) + ["-m", self.module]
+        name = f"{self.name}-{index}"
+        env = dict(
+            os.environ, PYTHONUNBUFFERED="1", JOBPILOT_STATE_DIR=str(STATE_DIR), JOBPILOT_WORKER=name
+        )
+        return _Worker(name, command, self.cwd, env, self._forward_events)
+
+    async def start(self):
+        workers = [self._new_worker(i) for i in range(self.size)]
+        await asyncio.gather(*(w.start() for w in workers))
+        for worker in workers:
+            self._workers.append(worker)
+            self._idle.put_nowait(worker)
+
+    async def _replace(self, dead: _Worker):
+        """Swap a dead or killed worker for a fresh one in the background."""
+        dead.kill()
+        if dead in self._workers:
+            self._workers.remove(dead)
+
+        index = dead.name.rsplit("-", 1)[-1]
+        while not self._closed:
+            worker = self._new_worker(int(index))
+            try:
+                await worker.start()
+            except Exception as e:
+                worker.kill()
+                print(f"⚠️ Failed to respawn {worker.name}: {e}", flush=True)
+                await asyncio.sleep(WORKER_RESPAWN_DELAY)
+                continue
+            self._workers.append(worker)
+            self._idle.put_nowait(worker)
+            return
+
+    async def call(self, op: str, payload: dict, timeout: float):
+        """
+        Run ``op`` on the next idle worker. ``timeout`` covers waiting for
+        that worker as well as the call itself.
+        """
+        waited = time.perf_counter()
+        try:
+            worker = await asyncio.wait_for(self._idle.get(), timeout)
+        except asyncio.TimeoutError:
+            WORKER_CALL_LATENCY.observe(timeout, pool=self.name, op=op, outcome="busy")
+            raise WorkerTimeout(f"No {self.name} worker free within {timeout}s")
+        timeout -= time.perf_counter() - waited
+        if timeout <= 0:
+            self._idle.put_nowait(worker)
+            raise WorkerTimeout(f"No {self.name} worker free in time")
+        healthy = False
+        outcome = "cancelled"
+        started = time.perf_counter()
+        try:
+            result = await worker.call(op, payload, timeout)
+            healthy = True
+            outcome = "ok"
+            return result
+        except asyncio.TimeoutError:
+            outcome = "timeout"
+            raise WorkerTimeout(f"{worker.name} timed out after {timeout}s")
+        except WorkerCrashed:
+            outcome = "crashed"
+            raise
+        except WorkerError:
+            # the crew failed but the worker itself is still usable
+            healthy = True
+            outcome = "error"
+            raise
+        finally:
+            WORKER_CALL_LATENCY.observe(
+                time.perf_counter() - started, pool=self.name, op=op, outcome=outcome
+            )
+            if healthy:
+                self._idle.put_nowait(worker)
+            else:
+                # timed out, crashed or cancelled (client gone / job
+                # cancelled): kill the whole process tree right away so the
+                # crew stops spending LLM calls, then respawn in background
+                worker.kill()
+                task = asyncio.create_task(self._replace(worker))
+                self._respawns.add(task)
+                task.add_done_callback(self._respawns.discard)
+
+    def _forward_events(self, events: List[dict], dropped: int):
+        self.events_dropped += dropped
+        if self.on_events is not None:
+            self.on_events(events)
+
+    @property
+    def idle_count(self) -> int:
+        return self._idle.qsize()
+
+    def published_stats(self) -> Optional[dict]:
+        """
+        Stats the pool's workers last published to the shared state, or
+        None before any did. Blocking (SQLite); call it from the threadpool.
+
+        Stats of the shared stores come from the freshest snapshot, since
+        every worker sees the same; per-process ones are listed by worker.
+        """
+        path = STATE_DIR / WORKER_STATS_FILE
+        if not path.exists():
+            return None
+        try:
+            with closing(sqlite3.connect(f"file:{path}?mode=ro", uri=True, timeout=5)) as conn:
+                rows = conn.execute(
+                    "select worker, pid, stats, published_at from worker_stats"
+                ).fetchall()
+        except sqlite3.OperationalError:
+            return None
+        names = {worker.name for worker in self._workers}
+        snapshots = [
+            (worker, pid, json.loads(stats), published_at)
+            for worker, pid, stats, published_at in rows
+            if worker in names
+        ]
+        if not snapshots:
+            return None
+        newest = max(snapshots, key=lambda snapshot: snapshot[3])[2]
+        return {
+            **newest.get("shared", {}),
+            "workers": {
+                worker: {"pid": pid, "published_at": published_at, **stats.get("process", {})}
+                for worker, pid, stats, published_at in sorted(snapshots)
+            },
+        }
+
+    async def run(self, payload: dict, timeout: float):
+        return await self.call("run", payload, timeout)
+
+    async def close(self):
+        self._closed = True
+        for task in list(self._respawns):
+            task.cancel()
+        for worker in self._workers:
+            if worker.alive:
+                worker.proc.stdin.close()
+                worker.kill()
+                await worker.proc.wait()
+        self._workers.clear()
+
+
+def pool_size(env_name: str, default: int) -> int:
+    try:
+        return int(os.getenv(env_name, default))
+    except ValueError:
+        print(f"⚠️ Invalid {env_name}, using {default}", file=sys.stderr)
+        return default
@@ -0,0 +1,103 @@
+import hashlib
+import os
+import shutil
+import tempfile
+from contextlib import contextmanager, ExitStack
+from pathlib import Path
+from typing import BinaryIO
+
+from fastapi import UploadFile
+from starlette.concurrency import run_in_threadpool
+
+# Root for per-request scratch directories. Workers run on the same host,
+# so anything created here is visible to them.
+WORKSPACE_ROOT = Path(os.getenv("WORKSPACE_ROOT", Path(tempfile.gettempdir()) / "jobpilot"))
+
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", str(10 * 1024 * 1024)))
+CHUNK_SIZE = 1024 * 1024
+
+
+class UploadTooLarge(Exception):
+    """Raised when an upload exceeds MAX_UPLOAD_BYTES."""
+
+
+@contextmanager
+def request_workspace(prefix: str):
+    """
+    Create an isolated working directory for one agent run and remove it
+    (with everything the agents wrote into it) once the run is over.
+    """
+    WORKSPACE_ROOT.mkdir(parents=True, exist_ok=True)
+    path = Path(tempfile.mkdtemp(prefix=f"{prefix}-", dir=WORKSPACE_ROOT))
+    try:
+        yield path
+    finally:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+class StagedFile:
+    """
+    An uploaded file saved into its own workspace.
+
+    The workspace outlives the request that created it and is removed by
+    close(), normally by the job that consumed the file.
+    """
+
+    def __init__(self, filename: str, prefix: str, saved_name: str):
+        self.filename = filename
+        self._stack = ExitStack()
+        self.workdir: Path = self._stack.enter_context(request_workspace(prefix))
+        self.path = self.workdir / saved_name
+        self.size = 0
+        self.sha256 = None
+
+    def close(self):
+        self._stack.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _write_chunk(out: BinaryIO, digest, chunk: bytes):
+    digest.update(chunk)
+    out.write(chunk)
+
+
+def copy_limited(source: BinaryIO, staged: StagedFile, max_bytes: int = MAX_UPLOAD_BYTES):
+    """Blocking copy of ``source`` into ``staged``, hashing as it goes."""
+    digest = hashlib.sha256()
+    with open(staged.path, "wb") as out:
+        while True:
+            chunk = source.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            staged.size += len(chunk)
+            if staged.size > max_bytes:
+                raise UploadTooLarge(f"{staged.filename} exceeds {max_bytes} bytes")
+            _write_chunk(out, digest, chunk)
+    staged.sha256 = digest.hexdigest()
+
+
+async def save_upload(upload: UploadFile, staged: StagedFile, max_bytes: int = MAX_UPLOAD_BYTES):
+    """
+    Stream an upload into ``staged`` in chunks without blocking the event
+    loop: reads go through UploadFile's async API, writes and hashing run in
+    the threadpool, and the size limit is enforced while streaming.
+    """
+    digest = hashlib.sha256()
+    out = await run_in_threadpool(open, staged.path, "wb")
+    try:
+        while True:
+            chunk = await upload.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            staged.size += len(chunk)
+            if staged.size > max_bytes:
+                raise UploadTooLarge(f"{staged.filename} exceeds {max_bytes} bytes")
+            await run_in_threadpool(_write_chunk, out, digest, chunk)
+    finally:
+        await run_in_threadpool(out.close)
+    staged.sha256 = digest.hexdigest()
@@ -51,7 +51,7 @@ export const useSSEEvents = () => {
   const [isComplete, setIsComplete] = useState(false);
   const eventSourceRef = useRef<EventSource | null>(null);
 
-  const connect = useCallback((prompt: string) => {
+  const connect = useCallback((prompt: string, runId: string) => {
     // If already connected, don't establish another connection
     if (eventSourceRef.current) {
       console.log("SSE already connected, skipping new connection");
@@ -68,6 +68,7 @@ export const useSSEEvents = () => {
 
     // Create EventSource connection
     const url = new URL('http://localhost:8000/events');
+    url.searchParams.set('run', runId);
     const eventSource = new EventSource(url.toString());
     eventSourceRef.current = eventSource;
 
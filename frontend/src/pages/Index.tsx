@@ -25,20 +25,50 @@ const Index = () => {
   const [isLoadingDetails, setIsLoadingDetails] = useState(false);
   const { events, isConnected, isComplete, connect, disconnect, resetEvents } = useSSEEvents();
 
-  const fetchCandidates = async (prompt: string) => {
+  const fetchCandidates = async (prompt: string, runId: string) => {
     try {
-      const response = await fetch('http://localhost:8000/complete', {
+      // NDJSON: one candidate per line, shown as soon as each page arrives
+      const response = await fetch('http://localhost:8000/complete?format=ndjson', {
         method: 'POST',
         headers: { 'Content-Type': 'application/json' },
-        body: JSON.stringify({ "input": prompt })
+        body: JSON.stringify({ "input": prompt, "run_id": runId })
       });
 
-      const data = await response.json();
-      const results = data.result == "null" ? [] : JSON.parse(data.result);
-      setCandidates(results);
-      setIsLoading(false);
+      if (!response.ok || !response.body) {
+        throw new Error(`Request failed with status ${response.status}`);
+      }
+
+      const reader = response.body.getReader();
+      const decoder = new TextDecoder();
+      let buffered = '';
+      let count = 0;
+
+      const parseLines = (lines: string[]) => {
+        const rows: Candidate[] = [];
+        for (const line of lines) {
+          if (!line.trim()) continue;
+          const item = JSON.parse(line);
+          if (item.error) throw new Error(item.error);
+          if (!item.done) rows.push(item as Candidate);
+        }
+        if (rows.length) {
+          count += rows.length;
+          setCandidates(prev => [...prev, ...rows]);
+          setIsLoading(false);
+        }
+      };
+
+      while (true) {
+        const { done, value } = await reader.read();
+        if (done) break;
+        buffered += decoder.decode(value, { stream: true });
+        const lines = buffered.split('\n');
+        buffered = lines.pop() ?? '';
+        parseLines(lines);
+      }
+      parseLines([buffered]);
 
-      toast.success(`Found ${results.length} matching candidates`);
+      toast.success(`Found ${count} matching candidates`);
     } catch (error) {
       console.error('Error fetching candidates:', error);
       toast.error("Failed to fetch candidates");
@@ -59,10 +89,12 @@ const Index = () => {
 
     resetEvents();
 
-    // Connect to SSE and fetch candidates concurrently
+    // Connect to SSE and fetch candidates concurrently; the run id scopes
+    // the event stream to this search
     // Small delay to ensure previous connection is closed
-    setTimeout(() => connect(prompt), 100);
-    fetchCandidates(prompt);
+    const runId = crypto.randomUUID();
+    setTimeout(() => connect(prompt, runId), 100);
+    fetchCandidates(prompt, runId);
   };
 
   const handleCancel = () => {